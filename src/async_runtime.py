@@ -0,0 +1,315 @@
+import asyncio
+import heapq
+import time
+
+from dependency_graph import DependencyGraph
+from event_sink import NullEventSink
+from max_priority_queue import IndexedMaxHeapq
+from priority_table import PriorityTable
+from task_graph import compile_tasks
+
+
+class AsyncTaskRuntime:
+    """
+    Class used to run real work attached to the tasks, following the
+    scheduler's priorities and dependency graph.
+
+    Every task is given a coroutine function, e.g. an HTTP or database job,
+    called with the task. At most concurrency of them run at once. A task is
+    started as soon as its dependencies have finished and a slot is free, the
+    highest priority ready task first; time-constrained tasks are held until
+    their start time and then go first.
+
+    If a task fails, the tasks depending on it are cancelled. If the run
+    itself is cancelled, the running callables are cancelled too.
+
+    Attributes
+    ----------
+    compiled (CompiledTaskGraph): Validated graph structure of the tasks.
+    actions (dict): Maps a task id to its coroutine function, tasks without
+        one finish immediately.
+    concurrency (int): Maximum number of callables running at once.
+    seconds_per_minute (float): Wall-clock seconds per minute of task
+        duration, used for the planned timings and the start times.
+    fail_fast (bool): Cancel the whole run on the first failure.
+    sink (NullEventSink): Receives the scheduling events.
+    priority_table (PriorityTable): Priority of every task.
+    records (dict): Maps a task id to its report entry, see report.
+    """
+
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+
+    def __init__(self, tasks, actions, concurrency=4, seconds_per_minute=60, fail_fast=False, sink=None):
+        """
+        Validates the tasks and prepares the run.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects, tasks with status 'C' are not run again.
+        actions (dict): Maps a task id to a coroutine function taking the task.
+        concurrency (int): Maximum number of callables running at once.
+        seconds_per_minute (float): Wall-clock seconds per minute of task duration.
+        fail_fast (bool): Cancel the whole run on the first failure.
+        sink (NullEventSink): Event sink, nothing is logged by default.
+        """
+        if concurrency < 1:
+            raise ValueError('concurrency must be at least 1')
+        self.compiled = compile_tasks(tasks)
+        self.actions = actions
+        self.concurrency = concurrency
+        self.seconds_per_minute = seconds_per_minute
+        self.fail_fast = fail_fast
+        self.sink = sink if sink is not None else NullEventSink()
+        self.priority_table = PriorityTable(self.compiled.tasks)
+        self.records = {}
+
+    def _key(self, task):
+        """
+        Returns the ready queue key of a task.
+
+        Parameters
+        ----------
+        task (Task): The task.
+
+        Returns
+        ----------
+        tuple: Time-constrained tasks first by start time, then the others by priority.
+        """
+        if task.has_time_constraint:
+            return (1, -task.start_time)
+        return (0, self.priority_table.get(task.id))
+
+    def _start_graph(self):
+        """
+        Builds a fresh dependency graph with the completed tasks resolved.
+
+        Returns
+        ----------
+        DependencyGraph: The graph.
+        """
+        graph = DependencyGraph.from_compiled(self.compiled)
+        for task in self.compiled.tasks:
+            if task.status == 'C':
+                graph.resolve(task.id)
+        return graph
+
+    def _release(self, task, origin):
+        """
+        Returns the offset in minutes before which a task must not start.
+
+        Parameters
+        ----------
+        task (Task): The task.
+        origin (int): Starting time of the run in minutes.
+
+        Returns
+        ----------
+        int: Minutes after the start of the run, 0 without time constraint.
+        """
+        return max(0, task.start_time - origin) if task.has_time_constraint else 0
+
+    def plan(self, starting_time):
+        """
+        Simulates the run with the planned durations.
+
+        Parameters
+        ----------
+        starting_time (int): The starting time in hours, only used for the
+            time-constrained tasks.
+
+        Returns
+        ----------
+        dict: Maps a task id to its planned (start, end) in minutes after the start.
+        """
+        origin = starting_time * 60
+        graph = self._start_graph()
+        ready = IndexedMaxHeapq()
+        held = []
+        running = []
+        planned = {}
+        now = 0
+
+        while True:
+            for task in graph.pop_ready():
+                if task.status != 'C':
+                    heapq.heappush(held, (self._release(task, origin), task.id, task))
+            while held and held[0][0] <= now:
+                task = heapq.heappop(held)[2]
+                ready.push(self._key(task), task)
+            while ready and len(running) < self.concurrency:
+                _, task = ready.pop()
+                planned[task.id] = (now, now + task.duration)
+                heapq.heappush(running, (now + task.duration, task.id, task))
+
+            if not running and not held:
+                return planned
+            now = min(running[0][0] if running else float('inf'), held[0][0] if held else float('inf'))
+            while running and running[0][0] <= now:
+                graph.resolve(heapq.heappop(running)[2].id)
+
+    async def _call(self, task):
+        """
+        Runs the callable of a task.
+
+        Parameters
+        ----------
+        task (Task): The task.
+
+        Returns
+        ----------
+        object: The value returned by the callable, None without callable.
+        """
+        action = self.actions.get(task.id)
+        if action is None:
+            return None
+        return await action(task)
+
+    def _cancel_dependents(self, graph, task):
+        """
+        Marks the tasks depending on a failed or cancelled task as cancelled.
+
+        Parameters
+        ----------
+        graph (DependencyGraph): The graph of the run.
+        task (Task): The task that did not complete.
+        """
+        stack = [task.id]
+        while stack:
+            for dependent_id in graph.dependents.get(stack.pop(), ()):
+                record = self.records[dependent_id]
+                if record['status'] == self.PENDING:
+                    record['status'] = self.CANCELLED
+                    stack.append(dependent_id)
+
+    async def run(self, starting_time):
+        """
+        Runs the callables along the dependency graph.
+
+        Parameters
+        ----------
+        starting_time (int): The starting time in hours, time-constrained tasks
+            are started after (start_time - starting_time) scaled minutes.
+
+        Returns
+        ----------
+        list: The report, see report.
+        """
+        origin = starting_time * 60
+        scale = self.seconds_per_minute
+        planned = self.plan(starting_time)
+        graph = self._start_graph()
+        self.records = {
+            task.id: {'id': task.id, 'description': task.description, 'status': self.PENDING,
+                      'planned_start': planned[task.id][0] * scale if task.id in planned else None,
+                      'planned_end': planned[task.id][1] * scale if task.id in planned else None,
+                      'actual_start': None, 'actual_end': None, 'result': None, 'error': None}
+            for task in self.compiled.tasks if task.status != 'C'
+        }
+        ready = IndexedMaxHeapq()
+        held = []
+        running = {}
+        start = time.monotonic()
+        self.sink.scheduler_started('asyncio', origin)
+
+        def clock():
+            return origin + round((time.monotonic() - start) / scale)  # whole minutes, like the schedulers
+
+        aborted = False
+        try:
+            while not aborted:
+                elapsed = time.monotonic() - start
+                for task in graph.pop_ready():
+                    if task.id in self.records and self.records[task.id]['status'] == self.PENDING:
+                        heapq.heappush(held, (self._release(task, origin) * scale, task.id, task))
+                while held and held[0][0] <= elapsed:
+                    task = heapq.heappop(held)[2]
+                    ready.push(self._key(task), task)
+                while ready and len(running) < self.concurrency:
+                    key, task = ready.pop()
+                    record = self.records[task.id]
+                    record['status'] = self.RUNNING
+                    record['actual_start'] = time.monotonic() - start
+                    self.sink.task_started(clock(), task)
+                    running[asyncio.ensure_future(self._call(task))] = (task, key[1])
+
+                if not running and not held:
+                    break
+                timeout = held[0][0] - elapsed if held else None
+                if not running:
+                    await asyncio.sleep(timeout)
+                    continue
+                done, _ = await asyncio.wait(running.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                for future in done:
+                    task, priority = running.pop(future)
+                    record = self.records[task.id]
+                    record['actual_end'] = time.monotonic() - start
+                    if future.cancelled():
+                        record['status'] = self.CANCELLED
+                    elif future.exception() is not None:
+                        record['status'] = self.FAILED
+                        record['error'] = repr(future.exception())
+                    else:
+                        record['status'] = self.DONE
+                        record['result'] = future.result()
+                        task.status = 'C'
+                        self.sink.task_completed(clock(), task, priority)
+                        graph.resolve(task.id)
+                        continue
+
+                    self._cancel_dependents(graph, task)
+                    aborted = aborted or self.fail_fast
+        except asyncio.CancelledError:
+            await self._cancel_all(running, start)
+            raise
+        if aborted:
+            await self._cancel_all(running, start)
+
+        self.sink.scheduler_finished(origin, clock())
+        return self.report()
+
+    async def _cancel_all(self, running, start):
+        """
+        Cancels the running callables and the tasks that were not started.
+
+        Parameters
+        ----------
+        running (dict): Maps the futures of the running callables to their task and priority.
+        start (float): time.monotonic() at the start of the run.
+        """
+        for future in running:
+            future.cancel()
+        await asyncio.gather(*running, return_exceptions=True)
+        for task, _ in running.values():
+            self.records[task.id]['status'] = self.CANCELLED
+            self.records[task.id]['actual_end'] = time.monotonic() - start
+        for record in self.records.values():
+            if record['status'] == self.PENDING:
+                record['status'] = self.CANCELLED
+
+    def report(self):
+        """
+        Returns the planned and actual timings of the last run.
+
+        Returns
+        ----------
+        list: One dict per task, in actual start order, with the keys id,
+            description, status ('done', 'failed', 'cancelled' or 'pending'),
+            planned_start, planned_end, actual_start and actual_end in seconds
+            after the start of the run (None if the task did not run), delay
+            (actual minus planned end), result and error.
+        """
+        rows = []
+        for record in self.records.values():
+            row = dict(record)
+            if row['actual_end'] is not None and row['planned_end'] is not None:
+                row['delay'] = row['actual_end'] - row['planned_end']
+            else:
+                row['delay'] = None
+            rows.append(row)
+        rows.sort(key=lambda row: (row['actual_start'] is None, row['actual_start'] or 0))
+        return rows
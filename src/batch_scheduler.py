@@ -0,0 +1,241 @@
+"""
+Schedules many small, independent task sets, e.g. one plan per user, over a
+process pool.
+
+Task sets are sent to the workers in chunks of compact tuples instead of Task
+objects, every worker imports its scheduler once, and nothing is printed, so
+the cost per set is the scheduling itself rather than pickling, imports or
+output.
+"""
+import os
+
+from event_sink import ScheduleEventSink
+from task_initializer import Task
+
+SCHEDULERS = ('greedy', 'dynamic')
+
+
+def pack_tasks(tasks):
+    """
+    Converts a task set to plain tuples, cheaper to pickle than Task objects.
+
+    Descriptions are dropped, the results only refer to task ids.
+
+    Parameters
+    ----------
+    tasks (list): List of Task objects.
+
+    Returns
+    ----------
+    list: One (id, start_time, duration, dependencies, preference, status,
+        multitaskable) tuple per task, start_time None without time constraint.
+    """
+    return [(task.id, task.start_time if task.has_time_constraint else None, task.duration,
+             list(task.dependencies), task.preference, task.status, task.multitaskable) for task in tasks]
+
+
+def unpack_tasks(rows):
+    """
+    Builds the Task objects of a packed task set.
+
+    Parameters
+    ----------
+    rows (list): Tuples returned by pack_tasks.
+
+    Returns
+    ----------
+    list: New Task objects.
+    """
+    tasks = []
+    for task_id, start_time, duration, dependencies, preference, status, multitaskable in rows:
+        task = Task(task_id, '', 'NA', duration, dependencies, preference, status, multitaskable)
+        if start_time is not None:
+            task.start_time = start_time
+            task.has_time_constraint = True
+        tasks.append(task)
+    return tasks
+
+
+def scheduler_class(scheduler):
+    """
+    Imports the scheduler class.
+
+    Parameters
+    ----------
+    scheduler (str): 'greedy' or 'dynamic'.
+
+    Returns
+    ----------
+    type: TaskSchedulerGreedy or TaskSchedulerDynamic.
+    """
+    if scheduler == 'greedy':
+        from greedy_task_scheduler import TaskSchedulerGreedy
+        return TaskSchedulerGreedy
+    from dynamic_task_scheduler import TaskSchedulerDynamic
+    return TaskSchedulerDynamic
+
+
+def schedule_set(cls, rows, starting_time, options):
+    """
+    Schedules one packed task set.
+
+    Parameters
+    ----------
+    cls (type): The scheduler class.
+    rows (list): Tuples returned by pack_tasks.
+    starting_time (int or Horizon): Passed to run_scheduler.
+    options (dict): Keyword arguments of the scheduler.
+
+    Returns
+    ----------
+    dict: The schedule as (id, start, end, priority) tuples, the ids of the
+        tasks that were not scheduled, and the error message if the set could
+        not be scheduled, e.g. because of a dependency cycle, else None.
+    """
+    try:
+        tasks = unpack_tasks(rows)
+        sink = ScheduleEventSink()
+        cls(tasks, sink=sink, **options).run_scheduler(starting_time)
+    except ValueError as error:
+        return {'schedule': [], 'unscheduled': [row[0] for row in rows], 'error': str(error)}
+    return {
+        'schedule': [(task.id, start, end, priority) for task, start, end, priority in sink.entries],
+        'unscheduled': [task.id for task in tasks if task.status != 'C'],
+        'error': None,
+    }
+
+
+_worker_cls = None
+_worker_starting_time = None
+_worker_options = None
+
+
+def _init_worker(scheduler, starting_time, options):
+    """
+    Imports the scheduler of a worker process once for all its chunks.
+
+    Parameters
+    ----------
+    scheduler (str): 'greedy' or 'dynamic'.
+    starting_time (int or Horizon): Passed to run_scheduler.
+    options (dict): Keyword arguments of the scheduler.
+    """
+    global _worker_cls, _worker_starting_time, _worker_options
+    _worker_cls = scheduler_class(scheduler)
+    _worker_starting_time = starting_time
+    _worker_options = options
+
+
+def _schedule_chunk(chunk):
+    """
+    Schedules a chunk of task sets in a worker process.
+
+    Parameters
+    ----------
+    chunk (list): (index, packed task set) pairs.
+
+    Returns
+    ----------
+    list: (index, result) pairs, see schedule_set.
+    """
+    return [(index, schedule_set(_worker_cls, rows, _worker_starting_time, _worker_options))
+            for index, rows in chunk]
+
+
+def chunked(task_sets, chunksize):
+    """
+    Packs and groups the task sets, reading the iterable lazily.
+
+    Parameters
+    ----------
+    task_sets (iterable): Lists of Task objects.
+    chunksize (int): Number of task sets per chunk.
+
+    Yields
+    ----------
+    list: (index, packed task set) pairs.
+    """
+    chunk = []
+    for index, tasks in enumerate(task_sets):
+        chunk.append((index, pack_tasks(tasks)))
+        if len(chunk) == chunksize:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def schedule_many(task_sets, scheduler='greedy', starting_time=8, workers=None, chunksize=32, ordered=True,
+                  **options):
+    """
+    Schedules independent task sets over a process pool.
+
+    The iterable is read lazily and at most two chunks per worker are in
+    flight, so the sets do not all need to be in memory at once. When
+    ordered, finished chunks waiting for an earlier one count as in flight,
+    so the results held back are bounded too. The given Task objects are
+    never modified.
+
+    Parameters
+    ----------
+    task_sets (iterable): Lists of Task objects, one per plan.
+    scheduler (str): 'greedy' (default) or 'dynamic'.
+    starting_time (int or Horizon): The starting time of every plan, passed
+        to run_scheduler.
+    workers (int): Number of worker processes, os.cpu_count() if None, 1 to
+        schedule in this process without a pool.
+    chunksize (int): Number of task sets sent to a worker at once, larger
+        chunks amortize the inter-process overhead of small sets.
+    ordered (bool): Yield the results in the order of task_sets, else as
+        soon as their chunk completes.
+    options: Keyword arguments of the scheduler, e.g. lanes=2 or engine='bitmask'.
+        They are sent to every worker, so they must be picklable.
+
+    Yields
+    ----------
+    tuple: The index of the task set in task_sets and its result, a dict with
+        the keys schedule ((id, start, end, priority) tuples in completion
+        order), unscheduled (ids) and error (None, or why the set was rejected).
+    """
+    if scheduler not in SCHEDULERS:
+        raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {SCHEDULERS}")
+    if chunksize < 1:
+        raise ValueError('chunksize must be at least 1')
+
+    workers = workers or os.cpu_count()
+    if workers == 1:
+        cls = scheduler_class(scheduler)
+        for index, tasks in enumerate(task_sets):
+            yield index, schedule_set(cls, pack_tasks(tasks), starting_time, options)
+        return
+
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+    chunks = chunked(task_sets, chunksize)
+    pending = set()
+    buffered = {}  # finished chunks waiting for an earlier one, by index of their first set
+    next_index = 0
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(scheduler, starting_time, options)) as pool:
+        exhausted = False
+        while True:
+            # buffered chunks count as in flight, so a slow head chunk stops the submissions
+            while not exhausted and len(pending) + len(buffered) < 2 * workers:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    exhausted = True
+                else:
+                    pending.add(pool.submit(_schedule_chunk, chunk))
+            if not pending:
+                break
+            finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                results = future.result()
+                if not ordered:
+                    yield from results
+                    continue
+                buffered[results[0][0]] = results
+            while next_index in buffered:
+                results = buffered.pop(next_index)
+                yield from results
+                next_index += len(results)
@@ -0,0 +1,517 @@
+import argparse
+import heapq
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import NullEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from max_priority_queue import IndexedMaxHeapq, MaxHeapq
+from task_initializer import Task
+
+
+def chain_tasks(n, seed=0):
+    """
+    Generates n tasks where every task depends on the previous one.
+
+    Parameters
+    ----------
+    n (int): Number of tasks.
+    seed (int): Seed of the durations and preferences.
+
+    Returns
+    ----------
+    list: The generated Task objects.
+    """
+    rng = random.Random(seed)
+    return [Task(i, f"Task {i}", 'NA', rng.randint(1, 30), [i - 1] if i > 0 else [], rng.randint(1, 10))
+            for i in range(n)]
+
+
+def fan_tasks(n, seed=0):
+    """
+    Generates a root task, n - 2 tasks depending on it and a last task
+    depending on all of them.
+
+    Parameters
+    ----------
+    n (int): Number of tasks, at least 2.
+    seed (int): Seed of the durations and preferences.
+
+    Returns
+    ----------
+    list: The generated Task objects.
+    """
+    rng = random.Random(seed)
+    tasks = [Task(0, "Task 0", 'NA', rng.randint(1, 30), [], rng.randint(1, 10))]
+    for i in range(1, n - 1):
+        tasks.append(Task(i, f"Task {i}", 'NA', rng.randint(1, 30), [0], rng.randint(1, 10)))
+    tasks.append(Task(n - 1, f"Task {n - 1}", 'NA', rng.randint(1, 30), list(range(1, n - 1)),
+                      rng.randint(1, 10)))
+    return tasks
+
+
+def layered_tasks(n, seed=0, layers=None, edge_probability=0.2):
+    """
+    Generates a random DAG whose tasks only depend on tasks of earlier layers.
+
+    Parameters
+    ----------
+    n (int): Number of tasks.
+    seed (int): Seed of the graph, durations and preferences.
+    layers (int): Number of layers, about sqrt(n) if None.
+    edge_probability (float): Probability of an edge from each task of the
+        previous layer, every task also gets one random edge.
+
+    Returns
+    ----------
+    list: The generated Task objects.
+    """
+    rng = random.Random(seed)
+    layers = layers or max(1, int(n ** 0.5))
+    width = -(-n // layers)
+    tasks = []
+    for i in range(n):
+        layer = i // width
+        dependencies = []
+        if layer > 0:
+            previous = range((layer - 1) * width, layer * width)
+            dependencies = [j for j in previous if rng.random() < edge_probability]
+            if not dependencies:
+                dependencies = [rng.randrange(0, layer * width)]
+        tasks.append(Task(i, f"Task {i}", 'NA', rng.randint(1, 30), dependencies, rng.randint(1, 10)))
+    return tasks
+
+
+def constrained_tasks(n, seed=0, fraction=0.2, edge_probability=0.1):
+    """
+    Generates a random DAG where a fraction of the tasks have a start time.
+
+    Parameters
+    ----------
+    n (int): Number of tasks.
+    seed (int): Seed of the graph, start times, durations and preferences.
+    fraction (float): Fraction of independent tasks with a start time between 9h and 19h.
+    edge_probability (float): Probability of a dependency on each of the five
+        previous tasks.
+
+    Returns
+    ----------
+    list: The generated Task objects.
+    """
+    rng = random.Random(seed)
+    tasks = []
+    for i in range(n):
+        if rng.random() < fraction:
+            tasks.append(Task(i, f"Task {i}", rng.randint(9, 19), rng.randint(5, 30), [], rng.randint(1, 10)))
+        else:
+            dependencies = [j for j in range(max(0, i - 5), i)
+                            if not tasks[j].has_time_constraint and rng.random() < edge_probability]
+            tasks.append(Task(i, f"Task {i}", 'NA', rng.randint(1, 30), dependencies, rng.randint(1, 10)))
+    return tasks
+
+
+GENERATORS = {
+    'chain': chain_tasks,
+    'fan': fan_tasks,
+    'layered': layered_tasks,
+    'constrained': constrained_tasks,
+}
+
+
+class CountingEventSink(NullEventSink):
+    """
+    Event sink counting the scheduling decisions instead of logging them.
+
+    Attributes
+    ----------
+    tasks_started (int): Number of task_started events.
+    tasks_completed (int): Number of task_completed events.
+    windows_solved (int): Number of window_solved events.
+    """
+
+    def __init__(self):
+        self.tasks_started = 0
+        self.tasks_completed = 0
+        self.windows_solved = 0
+
+    def task_started(self, time, task):
+        self.tasks_started += 1
+
+    def task_completed(self, time, task, priority):
+        self.tasks_completed += 1
+
+    def window_solved(self, time, limit, utility, tasks):
+        self.windows_solved += 1
+
+
+def measure(run, repeat=3):
+    """
+    Measures the best wall time of a benchmark and its peak memory.
+
+    The peak memory is measured by an extra run under tracemalloc, so the
+    tracing overhead never counts in the wall time.
+
+    Parameters
+    ----------
+    run (callable): Function setting up and running the benchmark from
+        scratch, returns a dict of operation counts.
+    repeat (int): Number of timed runs.
+
+    Returns
+    ----------
+    dict: wall_time in seconds, peak_memory in bytes and the operation counts,
+        or the error raised by the benchmark.
+    """
+    wall_time = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        try:
+            counts = run()
+        except Exception as error:
+            return {'error': f"{type(error).__name__}: {error}"}
+        wall_time = min(wall_time, time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {'wall_time': wall_time, 'peak_memory': peak_memory, **counts}
+
+
+def greedy_run(generator, n, seed):
+    """
+    Returns a benchmark running the greedy scheduler on generated tasks.
+
+    Parameters
+    ----------
+    generator (callable): One of the GENERATORS.
+    n (int): Number of tasks.
+    seed (int): Seed of the generator.
+
+    Returns
+    ----------
+    callable: The benchmark, see measure.
+    """
+    def run():
+        sink = CountingEventSink()
+        TaskSchedulerGreedy(generator(n, seed), sink=sink).run_scheduler(8)
+        return {'tasks_completed': sink.tasks_completed}
+    return run
+
+
+def rerun_run(generator, n, seed):
+    """
+    Returns a benchmark running the greedy scheduler again on tasks it already
+    scheduled, as for what-if runs over the same tasks; only the reset and the
+    run are timed, the tasks are compiled once at the first call.
+
+    Parameters
+    ----------
+    generator (callable): One of the GENERATORS.
+    n (int): Number of tasks.
+    seed (int): Seed of the generator.
+
+    Returns
+    ----------
+    callable: The benchmark, see measure.
+    """
+    sink = CountingEventSink()
+    schedulers = []
+
+    def run():
+        if not schedulers:
+            schedulers.append(TaskSchedulerGreedy(generator(n, seed), sink=sink))
+        sink.tasks_completed = 0
+        schedulers[0].reset()
+        schedulers[0].run_scheduler(8)
+        return {'tasks_completed': sink.tasks_completed}
+    return run
+
+
+def dynamic_run(generator, n, seed, engine='bitmask'):
+    """
+    Returns a benchmark running the dynamic scheduler on generated tasks.
+
+    Parameters
+    ----------
+    generator (callable): One of the GENERATORS.
+    n (int): Number of tasks.
+    seed (int): Seed of the generator.
+    engine (str): Window solver of the scheduler.
+
+    Returns
+    ----------
+    callable: The benchmark, see measure.
+    """
+    def run():
+        sink = CountingEventSink()
+        scheduler = TaskSchedulerDynamic(generator(n, seed), engine=engine, sink=sink)
+        scheduler.run_scheduler(8)
+        stats = scheduler.mem_dict.stats()
+        return {'tasks_completed': sink.tasks_completed, 'windows_solved': sink.windows_solved,
+                'memo_hits': stats['hits'], 'memo_misses': stats['misses']}
+    return run
+
+
+def heap_run(queue, n_ops, seed):
+    """
+    Returns a benchmark doing n_ops // 2 pushes then n_ops // 2 pops on a
+    priority queue, with the same random keys for every queue.
+
+    Parameters
+    ----------
+    queue (str): 'heapq', 'IndexedMaxHeapq' or 'MaxHeapq'.
+    n_ops (int): The total number of push and pop operations.
+    seed (int): Seed of the random keys.
+
+    Returns
+    ----------
+    callable: The benchmark, see measure.
+    """
+    rng = random.Random(seed)
+    n = n_ops // 2
+    keys = [rng.random() for _ in range(n)]
+
+    def run():
+        if queue == 'heapq':
+            A = []
+            for i in range(n):
+                heapq.heappush(A, (-keys[i], i))
+            for _ in range(n):
+                heapq.heappop(A)
+        elif queue == 'IndexedMaxHeapq':
+            indexed = IndexedMaxHeapq()
+            for i in range(n):
+                indexed.push(keys[i], i)
+            for _ in range(n):
+                indexed.pop()
+        else:
+            heap = MaxHeapq()
+            A = []
+            for i in range(n):
+                heap.heappush(A, (i, keys[i]))
+            for _ in range(n):
+                heap.heappop(A)
+        return {'operations': 2 * n}
+    return run
+
+
+def import_time(modules, repeat=3):
+    """
+    Measures the time a fresh interpreter spends importing modules, with
+    python -X importtime.
+
+    Parameters
+    ----------
+    modules (list): Names of the modules imported in that order from src.
+    repeat (int): Number of interpreters started, the best time is kept.
+
+    Returns
+    ----------
+    float: The cumulative import time in seconds.
+    """
+    best = float('inf')
+    for _ in range(repeat):
+        completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {', '.join(modules)}"],
+                                   cwd=os.path.dirname(os.path.abspath(__file__)),
+                                   capture_output=True, text=True, check=True)
+        total = 0
+        for line in completed.stderr.splitlines():
+            fields = line.split('|')
+            if len(fields) == 3 and fields[2].strip() in modules and not fields[2].startswith('  '):
+                total += int(fields[1])
+        best = min(best, total / 1e6)
+    return best
+
+
+# Modules imported by a run of the command line with each engine.
+STARTUP_IMPORTS = {
+    'cli': ['scheduler_cli'],
+    'greedy': ['scheduler_cli', 'event_sink', 'task_loader', 'greedy_task_scheduler'],
+    'dynamic': ['scheduler_cli', 'event_sink', 'task_loader', 'dynamic_task_scheduler'],
+    'streaming': ['scheduler_cli', 'event_sink', 'task_loader', 'streaming_scheduler'],
+}
+IMPORT_TIME_BUDGET = 0.05
+
+SIZES = {
+    'greedy': (100, 1000, 10000),
+    'dynamic': (20, 40, 60),
+    'knapsack': (100, 1000),
+    'heap': (1000000,),
+}
+QUICK_SIZES = {
+    'greedy': (100, 1000),
+    'dynamic': (20, 40),
+    'knapsack': (100,),
+    'heap': (10000,),
+}
+
+
+def benchmarks(sizes, seed=0):
+    """
+    Lists the benchmarks of the suite.
+
+    Parameters
+    ----------
+    sizes (dict): Task counts for 'greedy' (also used by the 'rerun' benchmarks
+        of the greedy scheduler reset between runs), 'dynamic' and 'knapsack'
+        (the dynamic scheduler with its knapsack engine), operation counts for 'heap'.
+    seed (int): Seed of the generated instances.
+
+    Returns
+    ----------
+    dict: Maps a benchmark name, e.g. 'greedy/layered/1000', to its run function.
+    """
+    suite = {}
+    for name, generator in GENERATORS.items():
+        for n in sizes['greedy']:
+            suite[f"greedy/{name}/{n}"] = greedy_run(generator, n, seed)
+            suite[f"rerun/{name}/{n}"] = rerun_run(generator, n, seed)
+        for n in sizes['dynamic']:
+            suite[f"dynamic/{name}/{n}"] = dynamic_run(generator, n, seed)
+        for n in sizes.get('knapsack', ()):
+            suite[f"knapsack/{name}/{n}"] = dynamic_run(generator, n, seed, engine='knapsack')
+    for queue in ('heapq', 'IndexedMaxHeapq', 'MaxHeapq'):
+        for n_ops in sizes['heap']:
+            suite[f"heap/{queue}/{n_ops}"] = heap_run(queue, n_ops, seed)
+    return suite
+
+
+def run_suite(sizes=SIZES, seed=0, repeat=3, select=None, log=None):
+    """
+    Runs the benchmark suite.
+
+    Parameters
+    ----------
+    sizes (dict): See benchmarks.
+    seed (int): Seed of the generated instances.
+    repeat (int): Number of timed runs of every benchmark.
+    select (str): Only run the benchmarks whose name contains this string.
+    log (file): Stream receiving one line per benchmark, nothing is printed if None.
+
+    Returns
+    ----------
+    dict: The environment under 'meta' and the measures of every benchmark under 'results'.
+    """
+    results = {}
+    for name, run in benchmarks(sizes, seed).items():
+        if select is not None and select not in name:
+            continue
+        results[name] = measure(run, repeat)
+        if log is not None and 'error' in results[name]:
+            print(f"{name:<32} {results[name]['error']}", file=log)
+        elif log is not None:
+            print(f"{name:<32} {results[name]['wall_time'] * 1000:>10.2f} ms "
+                  f"{results[name]['peak_memory'] / 1024:>10.1f} KiB", file=log)
+    for engine, modules in STARTUP_IMPORTS.items():
+        name = f"startup/{engine}"
+        if select is not None and select not in name:
+            continue
+        results[name] = {'import_time': import_time(modules, repeat)}
+        if log is not None:
+            print(f"{name:<32} {results[name]['import_time'] * 1000:>10.2f} ms", file=log)
+    meta = {'python': platform.python_version(), 'platform': platform.platform(), 'seed': seed, 'repeat': repeat}
+    return {'meta': meta, 'results': results}
+
+
+def compare(current, baseline, tolerance=0.25):
+    """
+    Compares the results of a run with a saved baseline.
+
+    Wall time, peak memory and import time regress when they grow by more
+    than the tolerance. Operation counts are deterministic for a given seed, so any
+    difference is reported since it means an algorithm changed its decisions.
+    A benchmark raising an error that passed in the baseline also regresses.
+
+    Parameters
+    ----------
+    current (dict): Value returned by run_suite.
+    baseline (dict): Value returned by run_suite for the reference version.
+    tolerance (float): Allowed relative growth of wall time and peak memory.
+
+    Returns
+    ----------
+    list: (benchmark, metric, baseline value, current value) for every regression.
+    """
+    regressions = []
+    for name, measures in current['results'].items():
+        reference = baseline['results'].get(name)
+        if reference is None:
+            continue
+        if 'error' in measures and 'error' not in reference:
+            regressions.append((name, 'error', None, measures['error']))
+            continue
+        for metric, value in measures.items():
+            if metric not in reference:
+                continue
+            if metric in ('wall_time', 'peak_memory', 'import_time'):
+                if value > reference[metric] * (1 + tolerance):
+                    regressions.append((name, metric, reference[metric], value))
+            elif value != reference[metric]:
+                regressions.append((name, metric, reference[metric], value))
+    return regressions
+
+
+def main(argv=None):
+    """
+    Runs the suite from the command line, e.g.
+
+        python benchmark_suite.py --output bench.json --baseline baseline.json
+
+    Parameters
+    ----------
+    argv (list): Command-line arguments, sys.argv[1:] if None.
+
+    Returns
+    ----------
+    int: 1 if a regression was found against the baseline or an import time
+        is over budget, 0 otherwise.
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the task schedulers and priority queues.")
+    parser.add_argument('--output', help="write the results to this JSON file")
+    parser.add_argument('--baseline', help="compare the results with this JSON file")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="allowed relative growth of wall time and peak memory (default 0.25)")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--select', help="only run the benchmarks whose name contains this string")
+    parser.add_argument('--quick', action='store_true', help="run the small sizes only")
+    parser.add_argument('--import-budget', type=float, default=IMPORT_TIME_BUDGET,
+                        help=f"maximum import time of a command-line run in seconds (default {IMPORT_TIME_BUDGET})")
+    args = parser.parse_args(argv)
+
+    current = run_suite(QUICK_SIZES if args.quick else SIZES, args.seed, args.repeat, args.select, sys.stdout)
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump(current, file, indent=2)
+
+    status = 0
+    for name, measures in current['results'].items():
+        if measures.get('import_time', 0) > args.import_budget:
+            print(f"OVER BUDGET {name} import_time: {measures['import_time']:.3f}s > {args.import_budget}s")
+            status = 1
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        regressions = compare(current, baseline, args.tolerance)
+        for name, metric, before, after in regressions:
+            print(f"REGRESSION {name} {metric}: {before} -> {after}")
+        if regressions:
+            return 1
+        print("No regression against the baseline.")
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,514 @@
+import math
+import os
+import time
+
+
+class BitmaskWindowSolver:
+    """
+    Class used to pick the set of tasks with the highest total utility that
+    fits in a time window, while respecting the dependencies between them.
+
+    Every candidate task is mapped to a bit index. The search decides for each
+    task, in topological order, whether it is scheduled or not. States are
+    memoized on integers (task index, bitmask of the scheduled tasks that are
+    still needed by later tasks, remaining time), so no set is ever built, and
+    branches are pruned with an admissible upper bound: the fractional
+    knapsack value of the remaining tasks that can still fit in the window.
+
+    Attributes
+    ----------
+    tasks (list): Candidate Task objects in topological order.
+    utilities (list): Utility of every candidate, by bit index.
+    durations (list): Duration of every candidate, by bit index.
+    dep_masks (list): Bitmask of the candidates every candidate depends on.
+    needed_masks (list): Bitmask of the candidates depended on by a candidate
+        at this index or later, used to reduce the memoization key.
+    by_ratio (list): Bit indices sorted by decreasing utility per minute.
+    nodes_expanded (int): Number of search states expanded by the last solve.
+    timed_out (bool): Whether the last search stopped at its deadline.
+    bound (float): Upper bound of the optimal utility from the last search,
+        equal to the utility found when the search completed.
+    """
+
+    SHARED_BOUND_REFRESH = 1024
+
+    def __init__(self, tasks, utilities):
+        """
+        Maps the candidate tasks to bit indices and builds their dependency masks.
+
+        Dependencies on tasks that are not candidates are considered already
+        satisfied.
+
+        Parameters
+        ----------
+        tasks (list): Candidate Task objects in topological order.
+        utilities (list): Utility of every candidate task, in the same order.
+        """
+        self.tasks = list(tasks)
+        index = {task.id: i for i, task in enumerate(self.tasks)}
+        dep_masks = []
+        for task in self.tasks:
+            mask = 0
+            for dep_id in task.dependencies:
+                if dep_id in index:
+                    mask |= 1 << index[dep_id]
+            dep_masks.append(mask)
+        self._prepare(list(utilities), [task.duration for task in self.tasks], dep_masks)
+
+    def _prepare(self, utilities, durations, dep_masks):
+        """
+        Stores the columns of the window and precomputes the search helpers.
+
+        Parameters
+        ----------
+        utilities (list): Utility of every candidate.
+        durations (list): Duration of every candidate.
+        dep_masks (list): Dependency bitmask of every candidate.
+        """
+        self.utilities = utilities
+        self.durations = durations
+        self.dep_masks = dep_masks
+        self.nodes_expanded = 0
+        self.timed_out = False
+        self.bound = None
+
+        n = len(utilities)
+        self.needed_masks = [0] * (n + 1)
+        for i in range(n - 1, -1, -1):
+            self.needed_masks[i] = self.needed_masks[i + 1] | self.dep_masks[i]
+
+        self.by_ratio = sorted(
+            (i for i in range(n) if self.utilities[i] > 0),
+            key=lambda i: self.utilities[i] / self.durations[i] if self.durations[i] > 0 else float('inf'),
+            reverse=True,
+        )
+
+    def snapshot(self):
+        """
+        Returns a compact picklable copy of the window, without Task objects.
+
+        Returns
+        ----------
+        tuple: The utilities, durations and dependency masks lists.
+        """
+        return self.utilities, self.durations, self.dep_masks
+
+    @classmethod
+    def from_snapshot(cls, snapshot):
+        """
+        Rebuilds a solver from a snapshot, e.g. in a worker process.
+
+        Parameters
+        ----------
+        snapshot (tuple): A value returned by snapshot.
+
+        Returns
+        ----------
+        BitmaskWindowSolver: A solver without tasks, which reports bitmasks.
+        """
+        solver = cls.__new__(cls)
+        solver.tasks = []
+        solver._prepare(*snapshot)
+        return solver
+
+    def upper_bound(self, i, remaining):
+        """
+        Returns an upper bound of the utility the tasks from index i on can add.
+
+        The bound relaxes the dependencies and lets the last task be scheduled
+        partially, so it is never below the true optimum.
+
+        Parameters
+        ----------
+        i (int): Bit index of the first undecided task.
+        remaining (int): Time left in the window in minutes.
+
+        Returns
+        ----------
+        float: The upper bound.
+        """
+        bound = 0
+        capacity = remaining
+        for j in self.by_ratio:
+            duration = self.durations[j]
+            if j < i or duration > remaining:
+                continue
+            if duration <= capacity:
+                bound += self.utilities[j]
+                capacity -= duration
+            else:
+                bound += self.utilities[j] * capacity / duration
+                break
+        return bound
+
+    def greedy_solution(self, limit):
+        """
+        Picks tasks like the greedy scheduler: the highest utility task that is
+        ready and still fits, until none does.
+
+        Parameters
+        ----------
+        limit (int): Length of the time window in minutes.
+
+        Returns
+        ----------
+        tuple: The utility and bitmask of the chosen tasks.
+        """
+        mask = 0
+        utility = 0
+        remaining = limit
+        while True:
+            best = None
+            for i in range(len(self.utilities)):
+                if (not mask >> i & 1 and self.durations[i] <= remaining and self.dep_masks[i] & ~mask == 0
+                        and (best is None or self.utilities[i] > self.utilities[best])):
+                    best = i
+            if best is None:
+                return utility, mask
+            mask |= 1 << best
+            utility += self.utilities[best]
+            remaining -= self.durations[best]
+
+    def search(self, states, best_utility, memo, shared_best=None, best_mask=None,
+               checkpoint=None, checkpoint_interval=60, deadline=None):
+        """
+        Runs the depth-first branch-and-bound search from the given states.
+
+        Parameters
+        ----------
+        states (list): Stack of (index, mask, remaining, utility) states to expand.
+        best_utility (float): Only solutions above this utility are recorded.
+        memo (MemoStore): Store for the visited states.
+        shared_best (multiprocessing.Value): Best utility found by any worker,
+            states that cannot reach it are pruned and it is raised on improvement.
+        best_mask (int): Bitmask of the best_utility solution, when resuming a search.
+        checkpoint (callable): Called as checkpoint(stack, best_utility, best_mask)
+            about every checkpoint_interval seconds, between two expansions.
+        checkpoint_interval (float): Seconds between two checkpoint calls.
+        deadline (float): time.monotonic() value at which the search stops and
+            returns the best solution found so far, None for no deadline.
+
+        Returns
+        ----------
+        tuple: The best utility and bitmask found, the bitmask is None if no
+            solution beat best_utility.
+        """
+        n = len(self.utilities)
+        utilities = self.utilities
+        durations = self.durations
+        dep_masks = self.dep_masks
+        needed_masks = self.needed_masks
+        shared_bound = shared_best.value if shared_best is not None else float('-inf')
+        clock = time.monotonic
+        if checkpoint is not None:
+            next_checkpoint = clock() + checkpoint_interval
+        self.timed_out = False
+
+        stack = list(states)
+        while stack:
+            i, mask, remaining, utility = stack.pop()
+            if utility > best_utility:
+                best_utility = utility
+                best_mask = mask
+                if shared_best is not None and utility > shared_bound:
+                    with shared_best.get_lock():
+                        if utility > shared_best.value:
+                            shared_best.value = utility
+                        shared_bound = shared_best.value
+            if i == n:
+                continue
+            bound = utility + self.upper_bound(i, remaining)
+            if bound <= best_utility or bound < shared_bound:
+                continue
+
+            key = (i, mask & needed_masks[i], remaining)
+            seen = memo.get(key)
+            if seen is not None and seen >= utility:
+                continue
+            memo[key] = utility
+            self.nodes_expanded += 1
+            if shared_best is not None and self.nodes_expanded % self.SHARED_BOUND_REFRESH == 0:
+                shared_bound = shared_best.value
+
+            stack.append((i + 1, mask, remaining, utility))
+            if durations[i] <= remaining and dep_masks[i] & ~mask == 0:
+                stack.append((i + 1, mask | (1 << i), remaining - durations[i], utility + utilities[i]))
+            if checkpoint is not None and self.nodes_expanded % self.SHARED_BOUND_REFRESH == 0 \
+                    and clock() >= next_checkpoint:
+                checkpoint(stack, best_utility, best_mask)
+                next_checkpoint = clock() + checkpoint_interval
+            if deadline is not None and self.nodes_expanded % self.SHARED_BOUND_REFRESH == 0 \
+                    and clock() >= deadline:
+                self.timed_out = True
+                break
+
+        # the states left on the stack hold every solution not explored yet
+        self.bound = max([best_utility] + [utility + self.upper_bound(i, remaining)
+                                           for i, _, remaining, utility in stack])
+        return best_utility, best_mask
+
+    def solve(self, limit, incumbent=0, memo=None, checkpoint_path=None, checkpoint_interval=60, deadline=None):
+        """
+        Finds the dependency-closed set of tasks with the highest utility that
+        fits in the time limit.
+
+        With a checkpoint_path, the search state (stack, memo and best solution)
+        is saved periodically, and a search interrupted e.g. by a crash or a
+        preemption resumes from the file instead of starting over. The file is
+        removed once the window is solved.
+
+        With a deadline, the search starts from the greedy solution and returns
+        the best solution found when time runs out; timed_out and bound then
+        tell how far from optimal it may be.
+
+        Parameters
+        ----------
+        limit (int): Length of the time window in minutes.
+        incumbent (int): Utility of a known solution, only better ones are returned.
+        memo (MemoStore): Store for the visited states, a plain dict is used if None.
+            Evicted states are only explored again, the result stays optimal.
+        checkpoint_path (str): File used to save and resume the search, None
+            to disable checkpointing.
+        checkpoint_interval (float): Seconds between two checkpoints.
+        deadline (float): time.monotonic() value at which the search stops,
+            None to search until the optimum is proven.
+
+        Returns
+        ----------
+        tuple: The best utility found and the chosen tasks in execution order.
+        """
+        if memo is None:
+            memo = {}
+        self.nodes_expanded = 0
+        states, best_mask = [(0, 0, limit, 0)], None
+        if deadline is not None:
+            utility, mask = self.greedy_solution(limit)
+            if utility > incumbent:
+                incumbent, best_mask = utility, mask
+        if checkpoint_path is None:
+            best_utility, best_mask = self.search(states, incumbent, memo, best_mask=best_mask, deadline=deadline)
+            return best_utility, self.tasks_of(best_mask or 0)
+
+        import search_checkpoint
+        saved = search_checkpoint.read_checkpoint(checkpoint_path, self, limit, memo)
+        if saved is not None:
+            states, saved_utility, saved_mask = saved
+            if saved_mask is not None and saved_utility >= incumbent:
+                incumbent, best_mask = saved_utility, saved_mask
+
+        def checkpoint(stack, best_utility, best_mask):
+            search_checkpoint.write_checkpoint(checkpoint_path, self, limit, stack, memo, best_utility, best_mask)
+
+        best_utility, best_mask = self.search(states, incumbent, memo, best_mask=best_mask, checkpoint=checkpoint,
+                                              checkpoint_interval=checkpoint_interval, deadline=deadline)
+        if search_checkpoint.checkpoint_matches(checkpoint_path, self, limit):
+            os.remove(checkpoint_path)
+        return best_utility, self.tasks_of(best_mask or 0)
+
+    def tasks_of(self, mask):
+        """
+        Returns the tasks of a bitmask in execution order.
+
+        Parameters
+        ----------
+        mask (int): Bitmask of chosen candidates.
+
+        Returns
+        ----------
+        list: The chosen Task objects.
+        """
+        return [task for i, task in enumerate(self.tasks) if mask >> i & 1]
+
+    def split(self, limit, depth):
+        """
+        Enumerates the feasible states after deciding the first depth tasks.
+
+        The states are listed in the order the serial search visits them.
+
+        Parameters
+        ----------
+        limit (int): Length of the time window in minutes.
+        depth (int): Number of tasks decided in every state.
+
+        Returns
+        ----------
+        list: (index, mask, remaining, utility) states.
+        """
+        states = [(0, 0, limit, 0)]
+        for i in range(min(depth, len(self.utilities))):
+            next_states = []
+            for _, mask, remaining, utility in states:
+                if self.durations[i] <= remaining and self.dep_masks[i] & ~mask == 0:
+                    next_states.append((i + 1, mask | (1 << i), remaining - self.durations[i],
+                                        utility + self.utilities[i]))
+                next_states.append((i + 1, mask, remaining, utility))
+            states = next_states
+        return states
+
+    def solve_parallel(self, limit, workers=None, incumbent=0, split_depth=None, pool=None, memo=None):
+        """
+        Finds the same optimal utility as solve, splitting the search tree
+        over a process pool.
+
+        The first split_depth decisions are enumerated here and every resulting
+        subproblem is solved by a worker from a snapshot of the window. The
+        workers share the best utility found so far through shared memory to
+        prune each other's branches.
+
+        Parameters
+        ----------
+        limit (int): Length of the time window in minutes.
+        workers (int): Number of worker processes, os.cpu_count() if None,
+            ignored when a pool is given.
+        incumbent (int): Utility of a known solution, only better ones are returned.
+        split_depth (int): Number of tasks decided before splitting, by default
+            enough to give every worker about four subproblems.
+        pool (SearchPool): Pool started once for many windows, e.g. by the
+            dynamic scheduler for a whole run; a pool is started and shut
+            down for this window only if None.
+        memo (MemoStore): Memo store of the search when it is not split, e.g.
+            with a single worker, whose class and limits a pool started here
+            gives the workers; the hits and misses of the workers' stores are
+            added to its counters. A plain dict is used if None.
+
+        Returns
+        ----------
+        tuple: The best utility found and the chosen tasks in execution order.
+        """
+        if pool is None:
+            with SearchPool(workers, memo) as pool:
+                return self.solve_parallel(limit, incumbent=incumbent, split_depth=split_depth, pool=pool,
+                                           memo=memo)
+
+        if split_depth is None:
+            split_depth = math.ceil(math.log2(pool.workers * 4))
+        if pool.workers == 1 or len(self.utilities) <= split_depth:
+            return self.solve(limit, incumbent, memo=memo)
+
+        self.nodes_expanded = 0
+        self.timed_out = False
+        results = pool.map(self.snapshot(), self.split(limit, split_depth), incumbent)
+        best_utility, best_mask = incumbent, None
+        for utility, mask, nodes, hits, misses in results:
+            if mask is not None and utility > best_utility:
+                best_utility, best_mask = utility, mask
+            self.nodes_expanded += nodes
+            if memo is not None and hasattr(memo, 'hits'):
+                memo.hits += hits
+                memo.misses += misses
+        self.bound = best_utility
+        return best_utility, self.tasks_of(best_mask or 0)
+
+
+class SearchPool:
+    """
+    Class used to keep the worker processes of the parallel window search
+    alive across windows, so that process start-up is paid once per run
+    instead of once per window.
+
+    Every worker holds one memo store, built like the given one (same class
+    and limits) and cleared for every subproblem, so the memory bound of the
+    scheduler's memo store also holds in the workers.
+
+    Attributes
+    ----------
+    workers (int): Number of worker processes.
+    shared_best (multiprocessing.Value): Best utility shared by the workers.
+    executor (ProcessPoolExecutor): The worker processes.
+    """
+
+    def __init__(self, workers=None, memo=None):
+        """
+        Starts the worker processes.
+
+        Parameters
+        ----------
+        workers (int): Number of worker processes, os.cpu_count() if None.
+        memo (MemoStore): Memo store whose class and limits the workers use, a
+            plain dict if None.
+        """
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+
+        self.workers = workers or multiprocessing.cpu_count()
+        self.shared_best = multiprocessing.Value('d', 0)
+        memo_spec = None
+        if memo is not None and hasattr(memo, 'max_entries'):
+            memo_spec = (type(memo), memo.max_entries, memo.max_bytes)
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                            initargs=(self.shared_best, memo_spec))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+
+    def map(self, snapshot, states, incumbent):
+        """
+        Solves the subproblems of one window.
+
+        Parameters
+        ----------
+        snapshot (tuple): A value returned by BitmaskWindowSolver.snapshot.
+        states (list): The (index, mask, remaining, utility) split states.
+        incumbent (int): Utility of a known solution of the window.
+
+        Returns
+        ----------
+        list: The result of every subproblem, see _solve_subproblem.
+        """
+        self.shared_best.value = incumbent
+        return list(self.executor.map(_solve_subproblem, [(snapshot, state) for state in states]))
+
+    def shutdown(self):
+        """
+        Stops the worker processes.
+        """
+        self.executor.shutdown()
+
+
+_worker_best = None
+_worker_memo = None
+
+
+def _init_worker(shared_best, memo_spec):
+    """
+    Sets up a worker process of a SearchPool.
+
+    Parameters
+    ----------
+    shared_best (multiprocessing.Value): Best utility shared by the workers.
+    memo_spec (tuple): Class, max_entries and max_bytes of the memo store, a
+        plain dict is used if None.
+    """
+    global _worker_best, _worker_memo
+    _worker_best = shared_best
+    if memo_spec is None:
+        _worker_memo = {}
+    else:
+        cls, max_entries, max_bytes = memo_spec
+        _worker_memo = cls(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def _solve_subproblem(job):
+    """
+    Solves the subtree below a split state in a worker process.
+
+    Parameters
+    ----------
+    job (tuple): The window snapshot and an (index, mask, remaining, utility) state.
+
+    Returns
+    ----------
+    tuple: The best utility and bitmask of the subtree, the bitmask is None
+        if the subtree was pruned, then the number of states expanded and the
+        memo hits and misses of the subtree.
+    """
+    snapshot, state = job
+    _worker_memo.clear()
+    hits, misses = getattr(_worker_memo, 'hits', 0), getattr(_worker_memo, 'misses', 0)
+    solver = BitmaskWindowSolver.from_snapshot(snapshot)
+    utility, mask = solver.search([state], float('-inf'), _worker_memo, _worker_best)
+    return (utility, mask, solver.nodes_expanded,
+            getattr(_worker_memo, 'hits', 0) - hits, getattr(_worker_memo, 'misses', 0) - misses)
@@ -0,0 +1,207 @@
+from collections import deque
+
+
+class DependencyGraph:
+    """
+    Class used to track task readiness without rescanning the task list.
+
+    The graph is built once from the task list. Completing a task only touches
+    the tasks that depend on it, so readiness tracking over a whole run costs
+    O(V + E) (Kahn's algorithm).
+
+    Attributes
+    ----------
+    tasks_by_id (dict): Maps a task id to its Task object.
+    dependents (dict): Maps a task id to the ids of the tasks depending on it.
+    unmet (dict): Maps a task id to its number of unresolved dependencies.
+    resolved (set): Ids of the tasks whose dependents were already released.
+    ready (deque): Ids of tasks whose dependencies are all resolved and that
+        have not been handed out by pop_ready yet.
+    """
+
+    def __init__(self, tasks):
+        """
+        Builds the reverse-dependency index and the in-degree counters.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects.
+        """
+        self.tasks_by_id = {}
+        self.dependents = {}
+        self.unmet = {}
+        self.resolved = set()
+        self.ready = deque()
+
+        for task in tasks:
+            self.tasks_by_id[task.id] = task
+            self.dependents.setdefault(task.id, [])
+
+        for task in tasks:
+            self._link(task)
+
+    @classmethod
+    def from_compiled(cls, compiled):
+        """
+        Builds the graph from the arrays of a CompiledTaskGraph, without
+        scanning the dependency lists again.
+
+        Parameters
+        ----------
+        compiled (CompiledTaskGraph): The compiled task list.
+
+        Returns
+        ----------
+        DependencyGraph: The same graph as DependencyGraph(compiled.tasks).
+        """
+        graph = cls([])
+        tasks = compiled.tasks
+        for i, task in enumerate(tasks):
+            graph.tasks_by_id[task.id] = task
+            graph.dependents[task.id] = [tasks[k].id for k in compiled.dependents[i]]
+        graph.reset(compiled)
+        return graph
+
+    def reset(self, compiled):
+        """
+        Marks every task of a compiled graph as unresolved again, keeping the
+        reverse-dependency index, so the same graph can be scheduled again in
+        O(V) instead of being rebuilt.
+
+        Only valid for a graph built by from_compiled and not edited since.
+
+        Parameters
+        ----------
+        compiled (CompiledTaskGraph): The compiled task list the graph was built from.
+        """
+        self.resolved.clear()
+        self.ready.clear()
+        for task, dependencies in zip(compiled.tasks, compiled.dependencies):
+            self.unmet[task.id] = len(dependencies)
+            if not dependencies:
+                self.ready.append(task.id)
+
+    def _link(self, task):
+        """
+        Registers the dependencies of a task and queues it if it is ready.
+
+        A dependency on the task itself or on an unknown id is never resolved,
+        so such a task never becomes ready.
+
+        Parameters
+        ----------
+        task (Task): The task whose dependencies are registered.
+        """
+        unmet = 0
+        for dep_id in set(task.dependencies):
+            if dep_id in self.resolved:
+                continue
+            unmet += 1
+            if dep_id != task.id:
+                self.dependents.setdefault(dep_id, []).append(task.id)
+        self.unmet[task.id] = unmet
+        if unmet == 0:
+            self.ready.append(task.id)
+
+    def add_task(self, task):
+        """
+        Adds a task after the graph was built.
+
+        Dependents already registered for the task's id (dangling references)
+        are kept.
+
+        Parameters
+        ----------
+        task (Task): The task to be added.
+        """
+        if task.id in self.tasks_by_id:
+            raise ValueError(f"Task {task.id} is already in the graph")
+        self.tasks_by_id[task.id] = task
+        self.dependents.setdefault(task.id, [])
+        self._link(task)
+
+    def remove_task(self, task_id):
+        """
+        Removes a task, e.g. when it is cancelled.
+
+        The task is dropped from the dependencies of the tasks depending on it,
+        which may make them ready.
+
+        Parameters
+        ----------
+        task_id (int): The ID of the task to be removed.
+
+        Returns
+        ----------
+        list: The tasks that depended on the removed task.
+        """
+        task = self.tasks_by_id.pop(task_id)
+        for dep_id in set(task.dependencies):
+            dependents = self.dependents.get(dep_id, [])
+            if task_id in dependents:
+                dependents.remove(task_id)
+        self.unmet.pop(task_id, None)
+
+        released = []
+        for dependent_id in self.dependents.pop(task_id, []):
+            dependent = self.tasks_by_id[dependent_id]
+            dependent.dependencies = [dep_id for dep_id in dependent.dependencies if dep_id != task_id]
+            released.append(dependent)
+            if task_id not in self.resolved:
+                self.unmet[dependent_id] -= 1
+                if self.unmet[dependent_id] == 0:
+                    self.ready.append(dependent_id)
+        self.resolved.discard(task_id)
+        return released
+
+    def resolve(self, task_id):
+        """
+        Marks a task as done and releases the tasks depending on it.
+
+        Resolving the same task more than once has no further effect.
+
+        Parameters
+        ----------
+        task_id (int): The ID of the completed task.
+
+        Returns
+        ----------
+        list: The tasks that became ready because of this call.
+        """
+        if task_id in self.resolved:
+            return []
+        self.resolved.add(task_id)
+
+        newly_ready = []
+        for dependent_id in self.dependents.get(task_id, ()):
+            self.unmet[dependent_id] -= 1
+            if self.unmet[dependent_id] == 0:
+                self.ready.append(dependent_id)
+                newly_ready.append(self.tasks_by_id[dependent_id])
+        return newly_ready
+
+    def is_ready(self, task_id):
+        """
+        Checks whether all the dependencies of a task are resolved.
+
+        Parameters
+        ----------
+        task_id (int): The identifier for the task.
+
+        Returns
+        ----------
+        bool: True if the task can be scheduled, False otherwise.
+        """
+        return self.unmet.get(task_id, 0) == 0
+
+    def pop_ready(self):
+        """
+        Hands out the tasks that became ready since the previous call.
+
+        Returns
+        ----------
+        list: Task objects in the order they became ready.
+        """
+        ready = [self.tasks_by_id[task_id] for task_id in self.ready]
+        self.ready.clear()
+        return ready
@@ -0,0 +1,175 @@
+import heapq
+from bisect import bisect_right
+
+
+class DurationIndex:
+    """
+    Class used to find the highest priority ready task that fits in a gap.
+
+    Tasks are bucketed by duration, one bucket per distinct duration of the
+    task list, and every bucket is a heap by priority. A max segment tree over
+    the buckets, sorted by duration, holds the best entry of every range of
+    buckets, so the best task among all the buckets of short enough tasks is
+    found in O(log d) for d distinct durations, and pushing or popping a task
+    costs O(log d + log n).
+
+    Removed tasks are deleted lazily, when they reach the top of their bucket.
+
+    Attributes
+    ----------
+    durations (list): The sorted distinct durations, one per bucket.
+    buckets (list): Heaps of (-priority, order, task) entries, by bucket.
+    tree (list): Segment tree of the best (priority, -order, bucket) key of
+        every range of buckets, None for an empty range.
+    size (int): Number of leaves of the tree, a power of two.
+    live (dict): Maps the id of every task in the index to the order of its
+        entry, entries of removed tasks are not in it.
+    """
+
+    def __init__(self, durations):
+        """
+        Initializes an empty index.
+
+        Parameters
+        ----------
+        durations (iterable): Every duration a task pushed later can have.
+        """
+        self.durations = sorted(set(durations))
+        self.buckets = [[] for _ in self.durations]
+        self.size = 1
+        while self.size < len(self.durations):
+            self.size *= 2
+        self.tree = [None] * (2 * self.size)
+        self.live = {}
+        self._order = 0
+
+    def __len__(self):
+        return len(self.live)
+
+    def clear(self):
+        """
+        Removes every task, keeping the buckets of the durations.
+        """
+        for bucket in self.buckets:
+            bucket.clear()
+        self.tree = [None] * (2 * self.size)
+        self.live.clear()
+        self._order = 0
+
+    def _bucket(self, duration):
+        """
+        Returns the bucket of a duration.
+
+        Parameters
+        ----------
+        duration (int): A duration given to the constructor.
+
+        Returns
+        ----------
+        int: The index of its bucket.
+        """
+        b = bisect_right(self.durations, duration) - 1
+        if b < 0 or self.durations[b] != duration:
+            raise ValueError(f"Duration {duration} is not in the index")
+        return b
+
+    def _refresh(self, b):
+        """
+        Drops the removed tasks from the top of a bucket and updates the tree.
+
+        Parameters
+        ----------
+        b (int): The index of the bucket.
+        """
+        bucket = self.buckets[b]
+        while bucket and self.live.get(bucket[0][2].id) != bucket[0][1]:
+            heapq.heappop(bucket)
+
+        i = self.size + b
+        self.tree[i] = (-bucket[0][0], -bucket[0][1], b) if bucket else None
+        i //= 2
+        while i:
+            left, right = self.tree[2 * i], self.tree[2 * i + 1]
+            self.tree[i] = left if right is None or (left is not None and left > right) else right
+            i //= 2
+
+    def push(self, task, priority):
+        """
+        Adds a ready task.
+
+        Parameters
+        ----------
+        task (Task): The task, its duration must have been given to the constructor.
+        priority (int): The priority value of the task.
+        """
+        b = self._bucket(task.duration)
+        if task.id in self.live:
+            raise ValueError(f"Task {task.id} is already in the index")
+        self.live[task.id] = self._order
+        heapq.heappush(self.buckets[b], (-priority, self._order, task))
+        self._order += 1
+        if self.buckets[b][0][2] is task:
+            self._refresh(b)
+
+    def discard(self, task):
+        """
+        Removes a task that was pushed, e.g. because it was run from another queue.
+
+        Parameters
+        ----------
+        task (Task): The task to be removed.
+        """
+        b = self._bucket(task.duration)
+        del self.live[task.id]
+        if self.buckets[b][0][2] is task:
+            self._refresh(b)
+
+    def best_fitting(self, limit):
+        """
+        Finds the bucket holding the highest priority task not longer than limit.
+
+        Equal priorities are broken in favour of the task pushed first.
+
+        Parameters
+        ----------
+        limit (int): Maximum duration in minutes.
+
+        Returns
+        ----------
+        int: The index of the bucket, None if no task fits.
+        """
+        lo = self.size
+        hi = self.size + bisect_right(self.durations, limit)
+        best = None
+        while lo < hi:
+            if lo & 1:
+                if self.tree[lo] is not None and (best is None or self.tree[lo] > best):
+                    best = self.tree[lo]
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                if self.tree[hi] is not None and (best is None or self.tree[hi] > best):
+                    best = self.tree[hi]
+            lo //= 2
+            hi //= 2
+        return None if best is None else best[2]
+
+    def pop_fitting(self, limit):
+        """
+        Removes and returns the highest priority task not longer than limit.
+
+        Parameters
+        ----------
+        limit (int): Maximum duration in minutes.
+
+        Returns
+        ----------
+        tuple: The task and its priority, None if no task fits.
+        """
+        b = self.best_fitting(limit)
+        if b is None:
+            return None
+        priority, _, task = heapq.heappop(self.buckets[b])
+        del self.live[task.id]
+        self._refresh(b)
+        return task, -priority
@@ -1,3 +1,18 @@
+import os
+import time
+from collections import deque
+
+from bitmask_dp import BitmaskWindowSolver, SearchPool
+from dependency_graph import DependencyGraph
+from event_sink import NullEventSink
+from horizon import as_horizon
+from impact_scoring import make_priority_table
+from max_priority_queue import MaxHeapq
+from memo_store import ClockMemoStore
+from scheduler_stats import CountingMaxHeapq, NullSchedulerStats
+from task_graph import CompiledTaskGraph, compile_tasks
+
+
 class TaskSchedulerDynamic:
     """
     Class for scheduling tasks dynamically.
@@ -16,36 +31,189 @@ class TaskSchedulerDynamic:
         List containing the maximum utility calculated.
     global_tasks : list
         List containing the most optimal tasks found.
-    mem_dict : dict
-        Dictionary for storing intermediate results during scheduling.
+    mem_dict : MemoStore
+        Bounded store for intermediate results, cleared for every time window.
     available_tasks : list
         List of tasks that are currently available for scheduling.
     task_priority_values : dict
         Dictionary storing priority values for each task.
+    compiled : CompiledTaskGraph
+        Validated graph structure, computed once.
+    initial_status : list
+        Status of every task when compiled, restored by reset.
+    graph : DependencyGraph
+        Reverse-dependency index used to release ready tasks.
+    constrained_tasks : list
+        Time-constrained tasks not pushed to the start time queue yet.
+    unscheduled_count : int
+        Number of tasks that were not queued yet.
+    priority_table : PriorityTable
+        Precomputed priority of every task, an ImpactTable for the scorings
+        other than 'legacy'.
+    engine : str
+        Window solver, 'bitmask' for BitmaskWindowSolver, 'parallel' for its
+        process-pool search, 'knapsack' for the NumPy KnapsackWindowSolver or
+        'memory' for dynamic_programming_memory.
+    workers : int
+        Number of worker processes of the 'parallel' engine.
+    search_pool : SearchPool
+        Worker processes of the 'parallel' engine during a run, None otherwise.
+    sink : NullEventSink
+        Receives the scheduling events, nothing is logged by default.
+    table : TaskTable
+        The table the tasks were built from, None for a list of tasks.
+    stats : NullSchedulerStats
+        Receives the counters, timers and window details of the runs,
+        nothing is recorded by default.
+    checkpoint_path : str
+        File the 'bitmask' engine saves its window search to, None to disable
+        checkpointing. The windows solved by a run are logged next to it, see
+        search_checkpoint.windows_path.
+    solved_windows : dict
+        Results of the windows logged by an interrupted run, by window
+        fingerprint, reused instead of searching these windows again.
+    checkpoint_interval : float
+        Seconds between two checkpoints of a window search.
+    window_budget_ms : float
+        Time budget of every window search of the 'bitmask' engine in
+        milliseconds, None to always search for the optimum.
+    window_results : list
+        One dict per window solved by the 'bitmask', 'parallel' or 'knapsack'
+        engine, with its time, limit, utility, bound (upper bound of the
+        optimal utility), timed_out (whether the budget ran out) and exact
+        (whether the utility is optimal; for 'knapsack', whether the
+        candidates formed a forest).
     """
 
     NOT_STARTED = 'N'
     IN_PRIORITY_QUEUE = 'I'
     COMPLETED = 'C'
 
-    def __init__(self, tasks):
+    ENGINES = ('bitmask', 'parallel', 'knapsack', 'memory')
+    DEFAULT_MEMO_ENTRIES = 1000000
+    DEFAULT_TIME_LIMIT = 20*60
+
+    def __init__(self, tasks, engine='bitmask', memo=None, sink=None, workers=None, stats=None,
+                 checkpoint_path=None, checkpoint_interval=60, priority_table=None, window_budget_ms=None,
+                 scoring='legacy'):
         """
         Initializes a new TaskScheduler object.
 
         Parameters
         ----------
-        tasks : list
-            List of Task objects.
+        tasks : list, TaskTable or CompiledTaskGraph
+            List of Task objects, a TaskTable, converted to Task objects
+            with to_tasks and whose status column is updated when the
+            scheduler finishes, or tasks already compiled
+            with compile_tasks, e.g. shared by several schedulers run one
+            after the other.
+        engine : str
+            Window solver, 'bitmask' (default), 'parallel', 'knapsack' or 'memory'.
+            'knapsack' solves a window in time proportional to its candidates
+            times its minutes and needs NumPy; it is optimal when no candidate
+            depends on more than one other candidate.
+        memo : MemoStore
+            Memo store shared by the windows, by default a ClockMemoStore
+            holding at most DEFAULT_MEMO_ENTRIES entries.
+        sink : NullEventSink
+            Event sink, e.g. ConsoleEventSink to print the schedule.
+        workers : int
+            Number of worker processes of the 'parallel' engine, one per CPU if
+            None. They are started once per run and build their memo stores
+            with the class and limits of memo.
+        stats : SchedulerStats
+            Collects heap operations, readiness scans, priority computations,
+            DP nodes, memo hits and misses and window solve times.
+        checkpoint_path : str
+            File the 'bitmask' engine periodically saves its window search to,
+            so that a long search interrupted by a crash resumes where it was
+            when the scheduler is run again. The windows already solved by
+            the interrupted run are not searched again, their logged results
+            are reused. Both files are removed once the run finishes.
+        checkpoint_interval : float
+            Seconds between two checkpoints of a window search.
+        priority_table : PriorityTable
+            Precomputed priorities, e.g. over a larger task list the tasks were
+            taken from, computed from tasks with scoring if None.
+        scoring : str
+            How priorities are computed, see impact_scoring: 'legacy' (default)
+            for 10 points per direct dependent, 'descendants', 'critical_path'
+            or 'downstream_preference' to favour the tasks unblocking more of
+            the graph. Computed once, every decision is a table lookup.
+        window_budget_ms : float
+            Anytime mode of the 'bitmask' engine: every window search starts
+            from the greedy choice of tasks and returns the best choice found
+            within this many milliseconds, see window_results and
+            optimality_gap for how good it is.
+
+        Raises
+        ----------
+        ValueError: If the engine is unknown, a window budget is given to
+            another engine than 'bitmask', the scoring is unknown, or the
+            dependencies contain a cycle or an unknown id.
         """
-        self.tasks = tasks
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown engine '{engine}', expected one of {self.ENGINES}")
+        if window_budget_ms is not None and engine != 'bitmask':
+            raise ValueError(f"window_budget_ms is only supported by the 'bitmask' engine, not '{engine}'")
+        self.engine = engine
+        self.workers = workers
+        self.checkpoint_path = checkpoint_path
+        self.checkpoint_interval = checkpoint_interval
+        self.solved_windows = {}
+        self.window_budget_ms = window_budget_ms
+        self.table = None
+        if hasattr(tasks, 'to_tasks'):
+            self.table = tasks
+            tasks = tasks.to_tasks()
+        self.compiled = tasks if isinstance(tasks, CompiledTaskGraph) else compile_tasks(tasks)
+        self.tasks = self.compiled.tasks
+        self.initial_status = self.compiled.initial_status
+        self.stats = stats if stats is not None else NullSchedulerStats()
+        self.heap = CountingMaxHeapq(self.stats) if self.stats.enabled else MaxHeapq()
+        self.mem_dict = memo if memo is not None else ClockMemoStore(max_entries=self.DEFAULT_MEMO_ENTRIES)
+        self.graph = DependencyGraph.from_compiled(self.compiled)
+        if priority_table is None:
+            priority_table = make_priority_table(self.compiled, scoring)
+        self.priority_table = priority_table
+        self.sink = sink if sink is not None else NullEventSink()
+        self.search_pool = None
+        self.reset()
+
+    def reset(self, priority_table=None):
+        """
+        Restores the per-run state, so the same tasks can be scheduled again,
+        e.g. from another starting time, without compiling them again.
+
+        Only the task statuses, the readiness counters, the queues, the memo
+        store and the window results are reset, in O(V); the compiled graph
+        and the dependents are kept. The worker processes of the 'parallel'
+        engine, if still running, are stopped.
+
+        Parameters
+        ----------
+        priority_table (PriorityTable): Priorities of the next runs, e.g. with
+            other preferences, the current ones are kept if None.
+        """
+        self.shutdown_pool()
+        if priority_table is not None:
+            self.priority_table = priority_table
+        for task, status in zip(self.tasks, self.initial_status):
+            task.status = status
+        self.graph.reset(self.compiled)
+        for task in self.tasks:
+            if task.status == self.COMPLETED:
+                self.graph.resolve(task.id)
         self.priority_queue_strt = []
-        self.heap = MaxHeapq()
         self.current_time = 0
         self.global_max = [0]
         self.global_tasks = [{}]
-        self.mem_dict = {}
+        self.mem_dict.clear()
         self.available_tasks = []
         self.task_priority_values = {}
+        self.window_results = []
+        self.constrained_tasks = [task for task in self.tasks if task.has_time_constraint]
+        self.unscheduled_count = sum(1 for task in self.tasks if task.status == self.NOT_STARTED)
 
     def print_task_descriptions(self):
         """
@@ -62,18 +230,21 @@ class TaskSchedulerDynamic:
         """
         Removes the dependency of a task with the specified ID.
 
+        Only the tasks depending on the given task are visited, the tasks'
+        dependency lists are left untouched.
+
         Parameters
         ----------
         task_id (int): The ID of the task whose dependency is to be removed.
         """
-        for task in self.tasks:
-            if task.id != task_id and task_id in task.dependencies:
-                task.dependencies.remove(task_id)
+        self.graph.resolve(task_id)
 
     def calculate_priority(self, task_id):
         """
         Calculates the priority of a task based on its dependencies and start times.
 
+        The value is looked up in the precomputed priority table.
+
         Parameters
         ----------
         task_id (int): The identifier for the task.
@@ -82,36 +253,31 @@ class TaskSchedulerDynamic:
         ----------
         int: The calculated priority for the task.
         """
-        dependencies = 0
-        preference = 0
-
-        for task in self.tasks:
-            if task_id in task.dependencies:
-                dependencies += 10
-            if task.id == task_id:
-                preference = task.preference
-
-        priority = dependencies + preference
-        return priority
+        self.stats.count('priority_computations')
+        return self.priority_table.get(task_id)
 
     def get_ready_tasks(self):
         """
         Gets tasks ready for execution based on their dependencies and inserts them
         into their correct priority queues with their priority value.
         """
+        self.stats.count('readiness_scans')
         ready_tasks_prio_strt = []
 
-        for task in self.tasks:
+        for task in self.constrained_tasks: #for tasks with time constraints
             if task.status == self.NOT_STARTED:
-                if task.has_time_constraint: #for tasks with time constraints
-                    ready_tasks_prio_strt.append(task)
-                else:
-                    if len(task.dependencies) == 0: #for available tasks with no time constraints
-                        self.available_tasks.append(task)
-                        task.status = self.IN_PRIORITY_QUEUE
+                ready_tasks_prio_strt.append(task)
+        self.constrained_tasks = []
+
+        for task in self.graph.pop_ready():
+            if task.status == self.NOT_STARTED and not task.has_time_constraint: #for available tasks with no time constraints
+                self.available_tasks.append(task)
+                task.status = self.IN_PRIORITY_QUEUE
+                self.unscheduled_count -= 1
 
         for task in ready_tasks_prio_strt:
             task.status = self.IN_PRIORITY_QUEUE
+            self.unscheduled_count -= 1
             priority = -1 * task.start_time
             self.heap.heappush(self.priority_queue_strt, (task, priority))
 
@@ -123,10 +289,7 @@ class TaskSchedulerDynamic:
         ----------
         bool: True if there are unscheduled tasks, False otherwise.
         """
-        for task in self.tasks:
-            if task.status == self.NOT_STARTED:
-                return True
-        return False
+        return self.unscheduled_count > 0
 
     def format_time(self, time):
         """
@@ -152,11 +315,10 @@ class TaskSchedulerDynamic:
         task (Task): The task to be executed.
         priority (int): The priority value of the task.
         """
-        print(f"🕰t={self.format_time(self.current_time)}")
-        print(f"\tstarted '{task.description}' for {task.duration} mins...")
+        self.sink.task_started(self.current_time, task)
 
         self.current_time += task.duration
-        print(f"\t✅ t={self.format_time(self.current_time)}, task completed! '{priority} priority'")
+        self.sink.task_completed(self.current_time, task, priority)
 
         self.remove_dependency(task.id)
         task.status = self.COMPLETED
@@ -169,6 +331,175 @@ class TaskSchedulerDynamic:
             priority = self.task_priority_values.get(task.id, 0)
             self.execute_task(task, priority)
         self.global_tasks = [{}]
+        self.available_tasks = [task for task in self.available_tasks if task.status != self.COMPLETED]
+        self.get_ready_tasks()
+
+    def window_candidates(self, limit):
+        """
+        Collects the tasks that could be executed within a time window.
+
+        Starting from the available tasks, the tasks without time constraint
+        whose dependencies can all be completed inside the window are added,
+        in topological order. Tasks longer than the window are left out along
+        with everything depending on them.
+
+        Parameters
+        ----------
+        limit (int): Time limit in minutes of the window.
+
+        Returns
+        ----------
+        list: The candidate tasks in topological order.
+        """
+        candidates = []
+        pending = {}
+        queue = deque(task for task in self.available_tasks
+                      if task.status == self.IN_PRIORITY_QUEUE and task.duration <= limit)
+        while queue:
+            task = queue.popleft()
+            candidates.append(task)
+            for dependent_id in self.graph.dependents.get(task.id, ()):
+                dependent = self.graph.tasks_by_id.get(dependent_id)
+                if (dependent is None or dependent.status != self.NOT_STARTED
+                        or dependent.has_time_constraint or dependent.duration > limit):
+                    continue
+                unmet = pending.get(dependent_id, self.graph.unmet[dependent_id]) - 1
+                pending[dependent_id] = unmet
+                if unmet == 0:
+                    queue.append(dependent)
+        return candidates
+
+    def bitmask_dynamic_programming(self, limit):
+        """
+        Finds the best set of tasks for a time window with BitmaskWindowSolver,
+        in a process pool for the 'parallel' engine, or with
+        KnapsackWindowSolver for the 'knapsack' engine.
+
+        Unlike dynamic_programming_memory, the search does not modify the
+        tasks or the dependency graph; the chosen tasks are stored in
+        global_tasks for execute_global_tasks.
+
+        Parameters
+        ----------
+        limit (int): Time limit in minutes for scheduling tasks.
+        """
+        deadline = None
+        if self.window_budget_ms is not None:
+            deadline = time.monotonic() + self.window_budget_ms / 1000
+        candidates = self.window_candidates(limit)
+        utilities = [self.calculate_priority(task.id) for task in candidates]
+        for task, priority in zip(candidates, utilities):
+            self.task_priority_values[task.id] = priority
+
+        if self.engine == 'knapsack':
+            from knapsack_dp import KnapsackWindowSolver
+            solver = KnapsackWindowSolver(candidates, utilities)
+            utility, chosen = solver.solve(limit)
+            self.window_results.append({'time': self.current_time, 'limit': limit, 'utility': utility,
+                                        'bound': solver.bound, 'timed_out': False, 'exact': solver.exact})
+            self.stats.count('windows_inexact', not solver.exact)
+        elif self.engine == 'parallel':
+            if self.search_pool is None:
+                self.search_pool = SearchPool(self.workers, self.mem_dict)
+            solver = BitmaskWindowSolver(candidates, utilities)
+            utility, chosen = solver.solve_parallel(limit, pool=self.search_pool, memo=self.mem_dict)
+            self.window_results.append({'time': self.current_time, 'limit': limit, 'utility': utility,
+                                        'bound': solver.bound, 'timed_out': False, 'exact': True})
+        else:
+            solver = BitmaskWindowSolver(candidates, utilities)
+            fingerprint = None
+            if self.checkpoint_path is not None:
+                import search_checkpoint
+                fingerprint = search_checkpoint.window_fingerprint(solver, limit)
+            if fingerprint in self.solved_windows:  # solved before the run was interrupted
+                utility, bound, timed_out, task_ids = self.solved_windows[fingerprint]
+                task_ids = set(task_ids)
+                chosen = [task for task in candidates if task.id in task_ids]
+            else:
+                utility, chosen = solver.solve(limit, memo=self.mem_dict, checkpoint_path=self.checkpoint_path,
+                                               checkpoint_interval=self.checkpoint_interval, deadline=deadline)
+                bound, timed_out = solver.bound, solver.timed_out
+                if fingerprint is not None:
+                    search_checkpoint.append_window(search_checkpoint.windows_path(self.checkpoint_path),
+                                                    fingerprint, utility, bound, timed_out,
+                                                    [task.id for task in chosen])
+            self.window_results.append({'time': self.current_time, 'limit': limit, 'utility': utility,
+                                        'bound': bound, 'timed_out': timed_out, 'exact': not timed_out})
+            self.stats.count('windows_timed_out', timed_out)
+            self.stats.count('windows_inexact', timed_out)
+        self.stats.count('dp_nodes_expanded', solver.nodes_expanded)
+
+        for task in chosen:
+            if task.status == self.NOT_STARTED:
+                task.status = self.IN_PRIORITY_QUEUE
+                self.unscheduled_count -= 1
+        self.global_max[0] = utility
+        self.global_tasks[0] = chosen
+
+    def clear_checkpoint(self):
+        """
+        Removes the log of the solved windows once the run is finished, so
+        that the next run searches every window again.
+        """
+        import search_checkpoint
+        path = search_checkpoint.windows_path(self.checkpoint_path)
+        if os.path.exists(path):
+            os.remove(path)
+        self.solved_windows = {}
+
+    def shutdown_pool(self):
+        """
+        Stops the worker processes of the 'parallel' engine, started by the
+        first window of a run and shared by its other windows.
+        """
+        if self.search_pool is not None:
+            self.search_pool.shutdown()
+            self.search_pool = None
+
+    def optimality_gap(self):
+        """
+        Estimates how far the windows solved by the 'bitmask', 'parallel' or
+        'knapsack' engine may be from their optimal choice of tasks.
+
+        Returns
+        ----------
+        float: The utility the windows may have missed, relative to their
+            upper bounds, 0 when every window was solved to optimality.
+        """
+        bound = sum(result['bound'] for result in self.window_results)
+        utility = sum(result['utility'] for result in self.window_results)
+        return (bound - utility) / bound if bound > 0 else 0.0
+
+    def solve_window(self, limit):
+        """
+        Selects the tasks to execute within a time window with the configured engine.
+
+        Parameters
+        ----------
+        limit (int): Time limit in minutes for scheduling tasks.
+
+        Returns
+        ----------
+        bool: True if at least one task was selected, False otherwise.
+        """
+        self.mem_dict.clear()
+        started = self.stats.start_timer()
+        if self.stats.enabled:
+            hits, misses = self.mem_dict.hits, self.mem_dict.misses
+            nodes = self.stats.counters.get('dp_nodes_expanded', 0)
+        if self.engine == 'memory':
+            self.dynamic_programming_memory(set(), 0, limit)
+        else:
+            self.bitmask_dynamic_programming(limit)
+        seconds = self.stats.stop_timer('window_solve', started)
+        if self.stats.enabled:
+            self.stats.count('memo_hits', self.mem_dict.hits - hits)
+            self.stats.count('memo_misses', self.mem_dict.misses - misses)
+            self.stats.window(time=self.current_time, limit=limit, seconds=seconds,
+                              nodes=self.stats.counters.get('dp_nodes_expanded', 0) - nodes,
+                              utility=self.global_max[0], tasks=len(self.global_tasks[0]))
+        self.sink.window_solved(self.current_time, limit, self.global_max[0], list(self.global_tasks[0]))
+        return len(self.global_tasks[0]) > 0
 
     def dynamic_programming_memory(self, done_so_far, utility_so_far, limit):
         """
@@ -190,9 +521,10 @@ class TaskSchedulerDynamic:
                 current_tasks = frozenset(temp)
                 continue #move on to the following task
 
-            self.task_priority_values[task.id] = self.calculate_priority(task.id)
+            priority = self.calculate_priority(task.id)
+            self.task_priority_values[task.id] = priority
 
-            current_utility = utility_so_far + self.calculate_priority(task.id)
+            current_utility = utility_so_far + priority
             self.mem_dict[current_tasks] = current_utility
 
             if current_utility > self.global_max[0]:
@@ -217,25 +549,51 @@ class TaskSchedulerDynamic:
 
         Parameters
         ----------
-        starting_time (int): The starting time of the scheduler.
+        starting_time (int or Horizon): The starting time in hours, the last
+            window then ends at DEFAULT_TIME_LIMIT, or a Horizon giving the
+            first and last minute of the run, e.g. over several days.
+            No window extends past the end, and time-constrained tasks
+            starting at or after it are left unscheduled.
         """
-        self.current_time = starting_time * 60
+        horizon = as_horizon(starting_time, self.DEFAULT_TIME_LIMIT)
+        self.current_time = horizon.start
+        self.sink.scheduler_started('dynamic', self.current_time)
+        self.stats.start_run()
+        if self.checkpoint_path is not None:
+            import search_checkpoint
+            self.solved_windows = search_checkpoint.read_windows(search_checkpoint.windows_path(self.checkpoint_path))
         self.get_ready_tasks()
 
 
-        while self.unscheduled_tasks_exist() or self.priority_queue_strt or self.global_tasks[0]:
-            if len(self.priority_queue_strt) > 0:
-                task_strt, prio_strt = self.heap.heappop(self.priority_queue_strt)
-
-                if self.current_time == task_strt.start_time:
-                    self.execute_task(task_strt, prio_strt)
-                    self.get_ready_tasks()
+        try:
+            while self.unscheduled_tasks_exist() or self.priority_queue_strt or self.available_tasks:
+                if self.current_time >= horizon.end:
+                    break  # no task starts at or after the end of the horizon
+                if len(self.priority_queue_strt) > 0:
+                    task_strt, prio_strt = self.heap.heappop(self.priority_queue_strt)
+
+                    if task_strt.start_time >= horizon.end:
+                        continue  # starts after the horizon, left unscheduled
+                    if self.current_time >= task_strt.start_time:
+                        self.execute_task(task_strt, prio_strt)
+                        self.get_ready_tasks()
+                    else:
+                        limit = min(task_strt.start_time, horizon.end) - self.current_time
+                        if not self.solve_window(limit):
+                            self.current_time = task_strt.start_time #nothing fits, wait for the task
+                        self.execute_global_tasks()
+                        self.heap.heappush(self.priority_queue_strt, (task_strt, prio_strt))
                 else:
-                    limit = task_strt.start_time - self.current_time
-                    self.dynamic_programming_memory(set(), 0, limit)
+                    limit = horizon.end - self.current_time
+                    if not self.solve_window(limit):
+                        break
                     self.execute_global_tasks()
-                    self.heap.heappush(self.priority_queue_strt, (task_strt, prio_strt))
-            else:
-                limit = (20*60) - self.current_time
-                self.dynamic_programming_memory(set(), 0, limit)
-                self.execute_global_tasks()
\ No newline at end of file
+        finally:
+            self.shutdown_pool()
+
+        if self.checkpoint_path is not None:
+            self.clear_checkpoint()
+        if self.table is not None:
+            self.table.store_status(self.tasks)
+        self.stats.finish_run()
+        self.sink.scheduler_finished(horizon.start, self.current_time)
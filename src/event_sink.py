@@ -0,0 +1,213 @@
+import sys
+
+
+SCHEDULER_STARTED = 'scheduler_started'
+TASK_STARTED = 'task_started'
+TASK_COMPLETED = 'task_completed'
+WINDOW_SOLVED = 'window_solved'
+SCHEDULER_FINISHED = 'scheduler_finished'
+
+
+def format_time(time):
+    """
+    Formats the time in minutes to hours and minutes.
+
+    Parameters
+    ----------
+    time (int): The time in minutes.
+
+    Returns
+    ----------
+    str: The formatted time in the 'hh:mm' format.
+    """
+    time = int(time)
+    return f"{time // 60}h{time % 60:02d}"
+
+
+def render_event(event):
+    """
+    Formats an event tuple into the human-readable scheduler output.
+
+    Parameters
+    ----------
+    event (tuple): The event kind followed by its fields.
+
+    Returns
+    ----------
+    str: The text to display, None if the event is not displayed.
+    """
+    kind = event[0]
+    if kind == TASK_STARTED:
+        _, time, task = event
+        return f"🕰t={format_time(time)}\n\tstarted '{task.description}' for {task.duration} mins..."
+    if kind == TASK_COMPLETED:
+        _, time, task, priority = event
+        return f"\t✅ t={format_time(time)}, task completed! '{priority} priority'"
+    if kind == SCHEDULER_STARTED:
+        return f"Running a {event[1]} scheduler:\n"
+    if kind == SCHEDULER_FINISHED:
+        total_time = int(event[2] - event[1])
+        return f"\n🏁 Completed all planned tasks in {total_time // 60}h{total_time % 60:02d}min!"
+    return None
+
+
+class NullEventSink:
+    """
+    Event sink that ignores every event, used by default so that scheduling
+    pays nothing for logging.
+    """
+
+    def scheduler_started(self, name, time):
+        """
+        Called when a scheduler starts running.
+
+        Parameters
+        ----------
+        name (str): Short name of the scheduler.
+        time (int): Starting time in minutes.
+        """
+
+    def task_started(self, time, task):
+        """
+        Called when a task starts.
+
+        Parameters
+        ----------
+        time (int): Current time in minutes.
+        task (Task): The task being started.
+        """
+
+    def task_completed(self, time, task, priority):
+        """
+        Called when a task is completed.
+
+        Parameters
+        ----------
+        time (int): Current time in minutes.
+        task (Task): The completed task.
+        priority (int): The priority the task was scheduled with.
+        """
+
+    def window_solved(self, time, limit, utility, tasks):
+        """
+        Called when the dynamic scheduler has chosen the tasks of a time window.
+
+        Parameters
+        ----------
+        time (int): Time in minutes at which the window starts.
+        limit (int): Length of the window in minutes.
+        utility (int): Total utility of the chosen tasks.
+        tasks (list): The chosen tasks in execution order.
+        """
+
+    def scheduler_finished(self, start_time, end_time):
+        """
+        Called when a scheduler has no more tasks to run.
+
+        Parameters
+        ----------
+        start_time (int): Starting time in minutes.
+        end_time (int): Time in minutes when the last task completed.
+        """
+
+
+class BatchEventSink(NullEventSink):
+    """
+    Event sink keeping every event as a compact tuple in memory. Nothing is
+    formatted until render is called.
+
+    Attributes
+    ----------
+    events (list): The recorded (kind, fields...) tuples.
+    """
+
+    def __init__(self):
+        self.events = []
+
+    def scheduler_started(self, name, time):
+        self.events.append((SCHEDULER_STARTED, name, time))
+
+    def task_started(self, time, task):
+        self.events.append((TASK_STARTED, time, task))
+
+    def task_completed(self, time, task, priority):
+        self.events.append((TASK_COMPLETED, time, task, priority))
+
+    def window_solved(self, time, limit, utility, tasks):
+        self.events.append((WINDOW_SOLVED, time, limit, utility, tuple(tasks)))
+
+    def scheduler_finished(self, start_time, end_time):
+        self.events.append((SCHEDULER_FINISHED, start_time, end_time))
+
+    def render(self):
+        """
+        Formats the recorded events like ConsoleEventSink would print them.
+
+        Returns
+        ----------
+        list: One string per displayed event.
+        """
+        lines = []
+        for event in self.events:
+            text = render_event(event)
+            if text is not None:
+                lines.append(text)
+        return lines
+
+
+class ConsoleEventSink(NullEventSink):
+    """
+    Event sink printing the human-readable scheduler output.
+
+    Attributes
+    ----------
+    stream (file): Where the output is written, sys.stdout if None.
+    """
+
+    def __init__(self, stream=None):
+        self.stream = stream
+
+    def emit(self, event):
+        """
+        Formats and writes a single event.
+
+        Parameters
+        ----------
+        event (tuple): The event kind followed by its fields.
+        """
+        text = render_event(event)
+        if text is not None:
+            print(text, file=self.stream or sys.stdout)
+
+    def scheduler_started(self, name, time):
+        self.emit((SCHEDULER_STARTED, name, time))
+
+    def task_started(self, time, task):
+        self.emit((TASK_STARTED, time, task))
+
+    def task_completed(self, time, task, priority):
+        self.emit((TASK_COMPLETED, time, task, priority))
+
+    def scheduler_finished(self, start_time, end_time):
+        self.emit((SCHEDULER_FINISHED, start_time, end_time))
+
+
+class ScheduleEventSink(NullEventSink):
+    """
+    Event sink collecting the executed tasks, e.g. to write the schedule to a file.
+
+    Attributes
+    ----------
+    entries (list): (task, start, end, priority) tuples in completion order.
+    started (dict): Start time of the running tasks, by id.
+    """
+
+    def __init__(self):
+        self.entries = []
+        self.started = {}
+
+    def task_started(self, time, task):
+        self.started[task.id] = time
+
+    def task_completed(self, time, task, priority):
+        self.entries.append((task, self.started.pop(task.id), time, priority))
@@ -1,3 +1,15 @@
+import heapq
+
+from dependency_graph import DependencyGraph
+from duration_index import DurationIndex
+from event_sink import NullEventSink
+from horizon import as_horizon
+from impact_scoring import make_priority_table
+from max_priority_queue import MaxHeapq
+from scheduler_stats import CountingMaxHeapq, NullSchedulerStats
+from task_graph import CompiledTaskGraph, compile_tasks
+
+
 class TaskSchedulerGreedy:
     """
     Class used for scheduling tasks.
@@ -7,29 +19,114 @@ class TaskSchedulerGreedy:
     tasks (list): List of Task objects.
     priority_queue_dep (list): Priority queue based on dependencies.
     priority_queue_strt (list): Priority queue based on start time.
+    duration_index (DurationIndex): Ready tasks without time constraint by
+        duration, used to fill the gap before a time-constrained task.
     heap (MaxHeapq): Heap instance.
     closest_start_time_dict (dict): Dictionary to store the earliest start time in dependent tasks.
+    compiled (CompiledTaskGraph): Validated graph structure, computed once.
+    initial_status (list): Status of every task when compiled, restored by reset.
+    graph (DependencyGraph): Reverse-dependency index used to release ready tasks.
+    unscheduled_count (int): Number of tasks that were not queued yet.
+    priority_table (PriorityTable): Precomputed priority of every task, an
+        ImpactTable for the scorings other than 'legacy'.
+    sink (NullEventSink): Receives the scheduling events, nothing is logged by default.
+    stats (NullSchedulerStats): Receives the counters and timers of the runs,
+        nothing is recorded by default.
+    table (TaskTable): The table the tasks were built from, None for a list of tasks.
+    lane_count (int): Number of parallel lanes multitaskable tasks can be spread over.
+    lanes (list): Min-heap of the times at which every lane becomes free.
+    running (list): Min-heap of (end time, order, task, priority) of the started tasks.
     """
 
     NOT_STARTED = 'N'
     IN_PRIORITY_QUEUE = 'I'
     COMPLETED = 'C'
 
-    def __init__(self, tasks):
+    DEFAULT_TIME_LIMIT = 13*60
+
+    def __init__(self, tasks, sink=None, lanes=1, stats=None, priority_table=None, scoring='legacy'):
         """
         Initializes a new TaskScheduler object.
 
         Parameters
         ----------
-        tasks : list
-            List of Task objects.
+        tasks : list, TaskTable or CompiledTaskGraph
+            List of Task objects, a TaskTable, converted to Task objects
+            with to_tasks and whose status column is updated when the
+            scheduler finishes, or tasks already compiled
+            with compile_tasks, e.g. shared by several schedulers run one
+            after the other.
+        sink : NullEventSink
+            Event sink, e.g. ConsoleEventSink to print the schedule.
+        lanes : int
+            Number of parallel lanes, more than one enables multi-lane scheduling.
+        stats : SchedulerStats
+            Collects heap operations, readiness scans, priority computations
+            and run times, e.g. SchedulerStats(profile=True) to also profile.
+        priority_table : PriorityTable
+            Precomputed priorities, e.g. over a larger task list the tasks were
+            taken from, computed from tasks with scoring if None.
+        scoring : str
+            How priorities are computed, see impact_scoring: 'legacy' (default)
+            for 10 points per direct dependent, 'descendants', 'critical_path'
+            or 'downstream_preference' to favour the tasks unblocking more of
+            the graph. Computed once, every decision is a table lookup.
+
+        Raises
+        ----------
+        ValueError: If the dependencies contain a cycle or an unknown id, which
+            would otherwise keep tasks from ever becoming ready, or the
+            scoring is unknown.
         """
-        self.tasks = tasks
-        self.priority_queue_dep = [] 
-        self.priority_queue_strt = [] 
-        self.heap = MaxHeapq() 
-        self.current_time= 0
- 
+        if lanes < 1:
+            raise ValueError('lanes must be at least 1')
+        self.table = None
+        if hasattr(tasks, 'to_tasks'):
+            self.table = tasks
+            tasks = tasks.to_tasks()
+        self.compiled = tasks if isinstance(tasks, CompiledTaskGraph) else compile_tasks(tasks)
+        self.tasks = self.compiled.tasks
+        self.initial_status = self.compiled.initial_status
+        self.duration_index = DurationIndex(t.duration for t in self.tasks if not t.has_time_constraint)
+        self.stats = stats if stats is not None else NullSchedulerStats()
+        self.heap = CountingMaxHeapq(self.stats) if self.stats.enabled else MaxHeapq()
+        self.graph = DependencyGraph.from_compiled(self.compiled)
+        if priority_table is None:
+            priority_table = make_priority_table(self.compiled, scoring)
+        self.priority_table = priority_table
+        self.sink = sink if sink is not None else NullEventSink()
+        self.lane_count = lanes
+        self.reset()
+
+    def reset(self, priority_table=None):
+        """
+        Restores the per-run state, so the same tasks can be scheduled again,
+        e.g. from another starting time, without compiling them again.
+
+        Only the task statuses, the readiness counters, the queues and the
+        lanes are reset, in O(V); the compiled graph, the dependents and the
+        duration buckets are kept.
+
+        Parameters
+        ----------
+        priority_table (PriorityTable): Priorities of the next runs, e.g. with
+            other preferences, the current ones are kept if None.
+        """
+        if priority_table is not None:
+            self.priority_table = priority_table
+        for t, status in zip(self.tasks, self.initial_status):
+            t.status = status
+        self.graph.reset(self.compiled)
+        for t in self.tasks:
+            if t.status == self.COMPLETED:
+                self.graph.resolve(t.id)
+        self.priority_queue_dep = []
+        self.priority_queue_strt = []
+        self.duration_index.clear()
+        self.current_time = 0
+        self.unscheduled_count = sum(1 for t in self.tasks if t.status == self.NOT_STARTED)
+        self.lanes = []
+        self.running = []
 
     def print_self(self):
         """
@@ -46,18 +143,21 @@ class TaskSchedulerGreedy:
         """
         Removes the dependency of a task with the specified ID.
 
+        Only the tasks depending on the given task are visited, the tasks'
+        dependency lists are left untouched.
+
         Parameters
         ----------
         id (int): The ID of the task whose dependency is to be removed.
         """
-        for t in self.tasks:
-            if t.id != id and id in t.dependencies:
-                t.dependencies.remove(id)  # Remove the dependency from the task
-        
+        self.graph.resolve(id)
+
     def calculate_priority(self, task_id):
         """
         Calculates the priority of a task based on its dependencies and start times.
 
+        The value is looked up in the precomputed priority table.
+
         Parameters
         ----------
         task_id (int): The identifier for the task.
@@ -66,17 +166,8 @@ class TaskSchedulerGreedy:
         ----------
         int: The calculated priority for the task.
         """
-        dependencies = 0
-        preference = 0
-
-        for task in self.tasks:
-            if task_id in task.dependencies:
-                dependencies += 10
-            if task.id == task_id:
-                preference = task.preference
-
-        priority = dependencies + preference
-        return priority
+        self.stats.count('priority_computations')
+        return self.priority_table.get(task_id)
 
 
 
@@ -90,11 +181,12 @@ class TaskSchedulerGreedy:
         ----------
         current_time (int): Current time in minutes.
         """
+        self.stats.count('readiness_scans')
         ready_tasks_prio_dep = []
         ready_tasks_prio_strt = []
 
-        for task in self.tasks:
-            if task.status == self.NOT_STARTED and len(task.dependencies) == 0:
+        for task in self.graph.pop_ready():
+            if task.status == self.NOT_STARTED:
                 if task.has_time_constraint:
                     ready_tasks_prio_strt.append(task)
                 else:
@@ -102,10 +194,14 @@ class TaskSchedulerGreedy:
                     
         #Insert tasks in their correct priority queues
         
+        self.unscheduled_count -= len(ready_tasks_prio_dep) + len(ready_tasks_prio_strt)
+
         for task in ready_tasks_prio_dep:
             task.status = self.IN_PRIORITY_QUEUE
             priority = self.calculate_priority(task.id)
             self.heap.heappush(self.priority_queue_dep, (task, priority))
+            if self.lane_count == 1:
+                self.duration_index.push(task, priority)
 
 
         for task in ready_tasks_prio_strt:
@@ -113,6 +209,26 @@ class TaskSchedulerGreedy:
             priority = -1 * (task.start_time / 60)
             self.heap.heappush(self.priority_queue_strt, (task, priority))
             
+    def discard_completed_tasks(self):
+        """
+        Pops the tasks already run from gap filling off the top of the
+        dependency priority queue.
+        """
+        while self.priority_queue_dep and self.priority_queue_dep[0][0].status == self.COMPLETED:
+            self.heap.heappop(self.priority_queue_dep)
+
+    def skip_late_tasks(self, time_limit):
+        """
+        Drops the time-constrained tasks starting at or after the end of the
+        horizon from their queue, they are left unscheduled.
+
+        Parameters
+        ----------
+        time_limit (int): End of the horizon in minutes.
+        """
+        while self.priority_queue_strt and self.priority_queue_strt[0][0].start_time >= time_limit:
+            self.heap.heappop(self.priority_queue_strt)
+
     def check_unscheduled_tasks(self):
         """
         Checks if there are any unscheduled tasks.
@@ -121,10 +237,7 @@ class TaskSchedulerGreedy:
         ----------
         bool: True if there are unscheduled tasks, False otherwise.
         """
-        for task in self.tasks:
-            if task.status == self.NOT_STARTED:
-                return True
-        return False
+        return self.unscheduled_count > 0
     
     def format_time(self, time):
         """
@@ -142,13 +255,19 @@ class TaskSchedulerGreedy:
         return f"{time // 60}h{time % 60:02d}"
     
     def execute_task(self, task, priority):
-        
-        print(f"🕰t={self.format_time(self.current_time)}")
-        print(f"\tstarted '{task.description}' for {task.duration} mins...")
+        """
+        Executes a task and updates its status.
+
+        Parameters
+        ----------
+        task (Task): The task to be executed.
+        priority (int): The priority value of the task.
+        """
+        self.sink.task_started(self.current_time, task)
 
         self.current_time += task.duration
-        print(f"\t✅ t={self.format_time(self.current_time)}, task completed! '{priority} priority'")
-    
+        self.sink.task_completed(self.current_time, task, priority)
+
         self.remove_dependency(task.id)
         task.status = self.COMPLETED
         
@@ -159,13 +278,22 @@ class TaskSchedulerGreedy:
 
         Parameters
         ----------
-        starting_time (int): The starting time in hours.
+        starting_time (int or Horizon): The starting time in hours, no task is
+            then started at or after DEFAULT_TIME_LIMIT, or a Horizon giving
+            the first and last minute of the run, e.g. over several days.
+            Time-constrained tasks starting at or after the end are left
+            unscheduled.
         """
-        self.current_time = starting_time * 60
+        horizon = as_horizon(starting_time, self.DEFAULT_TIME_LIMIT)
+        if self.lane_count > 1:
+            return self.run_multilane_scheduler(horizon)
+
+        self.current_time = horizon.start
         
-        time_limit= 13*60
+        time_limit = horizon.end
         
-        print("Running a simple scheduler:\n")
+        self.sink.scheduler_started('simple', self.current_time)
+        self.stats.start_run()
         
         self.heap.build_max_heap(self.priority_queue_dep)
         
@@ -174,35 +302,156 @@ class TaskSchedulerGreedy:
         while self.check_unscheduled_tasks() or self.priority_queue_dep or self.priority_queue_strt:
 
             self.get_tasks_ready(self.current_time)
+            self.discard_completed_tasks()
+            self.skip_late_tasks(time_limit)
              
-            if self.current_time >= time_limit: 
-                break
+            if self.current_time >= time_limit:
+                break  # no task starts at or after the end of the horizon
+
+            if not self.priority_queue_dep and not self.priority_queue_strt:
+                break  # the remaining tasks depend on tasks that will not run
 
             if len(self.priority_queue_dep) > 0 and len(self.priority_queue_strt) > 0:
-                task1, prio_strt = self.heap.heappop(self.priority_queue_strt)
-                task2, prio_dep = self.heap.heappop(self.priority_queue_dep)
-                if self.current_time == task1.start_time or self.current_time + task2.duration > task1.start_time:
-                    self.current_time= task1.start_time 
-                    self.execute_task(task1, prio_strt)
-                    
-                    self.heap.heappush(self.priority_queue_strt, (task2, prio_strt))
-    
-                elif self.current_time + task2.duration <= task1.start_time:
-                
+                task1, prio_strt = self.priority_queue_strt[0]
+                task2, prio_dep = self.priority_queue_dep[0]
+                gap = task1.start_time - self.current_time
+                fill = None
+                if 0 < gap < task2.duration:
+                    fill = self.duration_index.pop_fitting(gap)  # a shorter task that fits before task1
+                if 0 < gap and task2.duration <= gap:
+                    self.heap.heappop(self.priority_queue_dep)
+                    self.duration_index.discard(task2)
                     self.execute_task(task2, prio_dep)
-                    self.heap.heappush(self.priority_queue_strt, (task1, prio_strt))
-                    
+                elif fill is not None:
+                    self.stats.count('gap_fills')
+                    self.execute_task(*fill)
+                else:
+                    self.heap.heappop(self.priority_queue_strt)
+                    self.current_time = max(self.current_time, task1.start_time)
+                    self.execute_task(task1, prio_strt)
+
             elif len(self.priority_queue_dep) > 0 and len(self.priority_queue_strt) == 0:
                 task2, prio_dep = self.heap.heappop(self.priority_queue_dep)
-                                                    
+                self.duration_index.discard(task2)
                 self.execute_task(task2, prio_dep)
                 
             elif len(self.priority_queue_dep) == 0 and len(self.priority_queue_strt) > 0:
                 task1, prio_strt = self.heap.heappop(self.priority_queue_strt)
-                self.current_time= task1.start_time
+                self.current_time = max(self.current_time, task1.start_time)
                 
                 self.execute_task(task1, prio_strt) 
                 
-        total_time = self.current_time - (starting_time * 60)
+        if self.table is not None:
+            self.table.store_status(self.tasks)
+        self.stats.finish_run()
+        self.sink.scheduler_finished(horizon.start, self.current_time)
+
+    def start_task(self, task, priority, earliest_start, time_limit=float('inf')):
+        """
+        Starts a task on the lanes, no earlier than the given time.
+
+        A multitaskable task takes the lane that becomes free first. Any other
+        task needs the user's full attention, so it waits for every lane to be
+        free and occupies all of them.
+
+        Parameters
+        ----------
+        task (Task): The task to be started.
+        priority (int): The priority value of the task.
+        earliest_start (int): Earliest start time in minutes.
+        time_limit (int): End of the horizon in minutes, a task that could
+            only start at or after it is left unscheduled.
+        """
+        if task.multitaskable:
+            start = max(self.lanes[0], earliest_start)
+        else:
+            start = max(max(self.lanes), earliest_start)
+        if start >= time_limit:
+            return
+        if task.multitaskable:
+            heapq.heapreplace(self.lanes, start + task.duration)
+        else:
+            self.lanes = [start + task.duration] * self.lane_count
+
+        self.sink.task_started(start, task)
+        heapq.heappush(self.running, (start + task.duration, id(task), task, priority))
+
+    def complete_running_tasks(self, time):
+        """
+        Completes the started tasks ending at or before the given time.
+
+        Parameters
+        ----------
+        time (int): Time in minutes.
+        """
+        while self.running and self.running[0][0] <= time:
+            end, _, task, priority = heapq.heappop(self.running)
+            self.current_time = max(self.current_time, end)
+            self.sink.task_completed(end, task, priority)
+            self.remove_dependency(task.id)
+            task.status = self.COMPLETED
+
+    def run_multilane_scheduler(self, starting_time):
+        """
+        Runs the task scheduler over several parallel lanes.
+
+        Every time a lane becomes free, the tasks completed by then release
+        their dependents, and the lane is given the highest priority ready task
+        (or the time-constrained task due first). Each decision costs
+        O(log n + log k) for n tasks and k lanes.
+
+        Parameters
+        ----------
+        starting_time (int or Horizon): The starting time in hours, or a
+            Horizon, see run_scheduler.
+        """
+        horizon = as_horizon(starting_time, self.DEFAULT_TIME_LIMIT)
+        self.current_time = horizon.start
+        self.lanes = [self.current_time] * self.lane_count
+        self.running = []
+
+        time_limit = horizon.end
+
+        self.sink.scheduler_started('multi-lane', self.current_time)
+        self.stats.start_run()
+
+        while self.check_unscheduled_tasks() or self.priority_queue_dep or self.priority_queue_strt or self.running:
+            free_at = self.lanes[0]
+            self.complete_running_tasks(free_at)
+            self.get_tasks_ready(free_at)
+            self.skip_late_tasks(time_limit)
+
+            if free_at >= time_limit:
+                break
+
+            if not self.priority_queue_dep and not self.priority_queue_strt:
+                if not self.running:
+                    break  # the remaining tasks can never become ready
+                heapq.heapreplace(self.lanes, self.running[0][0])  # idle until the next completion
+                continue
+
+            if self.priority_queue_strt:
+                task1, prio_strt = self.priority_queue_strt[0]
+                if self.priority_queue_dep:
+                    task2, prio_dep = self.priority_queue_dep[0]
+                    start = free_at if task2.multitaskable else max(self.lanes)
+                    # task2 may only run first if task1 still starts on time: task2 ends before it,
+                    # or both share the lanes and another lane is free by then
+                    fits = start + task2.duration <= task1.start_time or (
+                        task1.multitaskable and task2.multitaskable and min(self.lanes[1:3]) <= task1.start_time)
+                    if start < task1.start_time and fits:
+                        self.heap.heappop(self.priority_queue_dep)
+                        self.start_task(task2, prio_dep, free_at, time_limit)
+                        continue
+                self.heap.heappop(self.priority_queue_strt)
+                self.start_task(task1, prio_strt, task1.start_time, time_limit)
+            else:
+                task2, prio_dep = self.heap.heappop(self.priority_queue_dep)
+                self.start_task(task2, prio_dep, free_at, time_limit)
+
+        self.complete_running_tasks(float('inf'))
 
-        print(f"\n🏁 Completed all planned tasks in {total_time // 60}h{total_time % 60:02d}min!")
\ No newline at end of file
+        if self.table is not None:
+            self.table.store_status(self.tasks)
+        self.stats.finish_run()
+        self.sink.scheduler_finished(horizon.start, self.current_time)
@@ -0,0 +1,161 @@
+from datetime import datetime, time, timedelta
+
+
+class Horizon:
+    """
+    Class used to describe the part of the timeline a scheduling run may use.
+
+    The schedulers count time in minutes on a single timeline whose minute 0
+    is the origin, midnight of the first day, so a start time of 8 hours is
+    8:00 on the first day and 32 hours is 8:00 on the second. A horizon covers
+    the minutes from start to end, over any number of days, and converts
+    absolute timestamps to and from the timeline when its origin is known.
+
+    Attributes
+    ----------
+    start (int): Minute at which the run starts.
+    end (int): No task is started at or after this minute, infinity for an
+        unbounded horizon.
+    origin (datetime): Timestamp of minute 0, None for a relative timeline.
+    """
+
+    def __init__(self, start, end=None, origin=None):
+        """
+        Initializes a horizon.
+
+        Parameters
+        ----------
+        start (int): Minute at which the run starts.
+        end (int): Minute at which the horizon ends, None for no end.
+        origin (datetime): Timestamp of minute 0, None for a relative timeline.
+        """
+        if end is not None and end < start:
+            raise ValueError(f"Horizon ends at minute {end}, before its start at minute {start}")
+        self.start = start
+        self.end = end if end is not None else float('inf')
+        self.origin = origin
+
+    def __repr__(self):
+        return f"Horizon(start={self.start}, end={self.end}, origin={self.origin!r})"
+
+    @classmethod
+    def from_hours(cls, starting_time, ending_time=None):
+        """
+        Builds a horizon from hours after the origin, like the starting_time
+        of the schedulers.
+
+        Parameters
+        ----------
+        starting_time (int): The starting time in hours.
+        ending_time (int): The ending time in hours, e.g. 24 * 7 + 20 for 20:00
+            a week after the first day, None for no end.
+
+        Returns
+        ----------
+        Horizon: The horizon on a relative timeline.
+        """
+        return cls(starting_time * 60, ending_time * 60 if ending_time is not None else None)
+
+    @classmethod
+    def between(cls, start, end=None, origin=None):
+        """
+        Builds a horizon from absolute timestamps.
+
+        Parameters
+        ----------
+        start (datetime): When the run starts.
+        end (datetime): When the horizon ends, None for no end.
+        origin (datetime): Timestamp of minute 0, midnight of the start day by default.
+
+        Returns
+        ----------
+        Horizon: The horizon, whose minutes count from origin.
+        """
+        if origin is None:
+            origin = datetime.combine(start.date(), time(), tzinfo=start.tzinfo)
+        horizon = cls(0, origin=origin)
+        return cls(horizon.minutes(start), horizon.minutes(end) if end is not None else None, origin)
+
+    def minutes(self, when):
+        """
+        Converts a timestamp to a minute of the timeline.
+
+        Parameters
+        ----------
+        when (datetime): The timestamp, seconds are dropped.
+
+        Returns
+        ----------
+        int: Minutes since the origin.
+        """
+        if self.origin is None:
+            raise ValueError("The horizon has no origin to convert timestamps with")
+        return int((when - self.origin) // timedelta(minutes=1))
+
+    def timestamp(self, minutes):
+        """
+        Converts a minute of the timeline to a timestamp.
+
+        Parameters
+        ----------
+        minutes (int): Minutes since the origin.
+
+        Returns
+        ----------
+        datetime: The timestamp.
+        """
+        if self.origin is None:
+            raise ValueError("The horizon has no origin to convert timestamps with")
+        return self.origin + timedelta(minutes=minutes)
+
+    def constrain(self, task, when):
+        """
+        Gives a task a fixed start time, e.g. a meeting on a later day.
+
+        Parameters
+        ----------
+        task (Task): The task.
+        when (datetime or int): The start timestamp, or a minute of the timeline.
+        """
+        task.start_time = self.minutes(when) if isinstance(when, datetime) else when
+        task.has_time_constraint = True
+
+    def windows(self, length):
+        """
+        Splits the horizon into consecutive windows.
+
+        Parameters
+        ----------
+        length (int): Length of a window in minutes, the last one may be shorter.
+
+        Yields
+        ----------
+        Horizon: The windows in order, endlessly for an unbounded horizon.
+        """
+        if length < 1:
+            raise ValueError('length must be at least 1 minute')
+        start = self.start
+        while start < self.end:
+            yield Horizon(start, min(start + length, self.end), self.origin)
+            start += length
+
+
+def as_horizon(starting_time, default_end):
+    """
+    Returns the horizon of a scheduler run.
+
+    Parameters
+    ----------
+    starting_time (int or Horizon): The starting time in hours, or a Horizon.
+    default_end (int): End in minutes used with a starting time in hours,
+        None for no end.
+
+    Returns
+    ----------
+    Horizon: The given horizon, or one from starting_time to default_end, empty
+        if the starting time is already past default_end.
+    """
+    if isinstance(starting_time, Horizon):
+        return starting_time
+    start = starting_time * 60
+    return Horizon(start, max(start, default_end) if default_end is not None else None)
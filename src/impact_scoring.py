@@ -0,0 +1,147 @@
+from priority_table import PriorityTable
+from task_graph import CompiledTaskGraph, compile_tasks
+
+SCORINGS = ('legacy', 'descendants', 'critical_path', 'downstream_preference')
+
+
+def descendant_bitsets(compiled):
+    """
+    Computes the transitive dependents of every task in one reverse
+    topological pass.
+
+    Every set is an integer whose bit k is set when task k depends, directly
+    or not, on the task, so merging the sets of the dependents is a bitwise
+    or. The pass costs O(E * V / 64) word operations and the sets take
+    O(V^2) bits.
+
+    Parameters
+    ----------
+    compiled (CompiledTaskGraph): The compiled task list.
+
+    Returns
+    ----------
+    list: The descendant bitset of every task, by task index.
+    """
+    bits = [0] * len(compiled.tasks)
+    for i in reversed(compiled.order):
+        mask = 0
+        for k in compiled.dependents[i]:
+            mask |= bits[k] | (1 << k)
+        bits[i] = mask
+    return bits
+
+
+def downstream_preferences(compiled, bits):
+    """
+    Sums the preferences of the transitive dependents of every task.
+
+    Tasks are grouped by preference value, one bitset per value, so the sum
+    over a descendant set is one popcount per distinct preference.
+
+    Parameters
+    ----------
+    compiled (CompiledTaskGraph): The compiled task list.
+    bits (list): Descendant bitsets returned by descendant_bitsets.
+
+    Returns
+    ----------
+    list: The preference sum of the descendants of every task, by task index.
+    """
+    groups = {}
+    for i, task in enumerate(compiled.tasks):
+        if task.preference:
+            groups[task.preference] = groups.get(task.preference, 0) | (1 << i)
+    return [sum(preference * (mask & group).bit_count() for preference, group in groups.items())
+            for mask in bits]
+
+
+class ImpactTable:
+    """
+    Class used to store priorities measuring how much of the graph every task
+    unblocks, rather than only its direct dependents.
+
+    Scorings, all adding the task's own preference:
+
+        descendants             10 points per transitive dependent.
+        critical_path           Minutes of the longest chain of transitive
+                                dependents, CompiledTaskGraph.critical_tails,
+                                so the greedy scheduler shortens the critical
+                                path first.
+        downstream_preference   Preferences of the transitive dependents,
+                                times downstream_weight.
+
+    Every score is computed once for the whole graph, in one reverse
+    topological pass, and get() is a dict lookup like PriorityTable.get, so
+    the schedulers pay nothing per decision. Unlike PriorityTable, the table
+    is not updated incrementally: build a new one after editing the tasks.
+
+    Attributes
+    ----------
+    scoring (str): The scoring of the table.
+    scores (dict): Maps a task id to its priority.
+    """
+
+    DEPENDENT_POINTS = PriorityTable.DEPENDENT_POINTS
+
+    def __init__(self, tasks, scoring='descendants', downstream_weight=1):
+        """
+        Computes the priority of every task.
+
+        Parameters
+        ----------
+        tasks (list or CompiledTaskGraph): List of Task objects, or the
+            compiled list to reuse its topological order and longest chains.
+        scoring (str): 'descendants' (default), 'critical_path' or
+            'downstream_preference'.
+        downstream_weight (float): Weight of the dependents' preferences of
+            the 'downstream_preference' scoring.
+        """
+        if scoring not in SCORINGS or scoring == 'legacy':
+            raise ValueError(f"Unknown impact scoring '{scoring}', expected one of {SCORINGS[1:]}")
+        compiled = tasks if isinstance(tasks, CompiledTaskGraph) else compile_tasks(tasks)
+        self.scoring = scoring
+        if scoring == 'critical_path':
+            impact = compiled.critical_tails
+        else:
+            bits = descendant_bitsets(compiled)
+            if scoring == 'descendants':
+                impact = [self.DEPENDENT_POINTS * mask.bit_count() for mask in bits]
+            else:
+                impact = [downstream_weight * total for total in downstream_preferences(compiled, bits)]
+        self.scores = {task.id: task.preference + points for task, points in zip(compiled.tasks, impact)}
+
+    def get(self, task_id):
+        """
+        Returns the priority of a task.
+
+        Parameters
+        ----------
+        task_id (int): The identifier for the task.
+
+        Returns
+        ----------
+        int: The priority of the task, 0 for an unknown task.
+        """
+        return self.scores.get(task_id, 0)
+
+
+def make_priority_table(tasks, scoring='legacy', **options):
+    """
+    Builds the priority table of a scoring.
+
+    Parameters
+    ----------
+    tasks (list or CompiledTaskGraph): List of Task objects, or the compiled list.
+    scoring (str): 'legacy' (default) for PriorityTable, 10 points per direct
+        dependent plus the preference, else a scoring of ImpactTable.
+    options: Keyword arguments of ImpactTable, e.g. downstream_weight.
+
+    Returns
+    ----------
+    PriorityTable or ImpactTable: The table.
+    """
+    if scoring not in SCORINGS:
+        raise ValueError(f"Unknown scoring '{scoring}', expected one of {SCORINGS}")
+    if scoring == 'legacy':
+        return PriorityTable(tasks.tasks if isinstance(tasks, CompiledTaskGraph) else tasks)
+    return ImpactTable(tasks, scoring, **options)
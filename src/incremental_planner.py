@@ -0,0 +1,289 @@
+from dependency_graph import DependencyGraph
+from max_priority_queue import IndexedMaxHeapq
+from priority_table import PriorityTable
+
+
+class IncrementalPlanner:
+    """
+    Class used to keep a greedy schedule up to date while tasks are added,
+    cancelled, re-estimated or completed.
+
+    The plan follows the greedy scheduler's policy: the highest priority ready
+    task runs next, unless it would overlap the time-constrained task due
+    first. Every edit finds the first plan position its change can influence
+    and only rebuilds the plan from there; the entries before it are kept as
+    they are.
+
+    The tasks ready at position p of the plan are exactly the unplaced tasks
+    whose dependencies are all placed before p, so rebuilding from p only
+    needs the tasks of the suffix and costs O(s log s) for a suffix of s tasks.
+
+    Attributes
+    ----------
+    graph (DependencyGraph): Dependencies of the live tasks.
+    priority_table (PriorityTable): Priority of every live task.
+    plan (list): (task, start, end) entries, completed ones first.
+    position (dict): Maps a task id to its index in plan.
+    head (int): Index of the first entry that is not completed.
+    unplanned (dict): Tasks that do not fit before time_limit or are blocked, by id.
+    completed (set): Ids of the completed tasks.
+    current_time (int): Time in minutes at which the next task can start.
+    time_limit (int): No task is started at or after this time in minutes.
+    """
+
+    def __init__(self, tasks, starting_time, time_limit=13*60):
+        """
+        Builds the initial plan.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects, tasks with status 'C' are considered done.
+        starting_time (int): The starting time in hours.
+        time_limit (int): No task is started at or after this time in minutes.
+        """
+        self.graph = DependencyGraph(tasks)
+        self.priority_table = PriorityTable(tasks)
+        self.plan = []
+        self.position = {}
+        self.head = 0
+        self.unplanned = {}
+        self.completed = set()
+        self.current_time = starting_time * 60
+        self.time_limit = time_limit
+
+        for task in tasks:
+            if task.status == 'C':
+                self.completed.add(task.id)
+                self.graph.resolve(task.id)
+        self._rebuild([task for task in tasks if task.id not in self.completed])
+
+    def schedule(self):
+        """
+        Returns the planned entries that are not completed yet.
+
+        Returns
+        ----------
+        list: (task, start, end) tuples in execution order.
+        """
+        return self.plan[self.head:]
+
+    def _release_position(self, task):
+        """
+        Returns the first plan position at which a task can be ready.
+
+        Parameters
+        ----------
+        task (Task): The task.
+
+        Returns
+        ----------
+        int: The index after its last planned dependency, len(plan) if a
+            dependency is not planned.
+        """
+        position = self.head
+        for dep_id in task.dependencies:
+            if dep_id in self.position:
+                position = max(position, self.position[dep_id] + 1)
+            elif dep_id not in self.completed:
+                return len(self.plan)
+        return position
+
+    def _truncate(self, p):
+        """
+        Removes the plan entries from position p on.
+
+        Parameters
+        ----------
+        p (int): First position to remove, never before head.
+
+        Returns
+        ----------
+        list: The removed tasks and the unplanned tasks.
+        """
+        p = max(p, self.head)
+        suffix = [entry[0] for entry in self.plan[p:]]
+        for task in suffix:
+            del self.position[task.id]
+        del self.plan[p:]
+        suffix.extend(self.unplanned.values())
+        self.unplanned = {}
+        return [task for task in suffix if task.id in self.graph.tasks_by_id]
+
+    def _rebuild(self, suffix):
+        """
+        Plans the given tasks after the current end of the plan.
+
+        Parameters
+        ----------
+        suffix (list): The tasks that are neither completed nor planned.
+        """
+        time = self.plan[-1][2] if len(self.plan) > self.head else self.current_time
+        in_suffix = {task.id for task in suffix}
+        tasks_by_id = self.graph.tasks_by_id
+        queue_dep = IndexedMaxHeapq()
+        queue_strt = IndexedMaxHeapq()
+        unmet = {}
+
+        def release(task):
+            if task.has_time_constraint:
+                queue_strt.push(-task.start_time, task)
+            else:
+                queue_dep.push(self.priority_table.get(task.id), task)
+
+        for task in suffix:
+            count = 0
+            for dep_id in set(task.dependencies):
+                if dep_id in in_suffix or (dep_id not in tasks_by_id and dep_id not in self.completed):
+                    count += 1
+            unmet[task.id] = count
+            if count == 0:
+                release(task)
+
+        while (queue_dep or queue_strt) and time < self.time_limit:
+            if queue_strt and (not queue_dep
+                               or time + queue_dep.peek()[1].duration > queue_strt.peek()[1].start_time):
+                _, task = queue_strt.pop()
+                time = max(time, task.start_time)
+            else:
+                _, task = queue_dep.pop()
+
+            self.position[task.id] = len(self.plan)
+            self.plan.append((task, time, time + task.duration))
+            time += task.duration
+            del unmet[task.id]
+
+            for dependent_id in self.graph.dependents.get(task.id, ()):
+                if dependent_id in unmet:
+                    unmet[dependent_id] -= 1
+                    if unmet[dependent_id] == 0:
+                        release(tasks_by_id[dependent_id])
+
+        for task in suffix:
+            if task.id in unmet:
+                self.unplanned[task.id] = task
+
+    def _repair(self, p, new_task=None):
+        """
+        Rebuilds the plan from position p on.
+
+        Parameters
+        ----------
+        p (int): First position whose decision may have changed.
+        new_task (Task): A task to be planned that is in no entry of the plan yet.
+        """
+        suffix = self._truncate(p)
+        if new_task is not None:
+            suffix.append(new_task)
+        self._rebuild(suffix)
+
+    def add_task(self, task):
+        """
+        Adds a new task and repairs the plan.
+
+        Its dependencies gain priority, so the plan is rebuilt from the first
+        position where one of them, or the new task, could have been chosen.
+
+        Parameters
+        ----------
+        task (Task): The task to be added.
+        """
+        self.graph.add_task(task)
+        self.priority_table.add_task(task)
+        p = self._release_position(task)
+        for dep_id in set(task.dependencies):
+            dep = self.graph.tasks_by_id.get(dep_id)
+            if dep is not None and dep_id not in self.completed:
+                p = min(p, self._release_position(dep))
+        self._repair(p, task)
+
+    def cancel_task(self, task_id):
+        """
+        Cancels a task that is not completed and repairs the plan.
+
+        The tasks depending on it no longer wait for it.
+
+        Parameters
+        ----------
+        task_id (int): The ID of the task to be cancelled.
+        """
+        if task_id in self.completed:
+            raise ValueError(f"Task {task_id} is already completed")
+        task = self.graph.tasks_by_id[task_id]
+        p = self._release_position(task)
+        for dep_id in set(task.dependencies):
+            dep = self.graph.tasks_by_id.get(dep_id)
+            if dep is not None and dep_id not in self.completed:
+                p = min(p, self._release_position(dep))
+
+        self.priority_table.remove_task(task)
+        dependents = self.graph.remove_task(task_id)
+        for dependent in dependents:
+            if dependent.id not in self.completed:
+                p = min(p, self._release_position(dependent))
+        self.unplanned.pop(task_id, None)
+        self._repair(p)
+
+    def update_duration(self, task_id, duration):
+        """
+        Changes the estimated duration of a task that is not completed and
+        repairs the plan.
+
+        Parameters
+        ----------
+        task_id (int): The ID of the task.
+        duration (int): The new duration in minutes.
+        """
+        if task_id in self.completed:
+            raise ValueError(f"Task {task_id} is already completed")
+        task = self.graph.tasks_by_id[task_id]
+        task.duration = duration
+        self._repair(self._release_position(task))
+
+    def complete_task(self, task_id, end_time=None):
+        """
+        Records that a task was done and repairs the plan if needed.
+
+        Completing the next planned task at its planned end keeps the plan as
+        it is. Otherwise the remaining plan is shifted to the new time.
+
+        Parameters
+        ----------
+        task_id (int): The ID of the completed task.
+        end_time (int): Completion time in minutes, the planned end if None.
+        """
+        if task_id in self.completed:
+            raise ValueError(f"Task {task_id} is already completed")
+        task = self.graph.tasks_by_id[task_id]
+
+        if self.head < len(self.plan) and self.plan[self.head][0] is task:
+            _, start, end = self.plan[self.head]
+            actual_end = end if end_time is None else end_time
+            self.plan[self.head] = (task, start, actual_end)
+            self._finish(task, actual_end)
+            if actual_end != end:
+                self._repair(self.head)
+            return
+
+        suffix = self._truncate(self.head)
+        suffix.remove(task)
+        start = self.current_time
+        actual_end = start + task.duration if end_time is None else end_time
+        self.position[task_id] = len(self.plan)
+        self.plan.append((task, start, actual_end))
+        self._finish(task, actual_end)
+        self._rebuild(suffix)
+
+    def _finish(self, task, end_time):
+        """
+        Marks the entry at head as completed.
+
+        Parameters
+        ----------
+        task (Task): The completed task.
+        end_time (int): Completion time in minutes.
+        """
+        task.status = 'C'
+        self.completed.add(task.id)
+        self.graph.resolve(task.id)
+        self.head += 1
+        self.current_time = end_time
@@ -0,0 +1,186 @@
+from math import gcd
+
+import numpy as np
+
+
+class KnapsackWindowSolver:
+    """
+    Class used to fill a time window by dynamic programming over time instead
+    of over subsets of tasks.
+
+    The window is a precedence-constrained knapsack: tasks of integer
+    durations fill limit minutes and their utilities are maximized. When every
+    candidate depends on at most one other candidate, the dependencies form a
+    forest and the tree knapsack is solved exactly in O(n * T) for n tasks and
+    T minutes. Tasks are laid out in depth-first preorder, and a task is either
+    taken, letting its subtree be considered next, or skipped together with its
+    whole subtree:
+
+        best[p][t] = max(best[end(p)][t], best[p + 1][t - duration] + utility)
+
+    Every row is computed at once with NumPy, as the maximum of the skip row
+    and the shifted take row. Durations and the limit are divided by their
+    greatest common divisor first, which shortens the rows.
+
+    A candidate depending on several candidates is attached to the last of
+    them in topological order. Its other dependencies may then be missing from
+    the solution, so such tasks are dropped afterwards and the freed time is
+    filled greedily; exact is False for those windows.
+
+    Attributes
+    ----------
+    tasks (list): Candidate Task objects in topological order.
+    utilities (list): Utility of every candidate.
+    durations (list): Duration of every candidate.
+    dependencies (list): Indices of the candidates every candidate depends on.
+    parent (list): Index of the candidate every candidate is attached to, -1
+        for the roots of the forest.
+    exact (bool): Whether the dependencies form a forest, in which case the
+        solution is optimal.
+    bound (float): Utility of the forest found by the last solve, an upper
+        bound of the optimal utility since only one dependency of every
+        candidate is enforced; the returned utility when exact is True.
+    nodes_expanded (int): Number of DP cells computed by the last solve.
+    """
+
+    def __init__(self, tasks, utilities):
+        """
+        Maps the candidate tasks to indices and builds the dependency forest.
+
+        Dependencies on tasks that are not candidates are considered already
+        satisfied.
+
+        Parameters
+        ----------
+        tasks (list): Candidate Task objects in topological order.
+        utilities (list): Utility of every candidate task, in the same order.
+        """
+        self.tasks = list(tasks)
+        self.utilities = list(utilities)
+        self.durations = [task.duration for task in self.tasks]
+        index = {task.id: i for i, task in enumerate(self.tasks)}
+        self.dependencies = []
+        self.parent = []
+        self.exact = True
+        for task in self.tasks:
+            deps = sorted({index[dep_id] for dep_id in task.dependencies if dep_id in index})
+            self.dependencies.append(deps)
+            self.parent.append(deps[-1] if deps else -1)
+            if len(deps) > 1:
+                self.exact = False
+        self.bound = 0
+        self.nodes_expanded = 0
+
+    def preorder(self):
+        """
+        Lays the forest out in depth-first preorder.
+
+        Returns
+        ----------
+        tuple: The candidate index at every position, and for every position
+            the position following its subtree.
+        """
+        n = len(self.tasks)
+        children = [[] for _ in range(n)]
+        roots = []
+        for i, parent in enumerate(self.parent):
+            (children[parent] if parent >= 0 else roots).append(i)
+
+        order = []
+        end = [0] * n
+        stack = [(i, None) for i in reversed(roots)]
+        while stack:
+            i, position = stack.pop()
+            if position is not None:
+                end[position] = len(order)  # the whole subtree of i was laid out
+                continue
+            stack.append((i, len(order)))
+            order.append(i)
+            stack.extend((child, None) for child in reversed(children[i]))
+        return order, end
+
+    def solve(self, limit):
+        """
+        Finds the set of tasks with the highest utility that fits in the time
+        limit, optimal when exact is True.
+
+        Parameters
+        ----------
+        limit (int): Length of the time window in minutes.
+
+        Returns
+        ----------
+        tuple: The utility of the chosen tasks and the tasks in execution order.
+        """
+        n = len(self.tasks)
+        self.nodes_expanded = 0
+        self.bound = 0
+        if n == 0 or limit <= 0:
+            return 0, []
+        scale = 0
+        for duration in self.durations:
+            scale = gcd(scale, duration)
+        scale = gcd(scale, int(limit)) or 1
+        T = int(limit) // scale
+        weights = [duration // scale for duration in self.durations]
+
+        order, end = self.preorder()
+        utilities = np.asarray(self.utilities, dtype=np.float64)
+        best = np.zeros((n + 1, T + 1), dtype=np.float64)
+        took = np.zeros((n, T + 1), dtype=np.bool_)
+        for p in range(n - 1, -1, -1):
+            i = order[p]
+            row = best[p]
+            row[:] = best[end[p]]
+            w = weights[i]
+            if w <= T:
+                take = best[p + 1, :T + 1 - w] + utilities[i]
+                took[p, w:] = take > row[w:]
+                np.maximum(row[w:], take, out=row[w:])
+        self.nodes_expanded = n * (T + 1)
+        self.bound = best[0, T].item()
+
+        chosen = set()
+        p, t = 0, T
+        while p < n:
+            if took[p, t]:
+                chosen.add(order[p])
+                t -= weights[order[p]]
+                p += 1
+            else:
+                p = end[p]
+        if not self.exact:
+            chosen = self.repair(chosen, limit)
+        chosen = sorted(chosen)
+        return sum(self.utilities[i] for i in chosen), [self.tasks[i] for i in chosen]
+
+    def repair(self, chosen, limit):
+        """
+        Drops the chosen tasks missing a dependency, then fills the freed time
+        with the highest utility tasks that are ready and fit.
+
+        Parameters
+        ----------
+        chosen (set): Indices of the tasks chosen by the forest DP.
+        limit (int): Length of the time window in minutes.
+
+        Returns
+        ----------
+        set: Indices of a feasible set of tasks.
+        """
+        kept = set()
+        for i in sorted(chosen):
+            if all(dep in kept for dep in self.dependencies[i]):
+                kept.add(i)
+        remaining = limit - sum(self.durations[i] for i in kept)
+        while True:
+            best = None
+            for i in range(len(self.tasks)):
+                if (i not in kept and self.durations[i] <= remaining
+                        and all(dep in kept for dep in self.dependencies[i])
+                        and (best is None or self.utilities[i] > self.utilities[best])):
+                    best = i
+            if best is None:
+                return kept
+            kept.add(best)
+            remaining -= self.durations[best]
@@ -65,18 +65,20 @@ class MaxHeapq:
             i (int): Index to start heapifying from.
             heap_size (int): Size of the heap.
         """
-        left = self.left(i)
-        right = self.right(i)
+        while True:
+            left = self.left(i)
+            right = self.right(i)
 
-        if left <= (heap_size - 1) and A[left][1] > A[i][1]:
-            largest = left
-        else:
-            largest = i
-        if right <= (heap_size - 1) and A[right][1] > A[largest][1]:
-            largest = right
-        if largest != i:
-            A[largest], A[i] = A[i], A[largest] 
-            self.heapify(A, largest, heap_size)
+            if left <= (heap_size - 1) and A[left][1] > A[i][1]:
+                largest = left
+            else:
+                largest = i
+            if right <= (heap_size - 1) and A[right][1] > A[largest][1]:
+                largest = right
+            if largest == i:
+                return
+            A[largest], A[i] = A[i], A[largest]
+            i = largest
 
 
     def heappop(self, A):
@@ -93,9 +95,10 @@ class MaxHeapq:
         if len(A) < 1:
             raise ValueError('Heap underflow: There are no keys in the priority queue ')
         maxk = A[0]
-        A[0] = A[-1]
-        A.pop()
-        self.heapify(A, 0, len(A))
+        last = A.pop()
+        if A:
+            A[0] = last
+            self.heapify(A, 0, len(A))
         return maxk
 
 
@@ -126,4 +129,189 @@ class MaxHeapq:
             holder = A[j]
             A[j] = A[i]
             A[i] = holder
-            i = j
\ No newline at end of file
+            i = j
+
+class IndexedMaxHeapq:
+    """
+    A max priority queue of (key, task) entries that keeps track of where
+    every task sits in the heap, so that a queued task can be reprioritized
+    or removed in O(log n) without searching for it.
+
+    Entries with equal keys are popped in insertion order.
+
+    Attributes:
+
+    heap (list): The heap entries as [(key, -counter), task] lists.
+    position (dict): Maps a task to the index of its entry in the heap.
+    counter (int): Insertion counter used to break ties between equal keys.
+    """
+
+    def __init__(self, entries=()):
+        """
+        Builds the queue from an optional iterable of (key, task) pairs.
+
+        Parameters:
+        entries (iterable): The (key, task) pairs to start with.
+        """
+        self.heap = []
+        self.position = {}
+        self.counter = 0
+        for key, task in entries:
+            self._append(key, task)
+        for i in range(len(self.heap) // 2 - 1, -1, -1):
+            self._sift_down(i)
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __contains__(self, task):
+        return task in self.position
+
+    def _append(self, key, task):
+        """
+        Adds an entry at the end of the heap without restoring the heap property.
+
+        Parameters:
+        key: The priority of the task.
+        task: The task to be queued, it must be hashable.
+        """
+        if task in self.position:
+            raise ValueError('Task is already in the priority queue')
+        self.position[task] = len(self.heap)
+        self.heap.append([(key, -self.counter), task])
+        self.counter += 1
+
+    def _sift_up(self, i):
+        """
+        Moves the entry at index i up until its parent has a higher priority.
+
+        Parameters:
+        i (int): Index of the entry.
+        """
+        heap = self.heap
+        position = self.position
+        entry = heap[i]
+        rank = entry[0]
+        while i > 0:
+            j = (i - 1) >> 1
+            parent = heap[j]
+            if rank < parent[0]:
+                break
+            heap[i] = parent
+            position[parent[1]] = i
+            i = j
+        heap[i] = entry
+        position[entry[1]] = i
+
+    def _sift_down(self, i):
+        """
+        Moves the entry at index i down until both children have a lower priority.
+
+        Parameters:
+        i (int): Index of the entry.
+        """
+        heap = self.heap
+        position = self.position
+        size = len(heap)
+        entry = heap[i]
+        rank = entry[0]
+        child = 2 * i + 1
+        while child < size:
+            candidate = heap[child]
+            right = child + 1
+            if right < size and heap[right][0] > candidate[0]:
+                child = right
+                candidate = heap[right]
+            if candidate[0] < rank:
+                break
+            heap[i] = candidate
+            position[candidate[1]] = i
+            i = child
+            child = 2 * i + 1
+        heap[i] = entry
+        position[entry[1]] = i
+
+    def push(self, key, task):
+        """
+        Inserts a task into the priority queue.
+
+        Parameters:
+        key: The priority of the task.
+        task: The task to be queued, it must be hashable and not queued yet.
+        """
+        self._append(key, task)
+        self._sift_up(len(self.heap) - 1)
+
+    def peek(self):
+        """
+        Returns the entry with the highest priority without removing it.
+
+        Returns:
+        tuple: The (key, task) pair with the highest priority.
+        """
+        if not self.heap:
+            raise ValueError('Heap underflow: There are no keys in the priority queue ')
+        rank, task = self.heap[0]
+        return rank[0], task
+
+    def pop(self):
+        """
+        Removes and returns the entry with the highest priority.
+
+        Returns:
+        tuple: The (key, task) pair with the highest priority.
+        """
+        if not self.heap:
+            raise ValueError('Heap underflow: There are no keys in the priority queue ')
+        rank, task = self.heap[0]
+        self._delete(0)
+        return rank[0], task
+
+    def update_key(self, task, key):
+        """
+        Changes the priority of a queued task while maintaining a max-heap.
+
+        Parameters:
+        task: The queued task.
+        key: The new priority of the task.
+        """
+        i = self.position[task]
+        entry = self.heap[i]
+        old_key, order = entry[0]
+        entry[0] = (key, order)
+        if key > old_key:
+            self._sift_up(i)
+        elif key < old_key:
+            self._sift_down(i)
+
+    def remove(self, task):
+        """
+        Removes a queued task from the priority queue.
+
+        Parameters:
+        task: The queued task.
+
+        Returns:
+        The key the task was queued with.
+        """
+        i = self.position[task]
+        key = self.heap[i][0][0]
+        self._delete(i)
+        return key
+
+    def _delete(self, i):
+        """
+        Deletes the entry at index i and restores the heap property.
+
+        Parameters:
+        i (int): Index of the entry.
+        """
+        heap = self.heap
+        del self.position[heap[i][1]]
+        last = heap.pop()
+        if i < len(heap):
+            heap[i] = last
+            self.position[last[1]] = i
+            self._sift_down(i)
+            if i > 0:
+                self._sift_up(self.position[last[1]])
@@ -0,0 +1,315 @@
+import sys
+from collections import OrderedDict
+
+
+def entry_size(key, value):
+    """
+    Estimates the memory used by a memo entry.
+
+    Tuples are measured together with their items, other objects shallowly.
+
+    Parameters
+    ----------
+    key: The memo key.
+    value: The memo value.
+
+    Returns
+    ----------
+    int: The estimated size in bytes.
+    """
+    size = sys.getsizeof(value) + sys.getsizeof(key)
+    if isinstance(key, tuple):
+        for item in key:
+            size += sys.getsizeof(item)
+    return size
+
+
+class MemoStore:
+    """
+    Base class of the bounded memo stores used by the dynamic scheduler.
+
+    A store behaves like a small dict (get, in, [] assignment, len, clear)
+    that never holds more than max_entries entries or about max_bytes bytes.
+    Subclasses decide which entry is evicted when a new one does not fit.
+
+    Attributes
+    ----------
+    max_entries (int): Maximum number of entries, None for no limit.
+    max_bytes (int): Approximate maximum size in bytes, None for no limit.
+    hits (int): Number of lookups that found their key.
+    misses (int): Number of lookups that did not find their key.
+    evictions (int): Number of entries evicted to make room.
+    size_bytes (int): Estimated size of the stored entries, tracked only
+        when max_bytes is set.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        """
+        Initializes an empty store.
+
+        Parameters
+        ----------
+        max_entries (int): Maximum number of entries, None for no limit.
+        max_bytes (int): Approximate maximum size in bytes, None for no limit.
+        """
+        if max_entries is not None and max_entries < 1:
+            raise ValueError('max_entries must be at least 1')
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.size_bytes = 0
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __setitem__(self, key, value):
+        self.put(key, value)
+
+    def _full(self, extra_bytes):
+        """
+        Checks whether a new entry of extra_bytes bytes would exceed a limit.
+
+        Parameters
+        ----------
+        extra_bytes (int): Size of the entry to be added.
+
+        Returns
+        ----------
+        bool: True if an entry has to be evicted first, False otherwise.
+        """
+        if len(self) == 0:
+            return False
+        if self.max_entries is not None and len(self) >= self.max_entries:
+            return True
+        return self.max_bytes is not None and self.size_bytes + extra_bytes > self.max_bytes
+
+    def stats(self):
+        """
+        Returns the counters of the store.
+
+        Returns
+        ----------
+        dict: Hits, misses, evictions, current entries and estimated bytes.
+        """
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'entries': len(self),
+            'bytes': self.size_bytes,
+        }
+
+
+class LRUMemoStore(MemoStore):
+    """
+    Memo store evicting the least recently used entry.
+
+    Attributes
+    ----------
+    entries (OrderedDict): The entries, from least to most recently used.
+    """
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        super().__init__(max_entries, max_bytes)
+        self.entries = OrderedDict()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def items(self):
+        """
+        Returns the stored entries without counting them as lookups.
+
+        Returns
+        ----------
+        iterable: (key, value) pairs.
+        """
+        return self.entries.items()
+
+    def get(self, key, default=None):
+        """
+        Looks up a key and marks it as recently used.
+
+        Parameters
+        ----------
+        key: The memo key.
+        default: Value returned if the key is not stored.
+
+        Returns
+        ----------
+        The stored value or default.
+        """
+        value = self.entries.get(key)
+        if value is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return value
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting least recently used entries if needed.
+
+        Parameters
+        ----------
+        key: The memo key.
+        value: The value to be stored, it must not be None.
+        """
+        size = entry_size(key, value) if self.max_bytes is not None else 0
+        if key in self.entries:
+            if self.max_bytes is not None:
+                self.size_bytes += size - entry_size(key, self.entries[key])
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            return
+        while self._full(size):
+            old_key, old_value = self.entries.popitem(last=False)
+            if self.max_bytes is not None:
+                self.size_bytes -= entry_size(old_key, old_value)
+            self.evictions += 1
+        self.entries[key] = value
+        self.size_bytes += size
+
+    def clear(self):
+        """
+        Removes every entry, the counters are kept.
+        """
+        self.entries.clear()
+        self.size_bytes = 0
+
+
+class ClockMemoStore(MemoStore):
+    """
+    Memo store using the clock (second chance) algorithm.
+
+    A hit only sets a reference bit, which is cheaper than reordering an LRU
+    list. When the store is full, a hand sweeps the slots, clearing set bits
+    and evicting the first entry whose bit is already clear.
+
+    Attributes
+    ----------
+    slots (dict): Maps a key to its slot index.
+    keys (list): Key stored in every slot, EMPTY for a free slot.
+    values (list): Value stored in every slot.
+    referenced (list): Reference bit of every slot.
+    free (list): Indices of the free slots.
+    hand (int): Slot index the clock hand points to.
+    """
+
+    EMPTY = object()
+
+    def __init__(self, max_entries=None, max_bytes=None):
+        super().__init__(max_entries, max_bytes)
+        self.slots = {}
+        self.keys = []
+        self.values = []
+        self.referenced = []
+        self.free = []
+        self.hand = 0
+
+    def __len__(self):
+        return len(self.slots)
+
+    def items(self):
+        """
+        Returns the stored entries without counting them as lookups.
+
+        Returns
+        ----------
+        iterable: (key, value) pairs.
+        """
+        return ((key, self.values[slot]) for key, slot in self.slots.items())
+
+    def get(self, key, default=None):
+        """
+        Looks up a key and sets its reference bit.
+
+        Parameters
+        ----------
+        key: The memo key.
+        default: Value returned if the key is not stored.
+
+        Returns
+        ----------
+        The stored value or default.
+        """
+        slot = self.slots.get(key)
+        if slot is None:
+            self.misses += 1
+            return default
+        self.hits += 1
+        self.referenced[slot] = True
+        return self.values[slot]
+
+    def put(self, key, value):
+        """
+        Stores a value, evicting entries with the clock algorithm if needed.
+
+        Parameters
+        ----------
+        key: The memo key.
+        value: The value to be stored, it must not be None.
+        """
+        size = entry_size(key, value) if self.max_bytes is not None else 0
+        slot = self.slots.get(key)
+        if slot is not None:
+            if self.max_bytes is not None:
+                self.size_bytes += size - entry_size(key, self.values[slot])
+            self.values[slot] = value
+            self.referenced[slot] = True
+            return
+
+        while self._full(size):
+            self.free.append(self._evict())
+        if self.free:
+            slot = self.free.pop()
+            self.keys[slot] = key
+            self.values[slot] = value
+            self.referenced[slot] = False
+        else:
+            slot = len(self.keys)
+            self.keys.append(key)
+            self.values.append(value)
+            self.referenced.append(False)
+        self.slots[key] = slot
+        self.size_bytes += size
+
+    def _evict(self):
+        """
+        Advances the clock hand until an unreferenced entry is found and evicts it.
+
+        Returns
+        ----------
+        int: The slot index that was freed.
+        """
+        while True:
+            slot = self.hand
+            self.hand = (self.hand + 1) % len(self.keys)
+            key = self.keys[slot]
+            if key is self.EMPTY:
+                continue
+            if self.referenced[slot]:
+                self.referenced[slot] = False
+                continue
+            del self.slots[key]
+            if self.max_bytes is not None:
+                self.size_bytes -= entry_size(key, self.values[slot])
+            self.keys[slot] = self.EMPTY
+            self.values[slot] = None
+            self.evictions += 1
+            return slot
+
+    def clear(self):
+        """
+        Removes every entry, the counters are kept.
+        """
+        self.slots.clear()
+        self.keys.clear()
+        self.values.clear()
+        self.referenced.clear()
+        self.free.clear()
+        self.hand = 0
+        self.size_bytes = 0
@@ -0,0 +1,101 @@
+class PriorityTable:
+    """
+    Class used to store the priority (utility) of every task, indexed by id.
+
+    The priority of a task is 10 points for every task depending on it plus
+    its user preference. The whole table is built in a single O(V + E) pass
+    and is then kept up to date incrementally when tasks or dependencies are
+    added or removed.
+
+    Attributes
+    ----------
+    dependent_points (dict): Maps a task id to 10 times its number of dependents.
+    preferences (dict): Maps a task id to its user preference.
+    """
+
+    DEPENDENT_POINTS = 10
+
+    def __init__(self, tasks):
+        """
+        Computes the priority of every task in one pass.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects.
+        """
+        self.dependent_points = {}
+        self.preferences = {}
+        for task in tasks:
+            self.add_task(task)
+
+    def add_task(self, task):
+        """
+        Adds a task and credits each of its dependencies with a dependent.
+
+        Parameters
+        ----------
+        task (Task): The task to be added.
+        """
+        self.preferences[task.id] = task.preference
+        self.dependent_points.setdefault(task.id, 0)
+        for dep_id in set(task.dependencies):
+            self.add_dependency(dep_id)
+
+    def remove_task(self, task):
+        """
+        Removes a task, its own entries and the dependent credit it gave to
+        its dependencies.
+
+        Parameters
+        ----------
+        task (Task): The task to be removed.
+        """
+        for dep_id in set(task.dependencies):
+            self.remove_dependency(dep_id)
+        self.preferences.pop(task.id, None)
+        self.dependent_points.pop(task.id, None)
+
+    def add_dependency(self, dep_id):
+        """
+        Records one more task depending on the task with the given id.
+
+        Parameters
+        ----------
+        dep_id (int): The ID of the task being depended on.
+        """
+        self.dependent_points[dep_id] = self.dependent_points.get(dep_id, 0) + self.DEPENDENT_POINTS
+
+    def remove_dependency(self, dep_id):
+        """
+        Records one task less depending on the task with the given id.
+
+        Parameters
+        ----------
+        dep_id (int): The ID of the task that was depended on.
+        """
+        self.dependent_points[dep_id] = self.dependent_points.get(dep_id, 0) - self.DEPENDENT_POINTS
+
+    def set_preference(self, task_id, preference):
+        """
+        Changes the user preference of a task.
+
+        Parameters
+        ----------
+        task_id (int): The identifier for the task.
+        preference (int): The new preference value.
+        """
+        self.preferences[task_id] = preference
+
+    def get(self, task_id):
+        """
+        Returns the priority of a task.
+
+        Parameters
+        ----------
+        task_id (int): The identifier for the task.
+
+        Returns
+        ----------
+        int: The priority of the task, 0 for an unknown task.
+        """
+        return self.dependent_points.get(task_id, 0) + self.preferences.get(task_id, 0)
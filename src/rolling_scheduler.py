@@ -0,0 +1,273 @@
+from dependency_graph import DependencyGraph
+from event_sink import NullEventSink
+from horizon import Horizon, as_horizon
+from impact_scoring import make_priority_table
+from max_priority_queue import IndexedMaxHeapq
+from task_graph import compile_tasks
+from task_initializer import Task
+
+
+def window_copy(task, chosen):
+    """
+    Copies a task for the scheduler of a window.
+
+    Parameters
+    ----------
+    task (Task): The task.
+    chosen (dict): The tasks given to the window, by id.
+
+    Returns
+    ----------
+    Task: A copy whose dependencies outside the window, all completed, are dropped.
+    """
+    copy = Task(task.id, task.description, 'NA', task.duration,
+                [dep_id for dep_id in task.dependencies if dep_id in chosen],
+                task.preference, task.status, task.multitaskable)
+    copy.start_time = task.start_time
+    copy.has_time_constraint = task.has_time_constraint
+    return copy
+
+
+class RollingWindowScheduler:
+    """
+    Class used to schedule a long horizon, e.g. several weeks, one window at
+    a time.
+
+    Every window, e.g. a day, is run by a greedy or dynamic scheduler given only
+    the tasks that can matter in it: the ready tasks with the highest priority,
+    the tasks they release inside the window, and the time-constrained tasks
+    due before the window ends. Tasks that are not completed are carried
+    forward to the next window, and a task overrunning the end of a window
+    delays the start of the next one.
+
+    The selection stops after max_tasks tasks without time constraint, or once
+    their durations add up to overbook windows, so the memory and the solve
+    time of a window are bounded whatever the length of the horizon.
+    Priorities are computed once over the whole task list.
+
+    Attributes
+    ----------
+    compiled (CompiledTaskGraph): Validated graph structure of the tasks.
+    graph (DependencyGraph): Readiness of the tasks across the windows.
+    priority_table (PriorityTable): Priority of every task, shared by the windows.
+    scheduler (str): Scheduler of the windows, 'greedy' or 'dynamic'.
+    window (int): Length of a window in minutes.
+    max_tasks (int): Maximum number of tasks without time constraint per window.
+    overbook (float): Stop selecting tasks once their durations add up to
+        this many times the window length (per lane).
+    options (dict): Keyword arguments of the window schedulers, e.g. lanes,
+        engine or stats.
+    sink (NullEventSink): Receives the scheduling events of every window.
+    ready (IndexedMaxHeapq): Ready tasks without time constraint by priority.
+    due (IndexedMaxHeapq): Ready time-constrained tasks by start time.
+    current_time (int): Time in minutes at which the next window can start.
+    windows (list): One dict per window run, with its start, end, number of
+        tasks given and number of tasks completed.
+    """
+
+    SCHEDULERS = ('greedy', 'dynamic')
+    DEFAULT_MAX_TASKS = {'greedy': 4096, 'dynamic': 64}
+
+    def __init__(self, tasks, scheduler='greedy', window=24*60, max_tasks=None, overbook=2, sink=None,
+                 scoring='legacy', **options):
+        """
+        Validates the tasks and queues the ready ones.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects, tasks with status 'C' are not run again.
+        scheduler (str): Scheduler of the windows, 'greedy' (default) or 'dynamic'.
+        window (int): Length of a window in minutes, a day by default.
+        max_tasks (int): Maximum number of tasks without time constraint per
+            window, DEFAULT_MAX_TASKS of the scheduler if None; the search of
+            the dynamic scheduler grows exponentially with it.
+        overbook (float): Selected durations per window length, above 1 so the
+            window schedulers can choose among the tasks.
+        sink (NullEventSink): Event sink, nothing is logged by default.
+        scoring (str): How priorities are computed, see impact_scoring.
+        options: Keyword arguments of the window schedulers, e.g. lanes=2 for
+            the greedy one or engine='parallel' for the dynamic one.
+        """
+        if scheduler not in self.SCHEDULERS:
+            raise ValueError(f"Unknown scheduler '{scheduler}', expected one of {self.SCHEDULERS}")
+        if window < 1:
+            raise ValueError('window must be at least 1 minute')
+        self.compiled = compile_tasks(tasks)
+        self.graph = DependencyGraph.from_compiled(self.compiled)
+        self.priority_table = make_priority_table(self.compiled, scoring)
+        self.scheduler = scheduler
+        self.window = window
+        self.max_tasks = max_tasks if max_tasks is not None else self.DEFAULT_MAX_TASKS[scheduler]
+        self.overbook = overbook
+        self.options = options
+        self.sink = sink if sink is not None else NullEventSink()
+        self.ready = IndexedMaxHeapq()
+        self.due = IndexedMaxHeapq()
+        self.current_time = 0
+        self.windows = []
+
+        for task in self.compiled.tasks:
+            if task.status == 'C':
+                self.graph.resolve(task.id)
+        self.queue_ready()
+
+    def queue(self, task):
+        """
+        Pushes a ready task in its queue.
+
+        Parameters
+        ----------
+        task (Task): The ready task.
+        """
+        if task.has_time_constraint:
+            self.due.push(-task.start_time, task)
+        else:
+            self.ready.push(self.priority_table.get(task.id), task)
+
+    def queue_ready(self):
+        """
+        Queues the tasks that became ready since the previous call.
+        """
+        for task in self.graph.pop_ready():
+            if task.status != 'C':
+                self.queue(task)
+
+    def window_tasks(self, end, length):
+        """
+        Selects the tasks given to the scheduler of a window.
+
+        Ready tasks are taken by priority, and every task taken may release
+        tasks whose other dependencies are completed or taken too, which then
+        compete with the ready ones. The time-constrained tasks starting before
+        end are taken as soon as they are released.
+
+        Parameters
+        ----------
+        end (int): Minute at which the window ends.
+        length (int): Length of the window in minutes.
+
+        Returns
+        ----------
+        tuple: The tasks by id, in an order where dependencies come first, and
+            the tasks taken out of ready and due.
+        """
+        chosen = {}
+        taken = []
+        released = IndexedMaxHeapq()
+        pending = {}
+        budget = self.overbook * length * self.options.get('lanes', 1)
+        count = 0
+
+        def take(task):
+            stack = [task]
+            while stack:
+                task = stack.pop()
+                chosen[task.id] = task
+                for dependent_id in self.graph.dependents.get(task.id, ()):
+                    unmet = pending.get(dependent_id, self.graph.unmet[dependent_id]) - 1
+                    pending[dependent_id] = unmet
+                    if unmet > 0:
+                        continue
+                    dependent = self.graph.tasks_by_id[dependent_id]
+                    if not dependent.has_time_constraint:
+                        released.push(self.priority_table.get(dependent_id), dependent)
+                    elif dependent.start_time < end:
+                        stack.append(dependent)
+
+        while self.due and -self.due.peek()[0] < end:
+            task = self.due.pop()[1]
+            taken.append(task)
+            take(task)
+
+        while count < self.max_tasks and budget > 0 and (self.ready or released):
+            if released and (not self.ready or released.peek()[0] > self.ready.peek()[0]):
+                task = released.pop()[1]
+            else:
+                task = self.ready.pop()[1]
+                taken.append(task)
+            count += 1
+            budget -= task.duration
+            take(task)
+        return chosen, taken
+
+    def make_scheduler(self, tasks):
+        """
+        Builds the scheduler of a window, importing it only when needed.
+
+        Parameters
+        ----------
+        tasks (list): The window copies of the tasks.
+
+        Returns
+        ----------
+        TaskSchedulerGreedy or TaskSchedulerDynamic: The scheduler.
+        """
+        if self.scheduler == 'greedy':
+            from greedy_task_scheduler import TaskSchedulerGreedy
+            return TaskSchedulerGreedy(tasks, sink=self.sink, priority_table=self.priority_table, **self.options)
+        from dynamic_task_scheduler import TaskSchedulerDynamic
+        return TaskSchedulerDynamic(tasks, sink=self.sink, priority_table=self.priority_table, **self.options)
+
+    def run_window(self, window):
+        """
+        Schedules one window and carries the unfinished tasks forward.
+
+        Parameters
+        ----------
+        window (Horizon): The window, starting no earlier than current_time.
+
+        Returns
+        ----------
+        int: Number of tasks completed in the window.
+        """
+        chosen, taken = self.window_tasks(window.end, window.end - window.start)
+        copies = [window_copy(task, chosen) for task in chosen.values()]
+        scheduler = self.make_scheduler(copies)
+        scheduler.run_scheduler(window)
+
+        completed = 0
+        for task, copy in zip(chosen.values(), copies):
+            if copy.status == 'C':
+                task.status = 'C'
+                self.graph.resolve(task.id)
+                completed += 1
+        for task in taken:
+            if task.status != 'C':
+                self.queue(task)
+        self.queue_ready()
+        self.current_time = max(self.current_time, scheduler.current_time)
+        self.windows.append({'start': window.start, 'end': window.end, 'tasks': len(chosen),
+                             'completed': completed})
+        return completed
+
+    def run(self, starting_time):
+        """
+        Schedules the tasks window by window.
+
+        The run stops at the end of the horizon, when no task is left, or when
+        a whole window completed nothing and no time-constrained task is due.
+
+        Parameters
+        ----------
+        starting_time (int or Horizon): The starting time in hours, for an
+            unbounded horizon, or a Horizon, e.g. Horizon.between(start, end)
+            with timestamps weeks apart.
+
+        Returns
+        ----------
+        list: The tasks that were not scheduled.
+        """
+        horizon = as_horizon(starting_time, None)
+        self.current_time = horizon.start
+        for window in horizon.windows(self.window):
+            if not self.ready and not self.due:
+                break
+            if not self.ready and -self.due.peek()[0] >= window.end:
+                continue  # nothing to do before the next time-constrained task
+            start = max(window.start, self.current_time)
+            if start >= window.end:
+                continue  # a task of the previous window runs past this one
+            completed = self.run_window(Horizon(start, window.end, window.origin))
+            if not completed and start == window.start and not self.due:
+                break  # the next windows would be the same
+        return [task for task in self.compiled.tasks if task.status != 'C']
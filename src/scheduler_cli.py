@@ -0,0 +1,179 @@
+"""
+Command-line entry point, run from the src directory:
+
+    python -m scheduler_cli tasks.jsonl --engine dynamic --start 8 --format json -o schedule.json
+
+The schedulers and their dependencies are only imported once the engine is
+known, so that short-lived invocations do not pay for the modules they never use.
+"""
+import argparse
+import sys
+
+
+ENGINES = ('greedy', 'dynamic', 'streaming')
+FORMATS = ('text', 'json', 'csv')
+SCORINGS = ('legacy', 'descendants', 'critical_path', 'downstream_preference')
+
+
+def parse_args(argv=None):
+    """
+    Parses the command-line arguments.
+
+    Parameters
+    ----------
+    argv (list): Command-line arguments, sys.argv[1:] if None.
+
+    Returns
+    ----------
+    argparse.Namespace: The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(prog='python -m scheduler_cli',
+                                     description="Schedule the tasks of a JSONL or CSV file.")
+    parser.add_argument('tasks', help="task file, see task_loader for the fields")
+    parser.add_argument('--input-format', choices=('jsonl', 'csv', 'binary'),
+                        help="format of the task file, guessed from its extension by default (.tskg for "
+                             "binary)")
+    parser.add_argument('--engine', choices=ENGINES, default='greedy', help="scheduler (default greedy)")
+    parser.add_argument('--solver', default='bitmask',
+                        help="window solver of the dynamic engine: bitmask, parallel, knapsack or memory "
+                             "(default bitmask)")
+    parser.add_argument('--workers', type=int, help="worker processes of the parallel solver")
+    parser.add_argument('--window-budget', type=float,
+                        help="milliseconds per window search of the bitmask solver, the best choice found "
+                             "by then is used (default no limit)")
+    parser.add_argument('--scoring', choices=SCORINGS, default='legacy',
+                        help="task priorities of the greedy and dynamic engines: legacy (10 points per direct "
+                             "dependent), descendants, critical_path or downstream_preference (default legacy)")
+    parser.add_argument('--lanes', type=int, default=1, help="parallel lanes of the greedy engine (default 1)")
+    parser.add_argument('--lookahead', type=int, default=1024,
+                        help="tasks read ahead by the streaming engine (default 1024)")
+    parser.add_argument('--monotonic-ids', action='store_true',
+                        help="the task ids of the file increase, so the streaming engine does not keep the ids "
+                             "of the completed tasks")
+    parser.add_argument('--start', type=int, default=8, help="starting time in hours (default 8)")
+    parser.add_argument('--end', type=int,
+                        help="end of the horizon in hours after midnight of the first day, e.g. 188 for "
+                             "20:00 a week later (default 13 for greedy, 20 for dynamic, none for streaming "
+                             "or with --window)")
+    parser.add_argument('--window', type=int,
+                        help="schedule the greedy or dynamic engine one window of this many minutes at a "
+                             "time, carrying unfinished tasks forward")
+    parser.add_argument('--format', choices=FORMATS, default='text', help="output format (default text)")
+    parser.add_argument('-o', '--output', help="output file, standard output by default")
+    return parser.parse_args(argv)
+
+
+def schedule(args, sink):
+    """
+    Loads the tasks and runs the chosen engine.
+
+    Parameters
+    ----------
+    args (argparse.Namespace): The parsed arguments.
+    sink (NullEventSink): Receives the scheduling events.
+
+    Returns
+    ----------
+    list: The tasks that were not scheduled.
+    """
+    from task_loader import iter_tasks, load_tasks
+
+    starting_time = args.start
+    if args.end is not None or args.window is not None:
+        from horizon import Horizon
+        starting_time = Horizon.from_hours(args.start, args.end)
+
+    if args.engine == 'streaming':
+        from streaming_scheduler import StreamingScheduler
+        scheduler = StreamingScheduler(iter_tasks(args.tasks, args.input_format), args.lookahead, sink,
+                                       monotonic_ids=args.monotonic_ids)
+        for _ in scheduler.run(starting_time):
+            pass
+        return scheduler.blocked_tasks()
+
+    tasks = load_tasks(args.tasks, args.input_format)
+    if args.engine == 'greedy':
+        options = {'lanes': args.lanes, 'scoring': args.scoring}
+    else:
+        options = {'engine': args.solver, 'workers': args.workers, 'window_budget_ms': args.window_budget,
+                   'scoring': args.scoring}
+
+    if args.window is not None:
+        from rolling_scheduler import RollingWindowScheduler
+        return RollingWindowScheduler(tasks, scheduler=args.engine, window=args.window, sink=sink,
+                                      **options).run(starting_time)
+    if args.engine == 'greedy':
+        from greedy_task_scheduler import TaskSchedulerGreedy
+        TaskSchedulerGreedy(tasks, sink=sink, **options).run_scheduler(starting_time)
+    else:
+        from dynamic_task_scheduler import TaskSchedulerDynamic
+        TaskSchedulerDynamic(tasks, sink=sink, **options).run_scheduler(starting_time)
+    return [task for task in tasks if task.status != 'C']
+
+
+def write_schedule(entries, file_format, stream):
+    """
+    Writes the executed tasks.
+
+    Parameters
+    ----------
+    entries (list): (task, start, end, priority) tuples.
+    file_format (str): 'json' or 'csv'.
+    stream (file): Where the schedule is written.
+    """
+    rows = [{'id': task.id, 'description': task.description, 'start': start, 'end': end, 'priority': priority}
+            for task, start, end, priority in entries]
+    if file_format == 'json':
+        import json
+        json.dump(rows, stream, indent=2)
+        stream.write('\n')
+    else:
+        import csv
+        writer = csv.DictWriter(stream, fieldnames=['id', 'description', 'start', 'end', 'priority'])
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def main(argv=None):
+    """
+    Runs the command line.
+
+    Parameters
+    ----------
+    argv (list): Command-line arguments, sys.argv[1:] if None.
+
+    Returns
+    ----------
+    int: 0 if every task was scheduled, 1 if some were not, 2 on an invalid task file.
+    """
+    args = parse_args(argv)
+    stream = open(args.output, 'w', newline='', encoding='utf-8') if args.output else sys.stdout
+    try:
+        if args.format == 'text':
+            from event_sink import ConsoleEventSink
+            sink = ConsoleEventSink(stream)
+        else:
+            from event_sink import ScheduleEventSink
+            sink = ScheduleEventSink()
+
+        try:
+            unscheduled = schedule(args, sink)
+        except (OSError, ValueError) as error:
+            print(f"error: {error}", file=sys.stderr)
+            return 2
+
+        if args.format != 'text':
+            write_schedule(sink.entries, args.format, stream)
+    finally:
+        if stream is not sys.stdout:
+            stream.close()
+
+    if unscheduled:
+        print(f"{len(unscheduled)} task(s) not scheduled: {', '.join(str(task.id) for task in unscheduled)}",
+              file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
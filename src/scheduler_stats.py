@@ -0,0 +1,202 @@
+import time
+
+from max_priority_queue import MaxHeapq
+
+
+class NullSchedulerStats:
+    """
+    Statistics collector that records nothing, used by default so that a
+    scheduling run pays almost nothing for instrumentation.
+    """
+
+    enabled = False
+
+    def count(self, name, n=1):
+        """
+        Adds n to a counter.
+
+        Parameters
+        ----------
+        name (str): Name of the counter.
+        n (int): Amount to add.
+        """
+
+    def start_timer(self):
+        """
+        Returns a timestamp for stop_timer.
+
+        Returns
+        ----------
+        float: The current time, 0 when nothing is recorded.
+        """
+        return 0
+
+    def stop_timer(self, name, started):
+        """
+        Adds the time elapsed since start_timer to a timer.
+
+        Parameters
+        ----------
+        name (str): Name of the timer.
+        started (float): Value returned by start_timer.
+
+        Returns
+        ----------
+        float: The elapsed time in seconds, 0 when nothing is recorded.
+        """
+        return 0
+
+    def window(self, **fields):
+        """
+        Records the details of a solved time window.
+
+        Parameters
+        ----------
+        fields: Values describing the window, e.g. limit, seconds or nodes.
+        """
+
+    def start_run(self):
+        """
+        Marks the start of a scheduling run.
+        """
+
+    def finish_run(self):
+        """
+        Marks the end of a scheduling run.
+        """
+
+
+class SchedulerStats(NullSchedulerStats):
+    """
+    Statistics collector recording counters, timers and window details of the
+    scheduling runs, and optionally a cProfile profile of them.
+
+    Attributes
+    ----------
+    counters (dict): Maps a counter name, e.g. 'heap_pushes', to its value.
+    timers (dict): Maps a timer name, e.g. 'window_solve', to its count, total
+        and maximum in seconds.
+    windows (list): One dict per solved time window.
+    profile (bool): Whether runs are profiled with cProfile.
+    profiler (cProfile.Profile): The profiler, None if profile is False.
+    """
+
+    enabled = True
+
+    def __init__(self, profile=False):
+        """
+        Initializes an empty collector.
+
+        Parameters
+        ----------
+        profile (bool): Profile the scheduling runs with cProfile.
+        """
+        self.counters = {}
+        self.timers = {}
+        self.windows = []
+        self.profile = profile
+        self.profiler = None
+        self._run_started = None
+
+    def count(self, name, n=1):
+        self.counters[name] = self.counters.get(name, 0) + n
+
+    def start_timer(self):
+        return time.perf_counter()
+
+    def stop_timer(self, name, started):
+        elapsed = time.perf_counter() - started
+        timer = self.timers.setdefault(name, {'count': 0, 'total': 0.0, 'max': 0.0})
+        timer['count'] += 1
+        timer['total'] += elapsed
+        timer['max'] = max(timer['max'], elapsed)
+        return elapsed
+
+    def window(self, **fields):
+        self.windows.append(fields)
+
+    def start_run(self):
+        if self.profile:
+            import cProfile
+            if self.profiler is None:
+                self.profiler = cProfile.Profile()
+            self.profiler.enable()
+        self._run_started = self.start_timer()
+
+    def finish_run(self):
+        self.stop_timer('run', self._run_started)
+        if self.profiler is not None:
+            self.profiler.disable()
+
+    def profile_report(self, limit=20, sort='cumulative'):
+        """
+        Formats the profile of the recorded runs.
+
+        Parameters
+        ----------
+        limit (int): Number of functions listed.
+        sort (str): pstats sort key.
+
+        Returns
+        ----------
+        str: The pstats listing, None if the runs were not profiled.
+        """
+        if self.profiler is None:
+            return None
+        import io
+        import pstats
+        stream = io.StringIO()
+        pstats.Stats(self.profiler, stream=stream).sort_stats(sort).print_stats(limit)
+        return stream.getvalue()
+
+    def as_dict(self):
+        """
+        Exports the statistics, e.g. for a metrics pipeline.
+
+        Returns
+        ----------
+        dict: The counters, timers and windows, and the profile listing.
+        """
+        return {
+            'counters': dict(self.counters),
+            'timers': {name: dict(timer) for name, timer in self.timers.items()},
+            'windows': list(self.windows),
+            'profile': self.profile_report(),
+        }
+
+    def to_json(self, **kwargs):
+        """
+        Exports the statistics as JSON.
+
+        Parameters
+        ----------
+        kwargs: Passed to json.dumps, e.g. indent.
+
+        Returns
+        ----------
+        str: The JSON document of as_dict.
+        """
+        import json
+        return json.dumps(self.as_dict(), **kwargs)
+
+
+class CountingMaxHeapq(MaxHeapq):
+    """
+    MaxHeapq counting its pushes and pops, used by the schedulers instead of
+    MaxHeapq when statistics are recorded.
+
+    Attributes
+    ----------
+    stats (SchedulerStats): Receives the 'heap_pushes' and 'heap_pops' counts.
+    """
+
+    def __init__(self, stats):
+        self.stats = stats
+
+    def heappush(self, A, task):
+        self.stats.count('heap_pushes')
+        MaxHeapq.heappush(self, A, task)
+
+    def heappop(self, A):
+        self.stats.count('heap_pops')
+        return MaxHeapq.heappop(self, A)
@@ -0,0 +1,248 @@
+import hashlib
+import mmap
+import os
+import struct
+
+MAGIC = b'TSCK'
+VERSION = 1
+
+# magic, version, fingerprint, limit, mask bytes, has best, best utility,
+# stack records, memo records
+HEADER = struct.Struct('<4sH16sqIBdQQ')
+# task index, remaining time, utility, followed by the mask bytes
+RECORD = struct.Struct('<Iqd')
+
+
+def window_fingerprint(solver, limit):
+    """
+    Identifies a window search, so that a checkpoint is only resumed by the
+    search it was written for.
+
+    Parameters
+    ----------
+    solver (BitmaskWindowSolver): The solver of the window.
+    limit (int): Length of the time window in minutes.
+
+    Returns
+    ----------
+    bytes: A 16-byte digest of the limit and the solver columns.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(repr((limit, solver.utilities, solver.durations, solver.dep_masks)).encode())
+    return digest.digest()
+
+
+def mask_size(solver):
+    """
+    Returns the number of bytes used to store a bitmask of the window.
+
+    Parameters
+    ----------
+    solver (BitmaskWindowSolver): The solver of the window.
+
+    Returns
+    ----------
+    int: One bit per candidate task, rounded up to whole bytes.
+    """
+    return max(1, (len(solver.utilities) + 7) // 8)
+
+
+def write_checkpoint(path, solver, limit, stack, memo, best_utility, best_mask):
+    """
+    Saves the state of a window search.
+
+    The file is a fixed-size header followed by fixed-size records, first the
+    stack of states left to expand then the memo entries, so it can be read
+    through a memory map. It is written to a temporary file first and renamed,
+    a crash while writing keeps the previous checkpoint.
+
+    Parameters
+    ----------
+    path (str): Path of the checkpoint file.
+    solver (BitmaskWindowSolver): The solver of the window.
+    limit (int): Length of the time window in minutes.
+    stack (list): (index, mask, remaining, utility) states left to expand.
+    memo (dict or MemoStore): The visited states, (index, mask, remaining) -> utility.
+    best_utility (float): Utility of the best solution found so far.
+    best_mask (int): Bitmask of the best solution, None if none beat the incumbent.
+    """
+    size = mask_size(solver)
+    entries = list(memo.items())
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, VERSION, window_fingerprint(solver, limit), limit, size,
+                               best_mask is not None, best_utility, len(stack), len(entries)))
+        file.write((best_mask or 0).to_bytes(size, 'little'))
+        for i, mask, remaining, utility in stack:
+            file.write(RECORD.pack(i, remaining, utility))
+            file.write(mask.to_bytes(size, 'little'))
+        for (i, mask, remaining), utility in entries:
+            file.write(RECORD.pack(i, remaining, utility))
+            file.write(mask.to_bytes(size, 'little'))
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def read_header(path):
+    """
+    Reads the header of a checkpoint file.
+
+    Parameters
+    ----------
+    path (str): Path of the checkpoint file.
+
+    Returns
+    ----------
+    tuple: The header fields, None if there is no valid checkpoint at path.
+    """
+    try:
+        with open(path, 'rb') as file:
+            header = file.read(HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) < HEADER.size:
+        return None
+    fields = HEADER.unpack(header)
+    if fields[0] != MAGIC or fields[1] != VERSION:
+        return None
+    return fields
+
+
+def checkpoint_matches(path, solver, limit):
+    """
+    Checks whether the checkpoint at path was written by this window search.
+
+    Parameters
+    ----------
+    path (str): Path of the checkpoint file.
+    solver (BitmaskWindowSolver): The solver of the window.
+    limit (int): Length of the time window in minutes.
+
+    Returns
+    ----------
+    bool: True if the checkpoint can be resumed by this search.
+    """
+    header = read_header(path)
+    return header is not None and header[2] == window_fingerprint(solver, limit)
+
+
+def read_checkpoint(path, solver, limit, memo):
+    """
+    Loads the state of a window search saved by write_checkpoint.
+
+    Parameters
+    ----------
+    path (str): Path of the checkpoint file.
+    solver (BitmaskWindowSolver): The solver of the window.
+    limit (int): Length of the time window in minutes.
+    memo (dict or MemoStore): Receives the saved memo entries.
+
+    Returns
+    ----------
+    tuple: The stack, best utility and best bitmask (None if none was found),
+        or None if the checkpoint belongs to another search.
+    """
+    if not checkpoint_matches(path, solver, limit):
+        return None
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        _, _, _, _, size, has_best, best_utility, stack_count, memo_count = HEADER.unpack_from(data, 0)
+        offset = HEADER.size
+        best_mask = int.from_bytes(data[offset:offset + size], 'little') if has_best else None
+        offset += size
+
+        stack = []
+        for _ in range(stack_count):
+            i, remaining, utility = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            stack.append((i, int.from_bytes(data[offset:offset + size], 'little'), remaining, utility))
+            offset += size
+        for _ in range(memo_count):
+            i, remaining, utility = RECORD.unpack_from(data, offset)
+            offset += RECORD.size
+            memo[(i, int.from_bytes(data[offset:offset + size], 'little'), remaining)] = utility
+            offset += size
+    return stack, best_utility, best_mask
+
+
+WINDOWS_MAGIC = b'TSCW'
+# magic, version
+WINDOWS_HEADER = struct.Struct('<4sH')
+# fingerprint, utility, bound, timed out, number of chosen tasks, followed by their ids
+WINDOW = struct.Struct('<16sddBI')
+TASK_ID = struct.Struct('<q')
+
+
+def windows_path(path):
+    """
+    Returns the path of the log of the windows solved by a run.
+
+    Parameters
+    ----------
+    path (str): Path of the checkpoint file of the window searches.
+
+    Returns
+    ----------
+    str: The path of the log, next to the checkpoint file.
+    """
+    return path + '.windows'
+
+
+def append_window(path, fingerprint, utility, bound, timed_out, task_ids):
+    """
+    Records the result of a solved window at the end of the log of the run.
+
+    Every record is written and synced on its own, so a run killed at any
+    point keeps the windows solved before it.
+
+    Parameters
+    ----------
+    path (str): Path of the log file.
+    fingerprint (bytes): The window_fingerprint of the window.
+    utility (float): Utility of the chosen tasks.
+    bound (float): Upper bound of the optimal utility.
+    timed_out (bool): Whether the search stopped at its deadline.
+    task_ids (list): Ids of the chosen tasks, in execution order.
+    """
+    with open(path, 'ab') as file:
+        if file.tell() == 0:
+            file.write(WINDOWS_HEADER.pack(WINDOWS_MAGIC, VERSION))
+        file.write(WINDOW.pack(fingerprint, utility, bound, timed_out, len(task_ids)))
+        for task_id in task_ids:
+            file.write(TASK_ID.pack(task_id))
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def read_windows(path):
+    """
+    Loads the windows recorded by append_window.
+
+    Parameters
+    ----------
+    path (str): Path of the log file.
+
+    Returns
+    ----------
+    dict: Maps a window fingerprint to its utility, bound, timed_out and chosen
+        task ids, empty if there is no valid log at path. A record cut short
+        by a crash is ignored.
+    """
+    try:
+        with open(path, 'rb') as file:
+            data = file.read()
+    except FileNotFoundError:
+        return {}
+    if len(data) < WINDOWS_HEADER.size or WINDOWS_HEADER.unpack_from(data, 0) != (WINDOWS_MAGIC, VERSION):
+        return {}
+    windows = {}
+    offset = WINDOWS_HEADER.size
+    while offset + WINDOW.size <= len(data):
+        fingerprint, utility, bound, timed_out, count = WINDOW.unpack_from(data, offset)
+        end = offset + WINDOW.size + count * TASK_ID.size
+        if end > len(data):
+            break
+        task_ids = [TASK_ID.unpack_from(data, offset + WINDOW.size + k * TASK_ID.size)[0] for k in range(count)]
+        windows[fingerprint] = (utility, bound, bool(timed_out), task_ids)
+        offset = end
+    return windows
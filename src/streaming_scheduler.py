@@ -0,0 +1,243 @@
+from event_sink import NullEventSink
+from horizon import as_horizon
+from max_priority_queue import IndexedMaxHeapq
+
+
+class StreamingScheduler:
+    """
+    Class used to schedule a feed of tasks too large to hold in memory.
+
+    Tasks are read from an iterator (e.g. task_loader.iter_tasks) only while
+    fewer than lookahead tasks are waiting, and they are queued as soon as all
+    their dependencies are completed. A completed task is evicted: only its id
+    is kept, to resolve later references to it. When the ids of the feed
+    increase (monotonic_ids), not even the id is kept: a dependency on an id
+    at or below the highest id read that is no longer live was completed, so
+    resident memory follows the active frontier instead of the size of the feed.
+
+    Tasks follow the greedy scheduler's policy. Priorities count the dependents
+    read so far, and the key of a queued task is raised in O(log n) when a new
+    dependent arrives.
+
+    Attributes
+    ----------
+    tasks (iterator): The remaining feed of Task objects.
+    lookahead (int): Number of waiting tasks read ahead before each decision.
+    sink (NullEventSink): Receives the scheduling events.
+    live (dict): Tasks read and not completed yet, by id.
+    monotonic_ids (bool): Whether the ids of the feed increase, in which case
+        completed is not filled.
+    completed (set): Ids of the completed tasks, without monotonic_ids.
+    last_id (int): Highest id read so far, None before the first task.
+    unmet (dict): Number of unresolved dependencies of the waiting tasks.
+    dependents (dict): Maps an id to the ids of the waiting tasks depending on it.
+    queue_dep (IndexedMaxHeapq): Ready tasks without time constraint by priority.
+    queue_strt (IndexedMaxHeapq): Ready time-constrained tasks by start time.
+    current_time (int): Current time in minutes.
+    exhausted (bool): True once the feed has been read entirely.
+    """
+
+    def __init__(self, tasks, lookahead=1024, sink=None, monotonic_ids=False):
+        """
+        Initializes the scheduler without reading the feed yet.
+
+        Parameters
+        ----------
+        tasks (iterable): Feed of Task objects.
+        lookahead (int): Number of waiting tasks read ahead before each decision.
+        sink (NullEventSink): Event sink, nothing is logged by default.
+        monotonic_ids (bool): Declare that every task of the feed has a higher
+            id than the tasks before it, so completed ids need not be kept.
+            A dependency on an id below the highest id read that never
+            appeared is then considered completed.
+        """
+        self.tasks = iter(tasks)
+        self.monotonic_ids = monotonic_ids
+        self.last_id = None
+        self.lookahead = lookahead
+        self.sink = sink if sink is not None else NullEventSink()
+        self.live = {}
+        self.completed = set()
+        self.unmet = {}
+        self.dependents = {}
+        self.queue_dep = IndexedMaxHeapq()
+        self.queue_strt = IndexedMaxHeapq()
+        self.current_time = 0
+        self.exhausted = False
+
+    def priority(self, task):
+        """
+        Returns the priority of a task from the dependents read so far.
+
+        Parameters
+        ----------
+        task (Task): The task.
+
+        Returns
+        ----------
+        int: 10 points per known dependent plus the task's preference.
+        """
+        return 10 * len(self.dependents.get(task.id, ())) + task.preference
+
+    def is_completed(self, task_id):
+        """
+        Checks whether a task read earlier was completed.
+
+        Parameters
+        ----------
+        task_id (int): The identifier for the task.
+
+        Returns
+        ----------
+        bool: True if the task was completed, False if it is live or was not read yet.
+        """
+        if self.monotonic_ids:
+            return task_id not in self.live and self.last_id is not None and task_id <= self.last_id
+        return task_id in self.completed
+
+    def due(self, end):
+        """
+        Checks whether the next time-constrained task starts before a time.
+
+        Parameters
+        ----------
+        end (int): Time in minutes.
+
+        Returns
+        ----------
+        bool: True if a ready time-constrained task starts before end.
+        """
+        return bool(self.queue_strt) and self.queue_strt.peek()[1].start_time < end
+
+    def queue(self, task):
+        """
+        Pushes a ready task in its priority queue.
+
+        Parameters
+        ----------
+        task (Task): The ready task.
+        """
+        task.status = 'I'
+        if task.has_time_constraint:
+            self.queue_strt.push(-task.start_time, task)
+        else:
+            self.queue_dep.push(self.priority(task), task)
+
+    def admit(self, task):
+        """
+        Registers a task read from the feed.
+
+        Parameters
+        ----------
+        task (Task): The new task.
+        """
+        if self.monotonic_ids:
+            if self.last_id is not None and task.id <= self.last_id:
+                raise ValueError(f"Task {task.id} follows task {self.last_id}, the ids of the feed must increase")
+            self.last_id = task.id
+        elif task.id in self.live or task.id in self.completed:
+            raise ValueError(f"Task {task.id} appears twice in the feed")
+        if task.status == 'C':
+            if not self.monotonic_ids:
+                self.completed.add(task.id)
+            return
+
+        self.live[task.id] = task
+        unmet = 0
+        for dep_id in set(task.dependencies):
+            if self.is_completed(dep_id):
+                continue
+            unmet += 1
+            self.dependents.setdefault(dep_id, []).append(task.id)
+            dep = self.live.get(dep_id)
+            if dep is not None and dep in self.queue_dep:
+                self.queue_dep.update_key(dep, self.priority(dep))
+        self.unmet[task.id] = unmet
+        if unmet == 0:
+            self.queue(task)
+
+    def fill(self, force=False):
+        """
+        Reads the feed until lookahead tasks are waiting.
+
+        Parameters
+        ----------
+        force (bool): Read at least one task even if lookahead tasks are waiting.
+        """
+        while not self.exhausted and (force or len(self.live) < self.lookahead):
+            task = next(self.tasks, None)
+            if task is None:
+                self.exhausted = True
+                return
+            self.admit(task)
+            force = False
+
+    def complete(self, task):
+        """
+        Evicts a completed task and releases the tasks depending on it.
+
+        Parameters
+        ----------
+        task (Task): The completed task.
+        """
+        task.status = 'C'
+        del self.live[task.id]
+        del self.unmet[task.id]
+        if not self.monotonic_ids:
+            self.completed.add(task.id)
+        for dependent_id in self.dependents.pop(task.id, ()):
+            self.unmet[dependent_id] -= 1
+            if self.unmet[dependent_id] == 0:
+                self.queue(self.live[dependent_id])
+
+    def run(self, starting_time):
+        """
+        Schedules the feed, until the end of the horizon.
+
+        Parameters
+        ----------
+        starting_time (int or Horizon): The starting time in hours, for an
+            unbounded horizon, or a Horizon; no task is started at or after
+            its end, and the rest of the feed is not read.
+
+        Yields
+        ----------
+        tuple: (task, start, end) for every task, in execution order.
+        """
+        horizon = as_horizon(starting_time, None)
+        self.current_time = horizon.start
+        self.sink.scheduler_started('streaming', self.current_time)
+
+        while self.current_time < horizon.end:
+            self.fill()
+            while not self.queue_dep and not self.due(horizon.end) and not self.exhausted:
+                self.fill(force=True)
+
+            if self.due(horizon.end) and (not self.queue_dep or self.current_time + self.queue_dep.peek()[1].duration
+                                          > self.queue_strt.peek()[1].start_time):
+                priority, task = self.queue_strt.pop()
+                self.current_time = max(self.current_time, task.start_time)
+            elif self.queue_dep:
+                priority, task = self.queue_dep.pop()
+            else:
+                break  # nothing can run before the end of the horizon
+
+            start = self.current_time
+            self.sink.task_started(start, task)
+            self.current_time += task.duration
+            self.sink.task_completed(self.current_time, task, priority)
+            self.complete(task)
+            yield task, start, self.current_time
+
+        self.sink.scheduler_finished(horizon.start, self.current_time)
+
+    def blocked_tasks(self):
+        """
+        Returns the tasks that could not be scheduled, once run is finished.
+
+        Returns
+        ----------
+        list: Tasks read but not completed, waiting for a dependency that
+            never completed or left over at the end of the horizon.
+        """
+        return list(self.live.values())
@@ -0,0 +1,196 @@
+from collections import deque
+from functools import cached_property
+
+
+class CompiledTaskGraph:
+    """
+    Class holding the structure of a task list, validated and precomputed once
+    before scheduling.
+
+    Tasks are numbered by their position in the task list, and every array
+    below is indexed by that number. The whole compilation is O(V + E).
+    The longest chains, critical_tails, critical_path_length and
+    critical_path, are computed in O(V + E) when first read and then kept, so
+    only the schedulers using the 'critical_path' scoring pay for them, once
+    per compiled graph.
+
+    Attributes
+    ----------
+    tasks (list): The Task objects.
+    initial_status (list): Status of every task when compiled, restored by
+        the schedulers before every run, so schedulers sharing the graph
+        start from the same statuses.
+    index (dict): Maps a task id to its index.
+    dependencies (list): Indices of the distinct dependencies of every task.
+    dependents (list): Indices of the tasks depending on every task, in task order.
+    order (list): Task indices in topological order, ties kept in task order.
+    rank (list): Position of every task in order.
+    critical_tails (list): Minutes of the longest chain of transitive
+        dependents of every task, its own duration excluded.
+    critical_path_length (int): Minimum number of minutes needed to complete
+        every task, the longest chain of durations.
+    critical_path (list): Ids of the tasks on one longest chain, in execution order.
+    """
+
+    def __init__(self, tasks):
+        """
+        Validates the tasks and computes the graph arrays.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects.
+        """
+        self.tasks = list(tasks)
+        self.initial_status = [task.status for task in self.tasks]
+        self.index = {}
+        for i, task in enumerate(self.tasks):
+            if task.id in self.index:
+                raise ValueError(f"Task id {task.id} is used by more than one task")
+            self.index[task.id] = i
+
+        n = len(self.tasks)
+        self.dependencies = []
+        self.dependents = [[] for _ in range(n)]
+        for i, task in enumerate(self.tasks):
+            deps = []
+            for dep_id in dict.fromkeys(task.dependencies):
+                if dep_id not in self.index:
+                    raise ValueError(f"Task {task.id} depends on unknown task {dep_id}")
+                j = self.index[dep_id]
+                deps.append(j)
+                self.dependents[j].append(i)
+            self.dependencies.append(deps)
+
+        self.order = self._topological_order()
+        self.rank = [0] * n
+        for position, i in enumerate(self.order):
+            self.rank[i] = position
+
+    @cached_property
+    def critical_tails(self):
+        """
+        Computes the longest chain of durations every task unblocks, in one
+        reverse topological pass.
+
+        Returns
+        ----------
+        list: Minutes of the longest chain of transitive dependents of every
+            task, its own duration excluded, by task index.
+        """
+        tails = [0] * len(self.tasks)
+        for i in reversed(self.order):
+            for k in self.dependents[i]:
+                tails[i] = max(tails[i], self.tasks[k].duration + tails[k])
+        return tails
+
+    @cached_property
+    def critical_path_length(self):
+        """
+        Computes the minimum number of minutes needed to complete every task
+        with unlimited parallelism, ignoring start times.
+
+        Returns
+        ----------
+        int: The longest chain of durations, 0 without tasks.
+        """
+        return max((task.duration + tail for task, tail in zip(self.tasks, self.critical_tails)), default=0)
+
+    @cached_property
+    def critical_path(self):
+        """
+        Follows one longest chain from its first task.
+
+        Returns
+        ----------
+        list: Ids of the tasks on the chain, in execution order, the first
+            longest chain in task order when there are several.
+        """
+        tails = self.critical_tails
+        length = self.critical_path_length
+        path = []
+        i = next((i for i, task in enumerate(self.tasks) if task.duration + tails[i] == length), None)
+        while i is not None:
+            path.append(self.tasks[i].id)
+            i = next((k for k in self.dependents[i] if self.tasks[k].duration + tails[k] == tails[i]), None)
+        return path
+
+    def _topological_order(self):
+        """
+        Sorts the tasks with Kahn's algorithm.
+
+        Returns
+        ----------
+        list: Task indices in topological order.
+        """
+        unmet = [len(deps) for deps in self.dependencies]
+        ready = deque(i for i in range(len(self.tasks)) if unmet[i] == 0)
+        order = []
+        while ready:
+            i = ready.popleft()
+            order.append(i)
+            for k in self.dependents[i]:
+                unmet[k] -= 1
+                if unmet[k] == 0:
+                    ready.append(k)
+
+        if len(order) < len(self.tasks):
+            cycle = self._find_cycle([i for i in range(len(self.tasks)) if unmet[i] > 0])
+            raise ValueError("Dependency cycle: " + " -> ".join(str(self.tasks[i].id) for i in cycle)
+                             + " (each task depends on the next)")
+        return order
+
+    def _find_cycle(self, remaining):
+        """
+        Finds a cycle among the tasks Kahn's algorithm could not sort.
+
+        Every such task has a dependency that could not be sorted either, so
+        following those dependencies from any of them must loop.
+
+        Parameters
+        ----------
+        remaining (list): Indices of the unsorted tasks.
+
+        Returns
+        ----------
+        list: Indices of the tasks of the cycle, each depending on the next,
+            the first one repeated at the end.
+        """
+        unsorted = set(remaining)
+        path = []
+        seen = {}
+        i = remaining[0]
+        while i not in seen:
+            seen[i] = len(path)
+            path.append(i)
+            i = next(j for j in self.dependencies[i] if j in unsorted)
+        return path[seen[i]:] + [i]
+
+    def task_order(self):
+        """
+        Returns the tasks in topological order.
+
+        Returns
+        ----------
+        list: The Task objects, every task after its dependencies.
+        """
+        return [self.tasks[i] for i in self.order]
+
+
+def compile_tasks(tasks):
+    """
+    Validates a task list and precomputes its graph structure.
+
+    Parameters
+    ----------
+    tasks (list): List of Task objects.
+
+    Returns
+    ----------
+    CompiledTaskGraph: The compiled graph.
+
+    Raises
+    ----------
+    ValueError: If an id is duplicated, a dependency refers to an unknown id
+        or the dependencies contain a cycle.
+    """
+    return CompiledTaskGraph(tasks)
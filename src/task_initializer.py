@@ -6,20 +6,27 @@ class Task:
     ----------
     id (int): The identifier for the task.
     description (str): Description of the task.
-    start_time (int): Start time of the task in minutes.
+    start_time (int): Start time of the task in minutes after the origin of
+        the timeline, None for a task without time constraint.
     duration (int): Duration of the task in minutes.
     dependencies (list): List of task dependencies.
     status (str): Current status of the task.
     has_time_constraint (bool): Flag indicating whether the task has a time constraint.
+    multitaskable (bool): Flag indicating whether the task can run alongside other tasks.
     """
-   
-    def __init__(self, id, description, start_time, duration, dependencies, preference, status="N"):
+
+    __slots__ = ('id', 'description', 'duration', 'dependencies', 'status',
+                 'start_time', 'has_time_constraint', 'preference', 'multitaskable')
+
+    def __init__(self, id, description, start_time, duration, dependencies, preference, status="N",
+                 multitaskable=False):
      
         self.id = id
         self.description = description
         self.duration = duration
         self.dependencies = dependencies
         self.status = status
-        self.start_time= start_time * 60
         self.has_time_constraint = isinstance(start_time, int)
-        self.preference = preference
\ No newline at end of file
+        self.start_time = start_time * 60 if self.has_time_constraint else None
+        self.preference = preference
+        self.multitaskable = multitaskable
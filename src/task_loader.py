@@ -0,0 +1,143 @@
+import os
+
+from task_initializer import Task
+
+
+def read_records(path, file_format=None):
+    """
+    Reads task records one at a time from a JSONL or CSV file.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    file_format (str): 'jsonl' or 'csv', guessed from the extension if None.
+
+    Yields
+    ----------
+    tuple: The line number and the record as a dict.
+    """
+    if file_format is None:
+        file_format = 'csv' if os.path.splitext(path)[1].lower() == '.csv' else 'jsonl'
+
+    with open(path, newline='', encoding='utf-8') as file:
+        if file_format == 'csv':
+            import csv
+            reader = csv.DictReader(file)
+            for record in reader:
+                yield reader.line_num, record
+        elif file_format == 'jsonl':
+            import json
+            for line_number, line in enumerate(file, start=1):
+                line = line.strip()
+                if line:
+                    try:
+                        yield line_number, json.loads(line)
+                    except json.JSONDecodeError as error:
+                        raise ValueError(f"line {line_number}: invalid JSON ({error.msg})") from None
+        else:
+            raise ValueError(f"Unknown task file format '{file_format}', expected 'jsonl' or 'csv'")
+
+
+def parse_dependencies(value):
+    """
+    Parses the dependencies of a record.
+
+    Parameters
+    ----------
+    value: A list of ids, or a string of ids separated by ';', ',' or spaces.
+
+    Returns
+    ----------
+    list: The dependency ids as ints.
+    """
+    if value is None or value == '':
+        return []
+    if isinstance(value, str):
+        value = value.replace(';', ' ').replace(',', ' ').split()
+    return [int(dep_id) for dep_id in value]
+
+
+def parse_task(record, line_number=None):
+    """
+    Validates a record and builds its Task.
+
+    The start_time is in hours like for Task, an empty value, null or 'NA'
+    means the task has no time constraint.
+
+    Parameters
+    ----------
+    record (dict): Fields id, duration and optionally description, start_time,
+        dependencies, preference, status and multitaskable.
+    line_number (int): Line of the record, used in error messages.
+
+    Returns
+    ----------
+    Task: The parsed task.
+    """
+    where = f"line {line_number}: " if line_number is not None else ''
+    try:
+        task_id = int(record['id'])
+        duration = int(record['duration'])
+        start_time = record.get('start_time')
+        if start_time in (None, '', 'NA'):
+            start_time = 'NA'
+        else:
+            start_time = int(start_time)
+        dependencies = parse_dependencies(record.get('dependencies'))
+        preference = int(record.get('preference') or 0)
+    except KeyError as error:
+        raise ValueError(f"{where}missing field {error}") from None
+    except (TypeError, ValueError) as error:
+        raise ValueError(f"{where}invalid task record ({error})") from None
+
+    if duration < 0:
+        raise ValueError(f"{where}task {task_id} has a negative duration")
+    if task_id in dependencies:
+        raise ValueError(f"{where}task {task_id} depends on itself")
+    status = record.get('status') or 'N'
+    if status not in ('N', 'C'):
+        raise ValueError(f"{where}task {task_id} has an unknown status '{status}'")
+    multitaskable = record.get('multitaskable') in (True, 1, '1', 'true', 'True')
+
+    return Task(task_id, record.get('description') or '', start_time, duration, dependencies,
+                preference, status, multitaskable)
+
+
+def iter_tasks(path, file_format=None):
+    """
+    Streams the validated tasks of a JSONL, CSV or binary graph file.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    file_format (str): 'jsonl', 'csv' or 'binary', guessed from the extension
+        if None, '.tskg' for binary files written by task_store.save_table.
+
+    Yields
+    ----------
+    Task: The tasks in file order.
+    """
+    if file_format == 'binary' or (file_format is None and os.path.splitext(path)[1].lower() == '.tskg'):
+        from task_store import load_table
+        table = load_table(path)
+        for i in range(len(table)):
+            yield table.task(i)
+        return
+    for line_number, record in read_records(path, file_format):
+        yield parse_task(record, line_number)
+
+
+def load_tasks(path, file_format=None):
+    """
+    Loads every task of a JSONL, CSV or binary graph file in a list.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    file_format (str): 'jsonl', 'csv' or 'binary', guessed from the extension if None.
+
+    Returns
+    ----------
+    list: The tasks in file order.
+    """
+    return list(iter_tasks(path, file_format))
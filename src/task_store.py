@@ -0,0 +1,234 @@
+"""
+Versioned binary files for task graphs and schedules.
+
+A graph file holds the columns of a TaskTable one after the other, every
+column 8-byte aligned and little-endian, after a fixed header:
+
+    magic b'TSKG', version, task count n, dependency count e, description bytes d
+    ids, duration, start_time, preference          int64[n] each
+    dep_offsets, dependent_offsets, desc_offsets   int64[n + 1] each
+    dep_indices, dependent_indices                 int64[e] each
+    status                                         uint8[n]
+    has_time_constraint, multitaskable             bool[n] each
+    descriptions                                   UTF-8 bytes[d]
+
+A schedule file holds the table row, start and end of every executed task:
+
+    magic b'TSKS', version, entry count m
+    index, start, end                              int64[m] each
+
+Files are read through a single numpy.memmap, so opening a graph only maps
+it: pages are read on first access and shared by every process mapping the
+same file.
+"""
+import os
+import struct
+
+import numpy as np
+
+from task_table import TaskTable
+
+GRAPH_MAGIC = b'TSKG'
+SCHEDULE_MAGIC = b'TSKS'
+VERSION = 1
+
+GRAPH_HEADER = struct.Struct('<4sHxxQQQ')
+SCHEDULE_HEADER = struct.Struct('<4sHxxQ')
+ALIGNMENT = 8
+
+
+class StringColumn:
+    """
+    Class used to read the descriptions of a mapped graph file one at a time,
+    instead of decoding them all when the file is opened.
+
+    Attributes
+    ----------
+    offsets (ndarray): Start of every string in data, of length n + 1.
+    data (ndarray): The UTF-8 bytes of all the strings.
+    """
+
+    def __init__(self, offsets, data):
+        self.offsets = offsets
+        self.data = data
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i):
+        return bytes(self.data[self.offsets[i]:self.offsets[i + 1]]).decode('utf-8')
+
+
+def _graph_layout(n, e, d):
+    """
+    Lists the columns of a graph file in file order.
+
+    Parameters
+    ----------
+    n (int): Number of tasks.
+    e (int): Number of dependencies.
+    d (int): Number of description bytes.
+
+    Returns
+    ----------
+    list: (name, dtype, length) of every column.
+    """
+    return [
+        ('ids', '<i8', n), ('duration', '<i8', n), ('start_time', '<i8', n), ('preference', '<i8', n),
+        ('dep_offsets', '<i8', n + 1), ('dependent_offsets', '<i8', n + 1), ('desc_offsets', '<i8', n + 1),
+        ('dep_indices', '<i8', e), ('dependent_indices', '<i8', e),
+        ('status', 'u1', n), ('has_time_constraint', '?', n), ('multitaskable', '?', n),
+        ('descriptions', 'u1', d),
+    ]
+
+
+def _write_columns(path, header, columns):
+    """
+    Writes a header and aligned columns to a temporary file, then renames it
+    so that readers never see a partial file.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    header (bytes): The packed header.
+    columns (list): (array, dtype) pairs in file order.
+    """
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as file:
+        file.write(header)
+        position = len(header)
+        for array, dtype in columns:
+            position += file.write(b'\0' * (-position % ALIGNMENT))
+            position += file.write(np.ascontiguousarray(array, dtype=dtype).tobytes())
+    os.replace(tmp_path, path)
+
+
+def _map_columns(path, header, magic, layout_of, mode):
+    """
+    Maps a file and returns its columns as views on the mapping.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    header (struct.Struct): The header format.
+    magic (bytes): The expected magic.
+    layout_of (callable): Returns the column layout from the header counts.
+    mode (str): numpy.memmap mode, 'r' or 'c'.
+
+    Returns
+    ----------
+    dict: Maps a column name to its array.
+    """
+    raw = np.memmap(path, dtype=np.uint8, mode=mode)
+    if len(raw) < header.size:
+        raise ValueError(f"{path}: file too short")
+    fields = header.unpack(bytes(raw[:header.size]))
+    if fields[0] != magic:
+        raise ValueError(f"{path}: not a {magic.decode()} file")
+    if fields[1] != VERSION:
+        raise ValueError(f"{path}: unsupported version {fields[1]}, expected {VERSION}")
+
+    columns = {}
+    position = header.size
+    for name, dtype, length in layout_of(*fields[2:]):
+        position += -position % ALIGNMENT
+        size = np.dtype(dtype).itemsize * length
+        if position + size > len(raw):
+            raise ValueError(f"{path}: file truncated in column {name}")
+        columns[name] = raw[position:position + size].view(dtype)
+        position += size
+    return columns
+
+
+def save_table(table, path):
+    """
+    Writes a TaskTable to a graph file.
+
+    Parameters
+    ----------
+    table (TaskTable or list): The table, or a list of Task objects.
+    path (str): Path of the file, conventionally ending in '.tskg'.
+    """
+    if not isinstance(table, TaskTable):
+        table = TaskTable.from_tasks(table)
+    encoded = [description.encode('utf-8') for description in table.descriptions]
+    desc_offsets = np.zeros(len(table) + 1, dtype=np.int64)
+    np.cumsum([len(text) for text in encoded], out=desc_offsets[1:])
+    blob = np.frombuffer(b''.join(encoded), dtype=np.uint8)
+
+    values = {
+        'ids': table.ids, 'duration': table.duration, 'start_time': table.start_time,
+        'preference': table.preference, 'dep_offsets': table.dep_offsets,
+        'dependent_offsets': table.dependent_offsets, 'desc_offsets': desc_offsets,
+        'dep_indices': table.dep_indices, 'dependent_indices': table.dependent_indices,
+        'status': table.status, 'has_time_constraint': table.has_time_constraint,
+        'multitaskable': table.multitaskable, 'descriptions': blob,
+    }
+    layout = _graph_layout(len(table), len(table.dep_indices), len(blob))
+    header = GRAPH_HEADER.pack(GRAPH_MAGIC, VERSION, len(table), len(table.dep_indices), len(blob))
+    _write_columns(path, header, [(values[name], dtype) for name, dtype, _ in layout])
+
+
+def load_table(path, mode='c'):
+    """
+    Opens a graph file as a TaskTable whose columns are mapped from the file.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+    mode (str): 'c' (default) for copy-on-write columns, e.g. so that
+        store_status can update the statuses without writing to the file,
+        or 'r' for read-only ones.
+
+    Returns
+    ----------
+    TaskTable: The table, without any column read yet.
+    """
+    columns = _map_columns(path, GRAPH_HEADER, GRAPH_MAGIC, _graph_layout, mode)
+    return TaskTable(
+        ids=columns['ids'], duration=columns['duration'], start_time=columns['start_time'],
+        preference=columns['preference'], status=columns['status'],
+        has_time_constraint=columns['has_time_constraint'],
+        dep_offsets=columns['dep_offsets'], dep_indices=columns['dep_indices'],
+        descriptions=StringColumn(columns['desc_offsets'], columns['descriptions']),
+        multitaskable=columns['multitaskable'],
+        dependent_offsets=columns['dependent_offsets'], dependent_indices=columns['dependent_indices'],
+    )
+
+
+def _schedule_layout(m):
+    return [('index', '<i8', m), ('start', '<i8', m), ('end', '<i8', m)]
+
+
+def save_schedule(entries, table, path):
+    """
+    Writes a computed schedule to a schedule file.
+
+    Parameters
+    ----------
+    entries (list): (task, start, end, priority) tuples, e.g. ScheduleEventSink.entries.
+    table (TaskTable): The table of the tasks, entries are stored by row.
+    path (str): Path of the file, conventionally ending in '.tsks'.
+    """
+    row = {task_id: i for i, task_id in enumerate(table.ids.tolist())}
+    index = np.fromiter((row[entry[0].id] for entry in entries), dtype=np.int64, count=len(entries))
+    start = np.fromiter((entry[1] for entry in entries), dtype=np.int64, count=len(entries))
+    end = np.fromiter((entry[2] for entry in entries), dtype=np.int64, count=len(entries))
+    _write_columns(path, SCHEDULE_HEADER.pack(SCHEDULE_MAGIC, VERSION, len(entries)),
+                   [(index, '<i8'), (start, '<i8'), (end, '<i8')])
+
+
+def load_schedule(path):
+    """
+    Opens a schedule file.
+
+    Parameters
+    ----------
+    path (str): Path of the file.
+
+    Returns
+    ----------
+    tuple: The read-only index, start and end arrays, mapped from the file.
+    """
+    columns = _map_columns(path, SCHEDULE_HEADER, SCHEDULE_MAGIC, _schedule_layout, 'r')
+    return columns['index'], columns['start'], columns['end']
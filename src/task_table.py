@@ -0,0 +1,221 @@
+import numpy as np
+
+from task_initializer import Task
+
+
+class TaskTable:
+    """
+    Class used to store many tasks column by column in NumPy arrays.
+
+    Every task is a row. Dependencies and dependents are stored in CSR form:
+    the dependencies of row i are dep_indices[dep_offsets[i]:dep_offsets[i + 1]],
+    given as row numbers, and likewise for dependents.
+
+    The table is a compact storage and loading format. The schedulers do not
+    schedule from the columns: given a table, they build the Task objects
+    with to_tasks and only write the statuses back with store_status, so a
+    run needs as much memory as a run over a list of tasks. Task objects are
+    what the event sinks, the priority tables, the window solvers and the
+    queues of both schedulers hold, so scheduling from the rows would need a
+    second implementation of every scheduler; the table saves memory while
+    tasks are stored or loaded, e.g. by task_store, not during a run.
+
+    Attributes
+    ----------
+    ids (ndarray): Identifier of every task.
+    duration (ndarray): Duration of every task in minutes.
+    start_time (ndarray): Start time in minutes, 0 for tasks without time constraint.
+    preference (ndarray): User preference of every task.
+    status (ndarray): Status of every task as a status code (see STATUS_CODES).
+    has_time_constraint (ndarray): Flag indicating whether a task has a time constraint.
+    multitaskable (ndarray): Flag indicating whether a task can run alongside other tasks.
+    dep_offsets (ndarray): CSR offsets of the dependencies, of length len(table) + 1.
+    dep_indices (ndarray): Rows of the dependencies.
+    dependent_offsets (ndarray): CSR offsets of the dependents, of length len(table) + 1.
+    dependent_indices (ndarray): Rows of the dependents.
+    descriptions (list): Description of every task, kept as Python strings.
+    """
+
+    STATUS_CODES = {'N': 0, 'I': 1, 'C': 2}
+    STATUS_NAMES = ('N', 'I', 'C')
+
+    def __init__(self, ids, duration, start_time, preference, status, has_time_constraint,
+                 dep_offsets, dep_indices, descriptions=None, multitaskable=None,
+                 dependent_offsets=None, dependent_indices=None):
+        """
+        Builds a table from its columns and computes the dependents.
+
+        Parameters
+        ----------
+        ids, duration, start_time, preference, status, has_time_constraint (array-like):
+            One value per task.
+        dep_offsets (array-like): CSR offsets of the dependencies.
+        dep_indices (array-like): Rows of the dependencies.
+        descriptions (list): Optional description of every task.
+        multitaskable (array-like): Optional multitaskable flag of every task.
+        dependent_offsets, dependent_indices (array-like): Optional CSR of the
+            dependents, e.g. loaded from a file, computed if not given.
+        """
+        self.ids = np.asarray(ids, dtype=np.int64)
+        self.duration = np.asarray(duration, dtype=np.int64)
+        self.start_time = np.asarray(start_time, dtype=np.int64)
+        self.preference = np.asarray(preference, dtype=np.int64)
+        self.status = np.asarray(status, dtype=np.uint8)
+        self.has_time_constraint = np.asarray(has_time_constraint, dtype=np.bool_)
+        self.dep_offsets = np.asarray(dep_offsets, dtype=np.int64)
+        self.dep_indices = np.asarray(dep_indices, dtype=np.int64)
+        self.descriptions = descriptions if descriptions is not None else [''] * len(self.ids)
+        if multitaskable is None:
+            multitaskable = np.zeros(len(self.ids), dtype=np.bool_)
+        self.multitaskable = np.asarray(multitaskable, dtype=np.bool_)
+
+        if dependent_offsets is not None:
+            self.dependent_offsets = np.asarray(dependent_offsets, dtype=np.int64)
+            self.dependent_indices = np.asarray(dependent_indices, dtype=np.int64)
+            return
+        n = len(self.ids)
+        owners = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.dep_offsets))
+        order = np.argsort(self.dep_indices, kind='stable')
+        self.dependent_indices = owners[order]
+        self.dependent_offsets = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.dep_indices, minlength=n), out=self.dependent_offsets[1:])
+
+    def __len__(self):
+        return len(self.ids)
+
+    @classmethod
+    def from_tasks(cls, tasks):
+        """
+        Builds a table from a list of Task objects.
+
+        Parameters
+        ----------
+        tasks (list): List of Task objects.
+
+        Returns
+        ----------
+        TaskTable: The table holding the tasks in the same order.
+        """
+        row = {task.id: i for i, task in enumerate(tasks)}
+        counts = np.fromiter((len(task.dependencies) for task in tasks), dtype=np.int64, count=len(tasks))
+        dep_offsets = np.zeros(len(tasks) + 1, dtype=np.int64)
+        np.cumsum(counts, out=dep_offsets[1:])
+
+        dep_indices = np.empty(int(dep_offsets[-1]), dtype=np.int64)
+        k = 0
+        for task in tasks:
+            for dep_id in task.dependencies:
+                if dep_id not in row:
+                    raise ValueError(f"Task {task.id} depends on unknown task {dep_id}")
+                dep_indices[k] = row[dep_id]
+                k += 1
+
+        return cls(
+            ids=[task.id for task in tasks],
+            duration=[task.duration for task in tasks],
+            start_time=[task.start_time if task.has_time_constraint else 0 for task in tasks],
+            preference=[task.preference for task in tasks],
+            status=[cls.STATUS_CODES[task.status] for task in tasks],
+            has_time_constraint=[task.has_time_constraint for task in tasks],
+            dep_offsets=dep_offsets,
+            dep_indices=dep_indices,
+            descriptions=[task.description for task in tasks],
+            multitaskable=[task.multitaskable for task in tasks],
+        )
+
+    def dependencies_of(self, i):
+        """
+        Returns the rows of the dependencies of row i.
+
+        Parameters
+        ----------
+        i (int): Row of the task.
+
+        Returns
+        ----------
+        ndarray: A view on dep_indices.
+        """
+        return self.dep_indices[self.dep_offsets[i]:self.dep_offsets[i + 1]]
+
+    def dependents_of(self, i):
+        """
+        Returns the rows of the tasks depending on row i.
+
+        Parameters
+        ----------
+        i (int): Row of the task.
+
+        Returns
+        ----------
+        ndarray: A view on dependent_indices.
+        """
+        return self.dependent_indices[self.dependent_offsets[i]:self.dependent_offsets[i + 1]]
+
+    def task(self, i):
+        """
+        Builds the Task object of row i.
+
+        Parameters
+        ----------
+        i (int): Row of the task.
+
+        Returns
+        ----------
+        Task: A new Task holding the values of the row.
+        """
+        dependencies = self.ids[self.dependencies_of(i)].tolist()
+        task = Task(int(self.ids[i]), self.descriptions[i], 'NA', int(self.duration[i]),
+                    dependencies, int(self.preference[i]), self.STATUS_NAMES[self.status[i]],
+                    bool(self.multitaskable[i]))
+        if self.has_time_constraint[i]:
+            task.start_time = int(self.start_time[i])
+            task.has_time_constraint = True
+        return task
+
+    def to_tasks(self):
+        """
+        Builds the list of Task objects, for callers working with Task lists.
+
+        Returns
+        ----------
+        list: One Task per row, in row order.
+        """
+        return [self.task(i) for i in range(len(self))]
+
+    def store_status(self, tasks):
+        """
+        Copies the status of Task objects built by to_tasks back into the table.
+
+        Parameters
+        ----------
+        tasks (list): The Task objects, in row order.
+        """
+        self.status[:] = [self.STATUS_CODES[task.status] for task in tasks]
+
+    def priorities(self):
+        """
+        Computes the priority of every row, 10 points per dependent plus the
+        preference, like PriorityTable: a task listing the same dependency
+        twice counts as one dependent.
+
+        Returns
+        ----------
+        ndarray: The priority of every row.
+        """
+        n = len(self.ids)
+        owners = np.repeat(np.arange(n, dtype=np.int64), np.diff(self.dep_offsets))
+        pairs = np.unique(owners * n + self.dep_indices)
+        return 10 * np.bincount(pairs % n, minlength=n) + self.preference
+
+    def memory_bytes(self):
+        """
+        Returns the memory used by the NumPy columns.
+
+        Returns
+        ----------
+        int: The number of bytes of all the arrays.
+        """
+        return sum(array.nbytes for array in (
+            self.ids, self.duration, self.start_time, self.preference, self.status,
+            self.has_time_constraint, self.multitaskable, self.dep_offsets, self.dep_indices,
+            self.dependent_offsets, self.dependent_indices))
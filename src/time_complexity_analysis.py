@@ -1,117 +1,65 @@
-import time
-import matplotlib.pyplot as plt
-from io import StringIO
+import json
 import sys
-import numpy as np
-import random
 
+from benchmark_suite import GENERATORS, run_suite
 
 
-def simulate_time_complexity(num_tasks):
-    # Create a list of tasks with random dependencies
-    tasks = []
-    for i in range(num_tasks):
-        task = Task(
-            id=i,
-            description=f'Task {i}',
-            start_time='NA',
-            duration= random.randint(10, 60),
-            dependencies = [] ,
-            preference=random.randint(1, 10)
-        )
-        tasks.append(task)
-
-    # Initialize the TaskScheduler
-    scheduler = TaskSchedulerGreedy(tasks)
-
-    # Measure execution time for different input sizes
-    execution_times = []
-    for i in range(num_tasks):
-        start_time = time.time()
-        scheduler.run_scheduler(8)
-        execution_time = time.time() - start_time
-        execution_times.append(execution_time)
-
-    return execution_times
-
-def plot_time_complexity(num_tasks, execution_times):
-    plt.plot(range(num_tasks), execution_times, marker='o', linestyle='-', color='b')
-    plt.title('Experimental Time Complexity Analysis')
-    plt.xlabel('Number of Available Tasks')
-    plt.ylabel('Execution Time (seconds)')
-    plt.grid(True)
-    plt.show()
-
-def test_greedy_task_scheduler(n):
+def scaling_series(results, scheduler, generator):
     """
-    Test the performance of the task scheduler for a given number of tasks.
+    Extracts the wall times of one scheduler on one family of instances.
 
     Parameters
     ----------
-        n (int): The number of tasks to be generated and tested.
+        results (dict): Value returned by benchmark_suite.run_suite, or loaded
+            from its JSON output.
+        scheduler (str): 'greedy' or 'dynamic'.
+        generator (str): One of the benchmark_suite.GENERATORS names.
 
     Returns
     ----------
-        float: The time taken for the task scheduler to run for 'n' tasks.
+        tuple: The task counts and wall times in seconds, by increasing count.
     """
-    tasks = []  # Generate 'n' tasks here
-    for i in range(n):
-        # Create tasks and add them to the list
-        task = Task(id=i+1, description=f"Task {i+1}", start_time='NA', duration=30, dependencies=[],
-                    preference=random.randint(1, 10))
-        tasks.append(task)
-
-    scheduler = TaskSchedulerGreedy(tasks)
-    start_time = time.time()
-
-    # Redirect stdout to a buffer
-    stdout_buffer = StringIO()
-    sys.stdout = stdout_buffer
-
-    scheduler.run_scheduler(8)
-
-    # Reset stdout
-    sys.stdout = sys.__stdout__
+    prefix = f"{scheduler}/{generator}/"
+    points = sorted((int(name[len(prefix):]), measures['wall_time'])
+                    for name, measures in results['results'].items()
+                    if name.startswith(prefix) and 'wall_time' in measures)
+    return [n for n, _ in points], [wall_time for _, wall_time in points]
 
-    end_time = time.time()
 
-    return end_time - start_time
-
-
-
-def plot_task_scheduler_performance(max_tasks):
+def plot_task_scheduler_performance(results, scheduler='greedy'):
     """
-    Plot the performance analysis of the task scheduler.
+    Plots the wall time of a scheduler against the number of tasks, one line
+    per family of generated instances.
 
     Parameters
     ----------
-        max_tasks (int): The maximum number of tasks to be tested.
+        results (dict): Value returned by benchmark_suite.run_suite.
+        scheduler (str): 'greedy' or 'dynamic'.
     """
-    durations = []
-    task_counts = []
-    log_n = []
-
-    for i in range(1, max_tasks + 1):
-        duration = test_greedy_task_scheduler(i)
-        durations.append(duration)
-        task_counts.append(i)
-        log_n.append(np.log(i))
-
-    fig, ax1 = plt.subplots()
-
-    ax1.set_xlabel('Number of Tasks')
-    ax1.set_ylabel('Time (seconds)', color='tab:red')
-    ax1.plot(task_counts, durations, color='tab:red', label='Task Scheduler Performance')
-
-    ax3 = ax1.twinx()
-    ax3.set_ylabel('Log(n)', color='tab:green')
-    ax3.plot(task_counts, log_n, color='tab:green', label='log(n)')
+    import matplotlib.pyplot as plt
+
+    fig, ax = plt.subplots()
+    for generator in GENERATORS:
+        task_counts, wall_times = scaling_series(results, scheduler, generator)
+        if task_counts:
+            ax.plot(task_counts, wall_times, marker='o', linestyle='-', label=generator)
+
+    ax.set_xlabel('Number of Tasks')
+    ax.set_ylabel('Time (seconds)')
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.grid(True)
+    ax.legend(loc='upper left')
+    plt.title(f'{scheduler.capitalize()} Scheduler Performance and Scaling Analysis')
+    fig.tight_layout()
+    plt.show()
 
-    ax1.set_yscale('log')
-    ax1.set_xscale('linear')
 
-    fig.tight_layout()
-    plt.title('Task Scheduler Performance and Scaling Analysis')
-    ax1.legend(loc='upper left')
-    ax3.legend(loc='lower right')
-    plt.show()
\ No newline at end of file
+if __name__ == '__main__':
+    # Plots a JSON file written by benchmark_suite.py --output, or a fresh run.
+    if len(sys.argv) > 1:
+        with open(sys.argv[1]) as file:
+            results = json.load(file)
+    else:
+        results = run_suite(select='greedy')
+    plot_task_scheduler_performance(results, 'greedy')
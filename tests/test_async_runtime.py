@@ -0,0 +1,89 @@
+import asyncio
+import io
+
+import pytest
+
+from async_runtime import AsyncTaskRuntime
+from event_sink import BatchEventSink, ConsoleEventSink
+from task_initializer import Task
+
+
+def make_tasks():
+    return [Task(1, 'a', 'NA', 30, [], 1), Task(2, 'b', 'NA', 20, [1], 2),
+            Task(3, 'c', 'NA', 10, [1], 3), Task(4, 'd', 'NA', 10, [2, 3], 0)]
+
+
+def sleeper(seconds=0.001):
+    async def action(task):
+        await asyncio.sleep(seconds)
+        return task.id
+    return action
+
+
+def test_full_run_renders_with_console_and_batch_sinks():
+    stream = io.StringIO()
+    for sink in (ConsoleEventSink(stream), BatchEventSink()):
+        tasks = make_tasks()
+        runtime = AsyncTaskRuntime(tasks, {task.id: sleeper() for task in tasks}, seconds_per_minute=0.0001,
+                                   sink=sink)
+        report = asyncio.run(runtime.run(8))
+        assert [row['status'] for row in report] == ['done'] * 4
+        assert [row['id'] for row in report][0] == 1 and [row['id'] for row in report][-1] == 4
+        if isinstance(sink, BatchEventSink):
+            assert sink.render()[-1].startswith('\n🏁 Completed')
+    assert 'Completed all planned tasks' in stream.getvalue()
+
+
+def test_failure_cancels_the_dependents():
+    async def fail(task):
+        raise RuntimeError('boom')
+
+    tasks = make_tasks()
+    runtime = AsyncTaskRuntime(tasks, {1: sleeper(), 2: fail, 3: sleeper(), 4: sleeper()},
+                               seconds_per_minute=0.0001)
+    statuses = {row['id']: row['status'] for row in asyncio.run(runtime.run(8))}
+    assert statuses == {1: 'done', 2: 'failed', 3: 'done', 4: 'cancelled'}
+
+
+def test_cancelling_the_run_cancels_the_running_callables():
+    started = asyncio.Event()
+    cancelled = []
+
+    async def hang(task):
+        started.set()
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.append(task.id)
+            raise
+
+    async def main():
+        runtime = AsyncTaskRuntime(make_tasks(), {1: hang}, seconds_per_minute=0.0001)
+        run = asyncio.ensure_future(runtime.run(8))
+        await started.wait()
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        return runtime.report()
+
+    report = asyncio.run(main())
+    assert cancelled == [1]
+    assert all(row['status'] == 'cancelled' for row in report)
+
+
+def test_at_most_concurrency_callables_run_at_once():
+    running = [0]
+    peak = [0]
+
+    async def action(task):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.005)
+        running[0] -= 1
+
+    tasks = [Task(i, str(i), 'NA', 10, [], 0) for i in range(10)]
+    runtime = AsyncTaskRuntime(tasks, {task.id: action for task in tasks}, concurrency=3,
+                               seconds_per_minute=0.0001)
+    report = asyncio.run(runtime.run(8))
+    assert peak[0] == 3
+    assert all(row['status'] == 'done' for row in report)
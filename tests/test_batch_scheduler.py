@@ -0,0 +1,24 @@
+import benchmark_suite
+from batch_scheduler import schedule_many
+
+
+def test_ordered_results_keep_the_order_of_the_sets():
+    task_sets = [benchmark_suite.constrained_tasks(8, seed) for seed in range(12)]
+    ordered = list(schedule_many(task_sets, workers=2, chunksize=2))
+    assert [index for index, _ in ordered] == list(range(12))
+    assert dict(schedule_many(task_sets, workers=2, chunksize=2, ordered=False)) == dict(ordered)
+
+
+def test_ordered_mode_stops_reading_behind_a_slow_first_set():
+    read = []
+
+    def task_sets():
+        for seed in range(200):
+            read.append(seed)
+            yield benchmark_suite.constrained_tasks(2000 if seed == 0 else 4, seed)
+
+    results = schedule_many(task_sets(), workers=2, chunksize=1)
+    assert next(results)[0] == 0
+    # finished sets waiting for the first one count against the 2 * workers chunks in flight
+    assert len(read) <= 4
+    results.close()
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from duration_index import DurationIndex
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from scheduler_stats import SchedulerStats
+from task_initializer import Task
+
+
+def task(task_id, duration, start='NA', preference=1):
+    return Task(task_id, str(task_id), start, duration, [], preference)
+
+
+def test_pops_the_highest_priority_task_that_fits():
+    a, b, c = task(1, 30), task(2, 10), task(3, 20)
+    index = DurationIndex([10, 20, 30])
+    index.push(a, 9)
+    index.push(b, 2)
+    index.push(c, 5)
+    assert len(index) == 3
+    assert index.pop_fitting(5) is None
+    assert index.pop_fitting(25) == (c, 5)
+    assert index.pop_fitting(100) == (a, 9)
+    assert index.pop_fitting(100) == (b, 2)
+    assert index.pop_fitting(100) is None and len(index) == 0
+
+
+def test_equal_priorities_go_to_the_task_pushed_first():
+    index = DurationIndex([10, 20])
+    index.push(task(1, 20), 4)
+    index.push(task(2, 10), 4)
+    index.push(task(3, 10), 4)
+    assert [index.pop_fitting(20)[0].id for _ in range(3)] == [1, 2, 3]
+
+
+def test_discarded_tasks_are_skipped():
+    index = DurationIndex([10, 20])
+    a, b, c = task(1, 10), task(2, 10), task(3, 20)
+    for t, priority in [(a, 5), (b, 3), (c, 4)]:
+        index.push(t, priority)
+    index.discard(a)
+    index.discard(c)
+    assert len(index) == 1
+    assert index.pop_fitting(20) == (b, 3)
+    index.push(a, 1)  # a discarded task can come back
+    assert index.pop_fitting(20) == (a, 1)
+
+
+def test_rejects_unknown_durations_and_duplicates():
+    index = DurationIndex([10])
+    with pytest.raises(ValueError):
+        index.push(task(1, 15), 1)
+    index.push(task(2, 10), 1)
+    with pytest.raises(ValueError):
+        index.push(task(2, 10), 1)
+
+
+def test_clear_keeps_the_durations():
+    index = DurationIndex([10, 20])
+    index.push(task(1, 10), 1)
+    index.clear()
+    assert len(index) == 0 and index.pop_fitting(20) is None
+    index.push(task(1, 20), 2)
+    assert index.pop_fitting(20)[0].id == 1
+
+
+def test_matches_a_linear_scan():
+    rng = random.Random(5)
+    durations = [5 * rng.randrange(1, 20) for _ in range(12)]
+    index = DurationIndex(durations)
+    live = {}
+    order = {}
+    next_id = 0
+    for _ in range(2000):
+        action = rng.random()
+        if action < 0.5:
+            t = task(next_id, rng.choice(durations))
+            priority = rng.randrange(10)
+            index.push(t, priority)
+            live[t.id] = (t, priority)
+            order[t.id] = next_id
+            next_id += 1
+        elif action < 0.65 and live:
+            t, _ = live.pop(rng.choice(list(live)))
+            index.discard(t)
+        else:
+            limit = rng.randrange(110)
+            fitting = [(t, p) for t, p in live.values() if t.duration <= limit]
+            expected = max(fitting, key=lambda entry: (entry[1], -order[entry[0].id]), default=None)
+            assert index.pop_fitting(limit) == expected
+            if expected is not None:
+                del live[expected[0].id]
+        assert len(index) == len(live)
+
+
+def test_greedy_scheduler_fills_the_gap_before_a_fixed_task():
+    tasks = [task(1, 90, preference=5), task(2, 45, preference=1), task(3, 30, start=9)]
+    sink = ScheduleEventSink()
+    stats = SchedulerStats()
+    TaskSchedulerGreedy(tasks, sink=sink, stats=stats).run_scheduler(8)
+    assert [(t.id, start) for t, start, _, _ in sink.entries] == [(2, 480), (3, 540), (1, 570)]
+    assert stats.counters['gap_fills'] == 1
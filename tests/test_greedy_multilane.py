@@ -0,0 +1,41 @@
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from task_initializer import Task
+
+
+def run(tasks, lanes=2):
+    sink = ScheduleEventSink()
+    TaskSchedulerGreedy(tasks, sink=sink, lanes=lanes).run_scheduler(8)
+    return {task.id: (start, end) for task, start, end, _ in sink.entries}
+
+
+def test_long_multitaskable_task_does_not_delay_fixed_start():
+    meeting = Task(1, 'Meeting', 9, 30, [], 1)
+    long_task = Task(2, 'Long task', 'NA', 120, [], 5, multitaskable=True)
+    schedule = run([meeting, long_task])
+    assert schedule[1] == (9 * 60, 9 * 60 + 30)
+    assert schedule[2][0] >= 9 * 60 + 30
+
+
+def test_long_multitaskable_dependent_does_not_delay_fixed_start():
+    setup = Task(1, 'Setup', 'NA', 10, [], 0)
+    long_task = Task(2, 'Long dependent', 'NA', 120, [1], 5, multitaskable=True)
+    meeting = Task(3, 'Meeting', 9, 30, [], 1)
+    schedule = run([setup, long_task, meeting])
+    assert schedule[3] == (9 * 60, 9 * 60 + 30)
+
+
+def test_multitaskable_tasks_share_lanes_with_multitaskable_fixed_start():
+    call = Task(1, 'Call', 9, 30, [], 1, multitaskable=True)
+    long_task = Task(2, 'Long task', 'NA', 120, [], 5, multitaskable=True)
+    schedule = run([call, long_task])
+    assert schedule[2] == (8 * 60, 10 * 60)
+    assert schedule[1] == (9 * 60, 9 * 60 + 30)
+
+
+def test_short_task_runs_before_fixed_start():
+    meeting = Task(1, 'Meeting', 9, 30, [], 1)
+    short_task = Task(2, 'Short task', 'NA', 45, [], 5)
+    schedule = run([meeting, short_task])
+    assert schedule[2] == (8 * 60, 8 * 60 + 45)
+    assert schedule[1] == (9 * 60, 9 * 60 + 30)
@@ -0,0 +1,48 @@
+import pytest
+
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from horizon import Horizon
+from task_initializer import Task
+
+
+def fixed(task_id, hour, duration=30, dependencies=()):
+    return Task(task_id, 'fixed', hour, duration, list(dependencies), 1)
+
+
+def free(task_id, duration=60, dependencies=()):
+    return Task(task_id, 'free', 'NA', duration, list(dependencies), 1)
+
+
+def run(cls, tasks, horizon, **options):
+    sink = ScheduleEventSink()
+    cls(tasks, sink=sink, **options).run_scheduler(horizon)
+    return [(task.id, start) for task, start, _, _ in sink.entries]
+
+
+SCHEDULERS = [(TaskSchedulerGreedy, {}), (TaskSchedulerGreedy, {'lanes': 2}), (TaskSchedulerDynamic, {})]
+
+
+@pytest.mark.parametrize('cls, options', SCHEDULERS)
+def test_fixed_start_task_past_the_horizon_end_is_not_run(cls, options):
+    tasks = [fixed(1, 20), free(2), free(3, dependencies=[1])]
+    entries = run(cls, tasks, Horizon.from_hours(8, 12), **options)
+    assert entries == [(2, 480)]
+    assert [task.status for task in tasks] != ['C', 'C', 'C']
+
+
+@pytest.mark.parametrize('cls, options', SCHEDULERS)
+def test_no_task_starts_at_the_horizon_end(cls, options):
+    entries = run(cls, [free(1), free(2), fixed(3, 10)], Horizon.from_hours(8, 10), **options)
+    assert entries and all(start < 600 for _, start in entries)
+    assert 3 not in [task_id for task_id, _ in entries]
+
+
+def test_window_before_a_fixed_task_is_truncated_by_the_horizon():
+    tasks = [free(task_id) for task_id in range(1, 5)] + [fixed(5, 12)]
+    sink = ScheduleEventSink()
+    scheduler = TaskSchedulerDynamic(tasks, sink=sink)
+    scheduler.run_scheduler(Horizon.from_hours(8, 10))
+    assert [result['limit'] for result in scheduler.window_results] == [120]
+    assert [start for _, start, _, _ in sink.entries] == [480, 540]
@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from impact_scoring import ImpactTable, descendant_bitsets, make_priority_table
+from priority_table import PriorityTable
+from task_graph import compile_tasks
+from task_initializer import Task
+
+
+def make_tasks():
+    # diamond 1 -> (2, 3) -> 4, and 5 alone
+    return [Task(1, 'a', 'NA', 10, [], 1), Task(2, 'b', 'NA', 20, [1], 2), Task(3, 'c', 'NA', 30, [1], 4),
+            Task(4, 'd', 'NA', 10, [2, 3, 3], 8), Task(5, 'e', 'NA', 10, [], 3)]
+
+
+def test_descendant_bitsets_match_a_graph_walk():
+    rng = random.Random(11)
+    tasks = [Task(i, '', 'NA', 10, rng.sample(range(i), min(i, rng.randrange(4))), 0) for i in range(60)]
+    rng.shuffle(tasks)
+    compiled = compile_tasks(tasks)
+    dependents = {task.id: [] for task in tasks}
+    for task in tasks:
+        for dep_id in task.dependencies:
+            dependents[dep_id].append(task.id)
+
+    for task, mask in zip(compiled.tasks, descendant_bitsets(compiled)):
+        seen, stack = set(), list(dependents[task.id])
+        while stack:
+            task_id = stack.pop()
+            if task_id not in seen:
+                seen.add(task_id)
+                stack.extend(dependents[task_id])
+        assert {compiled.tasks[k].id for k in range(len(tasks)) if mask >> k & 1} == seen
+
+
+def test_descendants_count_every_transitive_dependent_once():
+    table = ImpactTable(make_tasks(), 'descendants')
+    assert table.scores == {1: 31, 2: 12, 3: 14, 4: 8, 5: 3}
+    assert table.get(99) == 0
+
+
+def test_downstream_preference_weights_the_dependents_preferences():
+    assert ImpactTable(make_tasks(), 'downstream_preference').scores == {1: 15, 2: 10, 3: 12, 4: 8, 5: 3}
+    weighted = ImpactTable(make_tasks(), 'downstream_preference', downstream_weight=0.5)
+    assert weighted.scores == {1: 8.0, 2: 6.0, 3: 8.0, 4: 8.0, 5: 3.0}
+
+
+def test_critical_path_adds_the_longest_chain_of_dependents():
+    assert ImpactTable(make_tasks(), 'critical_path').scores == {1: 41, 2: 12, 3: 14, 4: 8, 5: 3}
+
+
+def test_make_priority_table_picks_the_table_of_the_scoring():
+    tasks = make_tasks()
+    legacy = make_priority_table(compile_tasks(tasks))
+    assert isinstance(legacy, PriorityTable)
+    assert [legacy.get(task.id) for task in tasks] == [21, 12, 14, 8, 3]
+    table = make_priority_table(tasks, 'downstream_preference', downstream_weight=2)
+    assert isinstance(table, ImpactTable) and table.get(1) == 29
+    with pytest.raises(ValueError):
+        make_priority_table(tasks, 'shortest')
+    with pytest.raises(ValueError):
+        ImpactTable(tasks, 'legacy')
+
+
+def test_descendants_scoring_runs_the_head_of_a_long_chain_first():
+    def run(scoring):
+        tasks = [Task(1, 'head', 'NA', 10, [], 0), Task(2, '', 'NA', 10, [1], 0), Task(3, '', 'NA', 10, [2], 0),
+                 Task(4, '', 'NA', 10, [3], 0), Task(5, 'alone', 'NA', 10, [], 15)]
+        sink = ScheduleEventSink()
+        TaskSchedulerGreedy(tasks, sink=sink, scoring=scoring).run_scheduler(8)
+        return sink.entries[0][0].id
+
+    assert run('legacy') == 5
+    assert run('descendants') == 1
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from benchmark_suite import IMPORT_TIME_BUDGET, STARTUP_IMPORTS, import_time
+
+SRC = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+HEAVY_MODULES = ('numpy', 'matplotlib', 'multiprocessing', 'concurrent.futures')
+
+
+@pytest.mark.parametrize('engine', sorted(STARTUP_IMPORTS))
+def test_command_line_imports_within_budget(engine):
+    assert import_time(STARTUP_IMPORTS[engine]) <= IMPORT_TIME_BUDGET
+
+
+@pytest.mark.parametrize('engine', sorted(STARTUP_IMPORTS))
+def test_command_line_imports_no_heavy_module(engine):
+    code = (f"import sys, {', '.join(STARTUP_IMPORTS[engine])}\n"
+            f"print(' '.join(name for name in {HEAVY_MODULES!r} if name in sys.modules))")
+    completed = subprocess.run([sys.executable, '-c', code], cwd=SRC, capture_output=True, text=True, check=True)
+    assert completed.stdout.split() == []
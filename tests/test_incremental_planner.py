@@ -0,0 +1,69 @@
+import random
+
+import pytest
+
+from incremental_planner import IncrementalPlanner
+from task_initializer import Task
+
+
+def entries(planner):
+    return [(task.id, start, end) for task, start, end in planner.schedule()]
+
+
+def random_task(rng, task_id, live_ids):
+    # preferences far apart, so no two tasks tie and the plan is unique
+    dependencies = rng.sample(live_ids, min(len(live_ids), rng.randrange(3)))
+    start = rng.randrange(9, 12) if rng.random() < 0.15 else 'NA'
+    return Task(task_id, str(task_id), start, rng.randrange(10, 45), dependencies, 1000 * rng.randrange(1, 10 ** 6))
+
+
+def assert_matches_a_fresh_plan(planner, tasks):
+    fresh = IncrementalPlanner(tasks, 8)
+    assert entries(planner) == entries(fresh)
+    assert set(planner.unplanned) == set(fresh.unplanned)
+
+
+def test_edits_give_the_plan_built_from_scratch():
+    rng = random.Random(3)
+    tasks = []
+    for task_id in range(20):
+        tasks.append(random_task(rng, task_id, [task.id for task in tasks]))
+    planner = IncrementalPlanner(tasks, 8)
+    assert_matches_a_fresh_plan(planner, tasks)
+
+    next_id = 20
+    for _ in range(60):
+        action = rng.random()
+        if action < 0.4 or len(tasks) < 5:
+            task = random_task(rng, next_id, [task.id for task in tasks])
+            next_id += 1
+            tasks.append(task)
+            planner.add_task(task)
+        elif action < 0.7:
+            task = rng.choice(tasks)
+            tasks.remove(task)
+            planner.cancel_task(task.id)
+        else:
+            planner.update_duration(rng.choice(tasks).id, rng.randrange(5, 60))
+        assert_matches_a_fresh_plan(planner, tasks)
+
+
+def test_completing_the_next_task_late_shifts_the_rest_of_the_plan():
+    tasks = [Task(1, 'a', 'NA', 30, [], 3), Task(2, 'b', 'NA', 20, [1], 2), Task(3, 'c', 'NA', 10, [], 1)]
+    planner = IncrementalPlanner(tasks, 8)
+    assert entries(planner) == [(1, 480, 510), (2, 510, 530), (3, 530, 540)]
+    planner.complete_task(1)
+    assert entries(planner) == [(2, 510, 530), (3, 530, 540)]
+    planner.complete_task(2, end_time=535)
+    assert entries(planner) == [(3, 535, 545)]
+    with pytest.raises(ValueError):
+        planner.update_duration(2, 5)
+
+
+def test_tasks_past_the_time_limit_stay_unplanned():
+    tasks = [Task(i, str(i), 'NA', 60, [], i) for i in range(1, 8)]
+    planner = IncrementalPlanner(tasks, 8)
+    assert [task_id for task_id, _, _ in entries(planner)] == [7, 6, 5, 4, 3]
+    assert set(planner.unplanned) == {1, 2}
+    planner.cancel_task(7)
+    assert set(planner.unplanned) == {1}
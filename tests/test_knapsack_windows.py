@@ -0,0 +1,27 @@
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from scheduler_stats import SchedulerStats
+from task_initializer import Task
+
+
+def run(tasks):
+    stats = SchedulerStats()
+    scheduler = TaskSchedulerDynamic(tasks, engine='knapsack', stats=stats)
+    scheduler.run_scheduler(8)
+    return scheduler, stats
+
+
+def test_forest_windows_are_exact():
+    scheduler, stats = run([Task(1, 'a', 'NA', 30, [], 1), Task(2, 'b', 'NA', 30, [1], 2)])
+    assert scheduler.window_results
+    assert all(result['exact'] for result in scheduler.window_results)
+    assert all(result['bound'] == result['utility'] for result in scheduler.window_results)
+    assert stats.counters['windows_inexact'] == 0
+    assert scheduler.optimality_gap() == 0.0
+
+
+def test_window_with_a_task_of_two_dependencies_is_inexact():
+    tasks = [Task(1, 'a', 'NA', 30, [], 1), Task(2, 'b', 'NA', 30, [], 1), Task(3, 'c', 'NA', 30, [1, 2], 5)]
+    scheduler, stats = run(tasks)
+    assert not scheduler.window_results[0]['exact']
+    assert scheduler.window_results[0]['bound'] >= scheduler.window_results[0]['utility']
+    assert stats.counters['windows_inexact'] == 1
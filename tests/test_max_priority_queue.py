@@ -0,0 +1,73 @@
+import random
+
+import pytest
+
+from max_priority_queue import IndexedMaxHeapq, MaxHeapq
+
+
+class Item:
+    def __init__(self, name):
+        self.name = name
+
+
+def test_max_heapq_pops_by_decreasing_priority():
+    heap = MaxHeapq()
+    entries = [('t%d' % i, p) for i, p in enumerate(random.Random(1).sample(range(1000), 200))]
+    queue = entries[:100]
+    heap.build_max_heap(queue)
+    for entry in entries[100:]:
+        heap.heappush(queue, entry)
+    popped = [heap.heappop(queue)[1] for _ in range(len(entries))]
+    assert popped == sorted((p for _, p in entries), reverse=True)
+    with pytest.raises(ValueError):
+        heap.heappop(queue)
+
+
+def test_indexed_heap_pops_by_key_then_insertion_order():
+    items = [Item(i) for i in range(6)]
+    queue = IndexedMaxHeapq([(1, items[0]), (3, items[1]), (1, items[2])])
+    queue.push(3, items[3])
+    queue.push(2, items[4])
+    assert len(queue) == 5 and items[4] in queue and items[5] not in queue
+    assert queue.peek() == (3, items[1])
+    assert [queue.pop()[1] for _ in range(5)] == [items[1], items[3], items[4], items[0], items[2]]
+    with pytest.raises(ValueError):
+        queue.pop()
+
+
+def test_indexed_heap_updates_and_removes_queued_tasks():
+    items = [Item(i) for i in range(5)]
+    queue = IndexedMaxHeapq((i, item) for i, item in enumerate(items))
+    queue.update_key(items[0], 10)
+    queue.update_key(items[4], -1)
+    assert queue.remove(items[2]) == 2
+    assert items[2] not in queue
+    with pytest.raises(ValueError):
+        queue.push(5, items[1])
+    assert [queue.pop() for _ in range(4)] == [(10, items[0]), (3, items[3]), (1, items[1]), (-1, items[4])]
+
+
+def test_indexed_heap_matches_a_sorted_reference_under_random_operations():
+    rng = random.Random(7)
+    queue = IndexedMaxHeapq()
+    reference = {}
+    order = {}
+    items = [Item(i) for i in range(300)]
+    for step in range(3000):
+        item = rng.choice(items)
+        action = rng.random()
+        if item not in reference:
+            key = rng.randrange(50)
+            queue.push(key, item)
+            reference[item] = key
+            order[item] = step
+        elif action < 0.4:
+            key = rng.randrange(50)
+            queue.update_key(item, key)
+            reference[item] = key
+        elif action < 0.7:
+            assert queue.remove(item) == reference.pop(item)
+        else:
+            best = max(reference, key=lambda task: (reference[task], -order[task]))
+            assert queue.pop() == (reference.pop(best), best)
+        assert len(queue) == len(reference)
@@ -0,0 +1,64 @@
+import pytest
+
+from memo_store import ClockMemoStore, LRUMemoStore, entry_size
+
+STORES = [LRUMemoStore, ClockMemoStore]
+
+
+@pytest.mark.parametrize('cls', STORES)
+def test_store_behaves_like_a_dict_and_counts_lookups(cls):
+    memo = cls()
+    memo[(1, 2)] = 5
+    memo[(1, 2)] = 7
+    assert memo.get((1, 2)) == 7
+    assert memo.get((3, 4), 0) == 0
+    assert (1, 2) in memo and (3, 4) not in memo
+    assert len(memo) == 1 and dict(memo.items()) == {(1, 2): 7}
+    assert (memo.hits, memo.misses) == (2, 2)
+    memo.clear()
+    assert len(memo) == 0 and memo.stats()['hits'] == 2
+
+
+@pytest.mark.parametrize('cls', STORES)
+def test_store_never_exceeds_max_entries(cls):
+    memo = cls(max_entries=8)
+    for key in range(100):
+        memo[key] = key
+        assert len(memo) <= 8
+    assert memo.evictions == 92
+    assert all(memo.get(key) in (key, None) for key in range(100))
+
+
+@pytest.mark.parametrize('cls', STORES)
+def test_store_stays_under_max_bytes(cls):
+    limit = 10 * entry_size((0, 0), 0)
+    memo = cls(max_bytes=limit)
+    for key in range(50):
+        memo[(key, key)] = key
+        assert memo.size_bytes <= limit
+    assert memo.size_bytes == sum(entry_size(key, value) for key, value in memo.items())
+
+
+def test_lru_evicts_the_least_recently_used_entry():
+    memo = LRUMemoStore(max_entries=3)
+    for key in 'abc':
+        memo[key] = key
+    memo.get('a')
+    memo['d'] = 'd'
+    assert sorted(key for key, _ in memo.items()) == ['a', 'c', 'd']
+
+
+def test_clock_gives_referenced_entries_a_second_chance():
+    memo = ClockMemoStore(max_entries=3)
+    for key in 'abc':
+        memo[key] = key
+    memo.get('a')
+    memo['d'] = 'd'
+    assert sorted(key for key, _ in memo.items()) == ['a', 'c', 'd']
+    memo['e'] = 'e'
+    assert 'c' not in memo and 'e' in memo
+
+
+def test_max_entries_must_be_positive():
+    with pytest.raises(ValueError):
+        LRUMemoStore(max_entries=0)
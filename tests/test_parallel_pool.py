@@ -0,0 +1,44 @@
+import copy
+
+from benchmark_suite import constrained_tasks
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import ScheduleEventSink
+
+
+def run(tasks, engine):
+    sink = ScheduleEventSink()
+    scheduler = TaskSchedulerDynamic(copy.deepcopy(tasks), sink=sink, engine=engine, workers=2)
+    scheduler.run_scheduler(8)
+    return scheduler, [(task.id, start, end) for task, start, end, _ in sink.entries]
+
+
+def test_parallel_matches_bitmask_and_stops_its_pool():
+    tasks = constrained_tasks(30, 1)
+    _, expected = run(tasks, 'bitmask')
+    scheduler, entries = run(tasks, 'parallel')
+    assert entries == expected
+    assert scheduler.search_pool is None
+
+
+def test_parallel_records_its_windows_and_memo_counters():
+    from scheduler_stats import SchedulerStats
+
+    stats = SchedulerStats()
+    scheduler = TaskSchedulerDynamic(constrained_tasks(30, 1), engine='parallel', workers=2, stats=stats)
+    scheduler.run_scheduler(8)
+    assert scheduler.window_results
+    assert all(result['exact'] and result['bound'] == result['utility'] for result in scheduler.window_results)
+    assert stats.counters['memo_misses'] > 0
+    assert stats.counters['dp_nodes_expanded'] > 0
+
+
+def test_single_worker_fallback_uses_the_given_memo_store():
+    from bitmask_dp import BitmaskWindowSolver, SearchPool
+    from memo_store import LRUMemoStore
+
+    tasks = constrained_tasks(12, 2)
+    memo = LRUMemoStore(max_entries=16)
+    solver = BitmaskWindowSolver(tasks, [task.preference + 1 for task in tasks])
+    with SearchPool(1, memo) as pool:
+        solver.solve_parallel(240, pool=pool, memo=memo)
+    assert 0 < len(memo) <= 16
@@ -0,0 +1,29 @@
+from priority_table import PriorityTable
+from task_initializer import Task
+
+
+def make_tasks():
+    return [Task(1, 'a', 'NA', 10, [], 3, 'N', False),
+            Task(2, 'b', 'NA', 10, [1], 0, 'N', False),
+            Task(3, 'c', 'NA', 10, [1, 2], 1, 'N', False)]
+
+
+def test_remove_task_drops_its_entries():
+    tasks = make_tasks()
+    table = PriorityTable(tasks)
+    assert table.get(2) == 10
+    table.remove_task(tasks[1])
+    assert 2 not in table.dependent_points
+    assert 2 not in table.preferences
+    assert table.get(2) == 0
+    assert table.get(1) == 13
+
+
+def test_removed_tasks_do_not_accumulate():
+    table = PriorityTable([])
+    for task_id in range(100):
+        task = Task(task_id, '', 'NA', 5, [], 0, 'N', False)
+        table.add_task(task)
+        table.remove_task(task)
+    assert table.dependent_points == {}
+    assert table.preferences == {}
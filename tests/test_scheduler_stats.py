@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from scheduler_stats import NullSchedulerStats, SchedulerStats
+from task_initializer import Task
+
+
+def make_tasks():
+    return [Task(1, 'a', 'NA', 30, [], 1), Task(2, 'b', 'NA', 20, [1], 2),
+            Task(3, 'c', 9, 10, [], 1), Task(4, 'd', 'NA', 40, [], 3)]
+
+
+def run(cls, stats):
+    sink = ScheduleEventSink()
+    cls(make_tasks(), sink=sink, stats=stats).run_scheduler(8)
+    return [(task.id, start) for task, start, _, _ in sink.entries]
+
+
+def test_counters_timers_and_windows_accumulate():
+    stats = SchedulerStats()
+    stats.count('heap_pushes')
+    stats.count('heap_pushes', 3)
+    for _ in range(2):
+        stats.stop_timer('window_solve', stats.start_timer())
+    stats.window(limit=60, utility=5)
+    assert stats.counters == {'heap_pushes': 4}
+    timer = stats.timers['window_solve']
+    assert timer['count'] == 2 and 0 <= timer['max'] <= timer['total']
+    assert stats.windows == [{'limit': 60, 'utility': 5}]
+    exported = json.loads(stats.to_json())
+    assert exported['counters'] == {'heap_pushes': 4} and exported['profile'] is None
+
+
+def test_null_stats_record_nothing():
+    stats = NullSchedulerStats()
+    stats.count('heap_pushes')
+    assert not stats.enabled
+    assert stats.stop_timer('run', stats.start_timer()) == 0
+
+
+def test_profile_report_lists_the_scheduler_functions():
+    stats = SchedulerStats(profile=True)
+    run(TaskSchedulerGreedy, stats)
+    assert 'greedy_task_scheduler.py' in stats.profile_report()
+
+
+def test_greedy_scheduler_counts_its_operations():
+    stats = SchedulerStats()
+    run(TaskSchedulerGreedy, stats)
+    assert stats.counters['heap_pushes'] == stats.counters['heap_pops'] == 4
+    assert stats.counters['priority_computations'] == 3  # one per task without time constraint
+    assert stats.counters['readiness_scans'] > 0
+    assert stats.timers['run']['count'] == 1
+
+
+def test_dynamic_scheduler_records_every_window():
+    stats = SchedulerStats()
+    scheduler = TaskSchedulerDynamic(make_tasks(), stats=stats)
+    scheduler.run_scheduler(8)
+    assert stats.windows and len(stats.windows) == stats.timers['window_solve']['count']
+    assert sum(window['nodes'] for window in stats.windows) == stats.counters['dp_nodes_expanded']
+    assert stats.counters['memo_hits'] + stats.counters['memo_misses'] > 0
+    assert stats.windows[0]['time'] == 480
+
+
+@pytest.mark.parametrize('cls', [TaskSchedulerGreedy, TaskSchedulerDynamic])
+def test_stats_do_not_change_the_schedule(cls):
+    assert run(cls, SchedulerStats()) == run(cls, None)
@@ -0,0 +1,68 @@
+import os
+
+import pytest
+
+import search_checkpoint
+from benchmark_suite import constrained_tasks
+from bitmask_dp import BitmaskWindowSolver
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import ScheduleEventSink
+
+
+def run(**options):
+    sink = ScheduleEventSink()
+    TaskSchedulerDynamic(constrained_tasks(30, 1), sink=sink, **options).run_scheduler(8)
+    return [(task.id, start, end) for task, start, end, _ in sink.entries]
+
+
+SEARCH = BitmaskWindowSolver.search
+
+
+def counting_search(monkeypatch, calls, kill_at=None):
+    def wrapper(self, states, best_utility, memo, **options):
+        calls.append(list(states))
+        if len(calls) == kill_at:
+            # the process is killed right after a periodic checkpoint of this window
+            options['checkpoint'](list(states), best_utility, options.get('best_mask'))
+            raise KeyboardInterrupt
+        return SEARCH(self, states, best_utility, memo, **options)
+
+    monkeypatch.setattr(BitmaskWindowSolver, 'search', wrapper)
+
+
+def test_killed_run_resumes_without_searching_the_solved_windows(tmp_path, monkeypatch):
+    path = str(tmp_path / 'search.ckpt')
+    expected = run()
+    full = []
+    counting_search(monkeypatch, full)
+    assert run(checkpoint_path=path) == expected
+    assert len(full) > 3
+
+    killed = []
+    counting_search(monkeypatch, killed, kill_at=3)
+    with pytest.raises(KeyboardInterrupt):
+        run(checkpoint_path=path)
+    assert os.path.exists(path)
+    assert len(search_checkpoint.read_windows(search_checkpoint.windows_path(path))) == 2
+
+    resumed = []
+    reads = []
+    read_checkpoint = search_checkpoint.read_checkpoint
+    monkeypatch.setattr(search_checkpoint, 'read_checkpoint',
+                        lambda *args: reads.append(read_checkpoint(*args)) or reads[-1])
+    counting_search(monkeypatch, resumed)
+    assert run(checkpoint_path=path) == expected
+    # the two windows solved before the kill are not searched again, the third resumes from its checkpoint
+    assert len(resumed) == len(full) - 2
+    assert reads[0] is not None
+    assert not os.path.exists(path)
+    assert not os.path.exists(search_checkpoint.windows_path(path))
+
+
+def test_truncated_window_log_keeps_the_complete_records(tmp_path):
+    path = str(tmp_path / 'run.windows')
+    search_checkpoint.append_window(path, b'a' * 16, 5.0, 6.0, False, [1, 2])
+    search_checkpoint.append_window(path, b'b' * 16, 3.0, 3.0, True, [7])
+    with open(path, 'r+b') as file:
+        file.truncate(os.path.getsize(path) - 4)
+    assert search_checkpoint.read_windows(path) == {b'a' * 16: (5.0, 6.0, False, [1, 2])}
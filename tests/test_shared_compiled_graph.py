@@ -0,0 +1,21 @@
+import benchmark_suite
+from dynamic_task_scheduler import TaskSchedulerDynamic
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from task_graph import compile_tasks
+
+
+def run(cls, tasks):
+    sink = ScheduleEventSink()
+    cls(tasks, sink=sink).run_scheduler(8)
+    return [(task.id, start) for task, start, _, _ in sink.entries]
+
+
+def test_schedulers_run_one_after_the_other_on_one_compiled_graph():
+    alone = {cls: run(cls, compile_tasks(benchmark_suite.constrained_tasks(40, 3)))
+             for cls in (TaskSchedulerGreedy, TaskSchedulerDynamic)}
+    compiled = compile_tasks(benchmark_suite.constrained_tasks(40, 3))
+    assert run(TaskSchedulerGreedy, compiled) == alone[TaskSchedulerGreedy]
+    assert run(TaskSchedulerDynamic, compiled) == alone[TaskSchedulerDynamic]
+    assert run(TaskSchedulerGreedy, compiled) == alone[TaskSchedulerGreedy]
+    assert alone[TaskSchedulerDynamic]
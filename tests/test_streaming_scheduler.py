@@ -0,0 +1,38 @@
+import pytest
+
+from horizon import Horizon
+from streaming_scheduler import StreamingScheduler
+from task_initializer import Task
+
+
+def chain(n):
+    for i in range(1, n + 1):
+        yield Task(i, f"Task {i}", 'NA', 5, [i - 1] if i > 1 else [], 0)
+
+
+def test_monotonic_ids_keep_no_completed_ids():
+    scheduler = StreamingScheduler(chain(1000), lookahead=16, monotonic_ids=True)
+    scheduled = [task.id for task, _, _ in scheduler.run(8)]
+    assert scheduled == list(range(1, 1001))
+    assert not scheduler.completed and not scheduler.live and not scheduler.dependents
+
+
+def test_monotonic_ids_reject_decreasing_ids():
+    feed = [Task(2, 'Second', 'NA', 5, [], 0), Task(1, 'First', 'NA', 5, [], 0)]
+    with pytest.raises(ValueError):
+        list(StreamingScheduler(feed, monotonic_ids=True).run(8))
+
+
+def test_horizon_stops_the_feed():
+    scheduler = StreamingScheduler(chain(1000), lookahead=16)
+    scheduled = list(scheduler.run(Horizon.from_hours(8, 9)))
+    assert len(scheduled) == 12
+    assert all(start < 9 * 60 for _, start, _ in scheduled)
+    assert not scheduler.exhausted
+
+
+def test_time_constrained_task_after_the_horizon_is_not_run():
+    feed = [Task(1, 'Evening', 20, 30, [], 0), Task(2, 'Morning', 'NA', 30, [], 0)]
+    scheduler = StreamingScheduler(feed)
+    assert [task.id for task, _, _ in scheduler.run(Horizon.from_hours(8, 12))] == [2]
+    assert [task.id for task in scheduler.blocked_tasks()] == [1]
@@ -0,0 +1,32 @@
+import pytest
+
+from impact_scoring import ImpactTable
+from task_graph import compile_tasks
+from task_initializer import Task
+
+
+def make_tasks():
+    return [Task(1, 'a', 'NA', 30, [], 0), Task(2, 'b', 'NA', 10, [], 0),
+            Task(3, 'c', 'NA', 20, [1, 2], 0), Task(4, 'd', 'NA', 5, [2], 0)]
+
+
+def test_longest_chains_are_computed_when_first_read():
+    compiled = compile_tasks(make_tasks())
+    assert 'critical_tails' not in vars(compiled)
+    assert compiled.critical_tails == [20, 20, 0, 0]
+    assert compiled.critical_path_length == 50
+    assert compiled.critical_path == [1, 3]
+
+
+def test_critical_path_scoring_reads_the_compiled_tails():
+    compiled = compile_tasks(make_tasks())
+    table = ImpactTable(compiled, 'critical_path')
+    assert 'critical_tails' in vars(compiled)
+    assert [table.get(task.id) for task in compiled.tasks] == compiled.critical_tails
+
+
+def test_cycles_and_unknown_dependencies_are_rejected():
+    with pytest.raises(ValueError, match='cycle'):
+        compile_tasks([Task(1, 'a', 'NA', 5, [2], 0), Task(2, 'b', 'NA', 5, [1], 0)])
+    with pytest.raises(ValueError, match='unknown task 9'):
+        compile_tasks([Task(1, 'a', 'NA', 5, [9], 0)])
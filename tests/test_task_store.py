@@ -0,0 +1,79 @@
+import pytest
+
+from event_sink import ScheduleEventSink
+from greedy_task_scheduler import TaskSchedulerGreedy
+from task_initializer import Task
+from task_loader import load_tasks
+from task_store import load_schedule, load_table, save_schedule, save_table
+
+
+def make_tasks():
+    return [
+        Task(7, 'Café ☕', 'NA', 15, [], 2),
+        Task(3, '', 9, 30, [7], 1, multitaskable=True),
+        Task(12, 'Report', 'NA', 45, [7, 3], 5, status='C'),
+        Task(5, 'Review', 'NA', 20, [12], 0),
+    ]
+
+
+def fields(task):
+    return (task.id, task.description, task.start_time, task.has_time_constraint, task.duration,
+            list(task.dependencies), task.preference, task.status, task.multitaskable)
+
+
+def test_graph_file_round_trip(tmp_path):
+    path = str(tmp_path / 'tasks.tskg')
+    save_table(make_tasks(), path)
+    table = load_table(path)
+    assert len(table) == 4
+    assert [fields(task) for task in table.to_tasks()] == [fields(task) for task in make_tasks()]
+    assert [fields(task) for task in load_tasks(path)] == [fields(task) for task in make_tasks()]
+    assert [table.descriptions[i] for i in range(len(table))] == ['Café ☕', '', 'Report', 'Review']
+
+
+def test_binary_format_is_not_guessed_from_other_extensions(tmp_path):
+    path = str(tmp_path / 'tasks.bin')
+    save_table(make_tasks(), path)
+    assert [task.id for task in load_tasks(path, 'binary')] == [7, 3, 12, 5]
+
+
+def test_statuses_stored_by_a_scheduler_do_not_reach_the_file(tmp_path):
+    path = str(tmp_path / 'tasks.tskg')
+    save_table(make_tasks(), path)
+    table = load_table(path)
+    TaskSchedulerGreedy(table).run_scheduler(8)
+    assert [task.status for task in table.to_tasks()] == ['C', 'C', 'C', 'C']
+    assert [task.status for task in load_tasks(path)] == ['N', 'N', 'C', 'N']
+
+
+def test_schedule_file_round_trip(tmp_path):
+    graph_path, schedule_path = str(tmp_path / 'tasks.tskg'), str(tmp_path / 'plan.tsks')
+    save_table(make_tasks(), graph_path)
+    table = load_table(graph_path)
+    sink = ScheduleEventSink()
+    TaskSchedulerGreedy(table, sink=sink).run_scheduler(8)
+    save_schedule(sink.entries, table, schedule_path)
+
+    index, start, end = load_schedule(schedule_path)
+    ids = table.ids.tolist()
+    assert [(ids[i], s, e) for i, s, e in zip(index.tolist(), start.tolist(), end.tolist())] == \
+        [(task.id, s, e) for task, s, e, _ in sink.entries]
+
+
+def test_rejects_foreign_truncated_and_newer_files(tmp_path):
+    path = str(tmp_path / 'tasks.tskg')
+    save_table(make_tasks(), path)
+    with pytest.raises(ValueError, match='not a TSKS file'):
+        load_schedule(path)
+
+    with open(path, 'rb') as file:
+        data = file.read()
+    with open(path, 'wb') as file:
+        file.write(data[:-8])
+    with pytest.raises(ValueError, match='truncated'):
+        load_table(path)
+
+    with open(path, 'wb') as file:
+        file.write(data[:4] + b'\x02\x00' + data[6:])
+    with pytest.raises(ValueError, match='unsupported version'):
+        load_table(path)
@@ -0,0 +1,13 @@
+from priority_table import PriorityTable
+from task_initializer import Task
+from task_table import TaskTable
+
+
+def test_priorities_count_a_duplicated_dependency_once():
+    tasks = [
+        Task(1, 'First', 'NA', 10, [], 2),
+        Task(2, 'Second', 'NA', 10, [1, 1], 4),
+        Task(3, 'Third', 'NA', 10, [1, 2, 2], 0),
+    ]
+    table = PriorityTable(tasks)
+    assert TaskTable.from_tasks(tasks).priorities().tolist() == [table.get(task.id) for task in tasks]